@@ -27,75 +27,3939 @@ from mininet.term import makeTerm, cleanUpScreens
 from mininet.node import Node
 from mininet.cli import CLI
 
+# Scientific package import
+import numpy as np
+
 # Python general packages import
 import subprocess
 import threading
 import math
+import ipaddress
+import heapq
+import itertools
+import collections
+import tempfile
+import struct
+import shutil
+import mmap
+import gzip
+import io
 import json
 import time
 import sys
 import os
 import re
 
-# Global application variables
-MINIGUI_VERSION = '01.00.00'
-DEFAULT_TIMER = 5.0
-APP_THEME = "light"
+# Global application variables
+MINIGUI_VERSION = '01.00.00'
+DEFAULT_TIMER = 5.0
+APP_THEME = "light"
+DEFAULT_ADDRESS_PLAN = {"LANPool": "10.0.0.0/8", "LANPrefix": 24, "LinkPool": "172.16.0.0/12", "LinkPrefix": 30,
+                        "DefaultPrefix": 16}
+STP_PROTOCOLS = ("None", "STP", "RSTP")
+CANVAS_VIEWPORTS = ("Raster", "OpenGL", "OpenGL (software)")
+GZIP_MAGIC = b"\x1f\x8b"
+JOURNAL_SYNC_TIME = 2000
+SCALED_PIXMAPS = {}
+NODE_SHAPE_COLORS = {"Host": Qt.darkCyan, "Switch": Qt.darkBlue, "Router": Qt.darkMagenta}
+
+
+# Thread classes
+
+class MiniCLI(threading.Thread):
+    """
+    Thread class for Mininet CLI, needed to not conflict
+    with PyQt5 event loop
+    """
+    def __init__(self, net=None):
+        super(MiniCLI, self).__init__(daemon=True)
+        self.net = net
+
+    def run(self):
+        if self.net is not None:
+            CLI(self.net)
+            print("CLI execution has finished")
+
+
+class SceneAutoUpdate(QThread):
+    """
+    Thread class to update automatically the scene with information
+    from Mininet simulation
+    """
+    updateSignal = pyqtSignal()
+
+    def __init__(self, timer=None):
+        super(SceneAutoUpdate, self).__init__()
+        self.update_active = True
+        if not isinstance(timer, float):
+            self.timer = DEFAULT_TIMER
+        else:
+            self.timer = timer
+
+    def run(self):
+        time.sleep(10.0)
+        while self.update_active:
+            time.sleep(self.timer)
+            self.updateSignal.emit()
+
+
+class LayoutThread(QThread):
+    """
+    Thread class to run scene layouts in the background, sending
+    intermediate positions to the scene at a capped frame rate
+    """
+    positionsSignal = pyqtSignal(object)
+
+    def __init__(self, layout, frame_rate=30.0):
+        """
+        :param layout: layout to be run (ForceLayout or similar, with step and isFinished)
+        :param frame_rate: maximum number of position updates per second
+        :type frame_rate: float
+        """
+        super(LayoutThread, self).__init__()
+        self.layout = layout
+        self.layout_active = True
+        self.frame_pending = False
+
+        # Time between frames: it grows if drawing them takes long (big scenes)
+        self.min_frame_time = 1.0 / frame_rate
+        self.frame_time = self.min_frame_time
+
+    def run(self):
+        last_frame = 0.0
+        while self.layout_active and not self.layout.isFinished():
+            positions = self.layout.step()
+
+            # A new frame is only sent once the previous one has been drawn
+            if not self.frame_pending and time.time() - last_frame >= self.frame_time:
+                self.frame_pending = True
+                self.positionsSignal.emit(positions.copy())
+                last_frame = time.time()
+
+        if self.layout_active:
+            self.frame_pending = True
+            self.positionsSignal.emit(self.layout.positions.copy())
+
+
+class SaveThread(QThread):
+    """Thread class to write project snapshots in the background"""
+    progressSignal = pyqtSignal(int)
+
+    def __init__(self, writer):
+        """
+        :param writer: writer of the project snapshot
+        :type writer: ProjectWriter
+        """
+        super(SaveThread, self).__init__()
+        self.writer = writer
+        self.error = None
+        self.last_progress = -1
+
+    def run(self):
+        try:
+            self.writer.write(self.sendProgress)
+        except (OSError, ValueError) as error:
+            self.error = error
+
+    def sendProgress(self, done):
+        """Sends the writing progress (only when its percentage changes)
+
+        :param done: part of the file written, from 0 to 1
+        :type done: float
+        """
+        percentage = int(done * 100)
+        if percentage != self.last_progress:
+            self.last_progress = percentage
+            self.progressSignal.emit(percentage)
+
+
+# Extended class from Mininet base class
+
+class Router(Node):
+    """Extended class to convert Linux node in router"""
+    def __init__(self, name, **params):
+        super(Router, self).__init__(name, **params)
+
+    def config(self, **params):
+        super(Router, self).config(**params)
+        self.cmd('sysctl net.ipv4.ip_forward=1')
+
+    def terminate(self):
+        self.cmd('sysctl net.ipv4.ip_forward=0')
+        super(Router, self).terminate()
+
+
+# Address allocation classes
+
+class SubnetPool:
+    """Pool of host addresses of a single subnet, tracked with a compact bitmap"""
+    def __init__(self, network):
+        """
+        :param network: subnet whose addresses are handed out
+        :type network: ipaddress.IPv4Network
+        """
+        # Subnet information
+        self.network = network
+        self.base = int(network.network_address)
+
+        # Usable host offsets (/31 and /32 subnets have no network or broadcast address)
+        if network.prefixlen >= network.max_prefixlen - 1:
+            self.first_offset = 0
+            self.last_offset = network.num_addresses - 1
+        else:
+            self.first_offset = 1
+            self.last_offset = network.num_addresses - 2
+
+        # Allocation state: one bit per address (grown on demand), released
+        # offsets and the highest offset handed out so far
+        self.bitmap = bytearray()
+        self.free_offsets = []
+        self.next_offset = self.first_offset
+        self.used = 0
+
+    def isUsed(self, offset):
+        """Returns if the address at the given offset is already allocated
+
+        :param offset: position of the address within the subnet
+        :type offset: int
+        :rtype bool
+        """
+        index = offset >> 3
+        return index < len(self.bitmap) and bool(self.bitmap[index] & (1 << (offset & 7)))
+
+    def markOffset(self, offset, used=True):
+        """Sets or clears the bitmap entry of an address
+
+        :param offset: position of the address within the subnet
+        :type offset: int
+        :param used: new state of the address
+        :type used: bool
+        """
+        index = offset >> 3
+        if index >= len(self.bitmap):
+            self.bitmap.extend(bytes(index - len(self.bitmap) + 1))
+
+        if used:
+            self.bitmap[index] |= 1 << (offset & 7)
+            self.used = self.used + 1
+        else:
+            self.bitmap[index] &= ~(1 << (offset & 7)) & 0xFF
+            self.used = self.used - 1
+
+    def allocate(self):
+        """Hands out a free address, reusing released ones first
+
+        :returns new address (as integer) or None if the subnet is full
+        :rtype int
+        """
+        # Released addresses are reused first
+        while self.free_offsets:
+            offset = self.free_offsets.pop()
+            if not self.isUsed(offset):
+                self.markOffset(offset)
+                return self.base + offset
+
+        # Otherwise, the watermark advances skipping reserved addresses
+        while self.next_offset <= self.last_offset:
+            offset = self.next_offset
+            self.next_offset = self.next_offset + 1
+            if not self.isUsed(offset):
+                self.markOffset(offset)
+                return self.base + offset
+
+        return None
+
+    def reserve(self, address):
+        """Marks an address as allocated (e.g. loaded from a project)
+
+        :param address: address (as integer) to be reserved
+        :type address: int
+        :returns if the address was reserved
+        :rtype bool
+        """
+        offset = address - self.base
+        if offset < self.first_offset or offset > self.last_offset or self.isUsed(offset):
+            return False
+
+        self.markOffset(offset)
+        return True
+
+    def release(self, address):
+        """Gives an address back to the pool
+
+        :param address: address (as integer) to be released
+        :type address: int
+        """
+        offset = address - self.base
+        if self.first_offset <= offset <= self.last_offset and self.isUsed(offset):
+            self.markOffset(offset, used=False)
+            self.free_offsets.append(offset)
+
+
+class AddressAllocator:
+    """
+    Hands out subnets and interface addresses following an address plan:
+    a pool split in subnets for LANs and another one for router-to-router links
+    """
+    def __init__(self, plan=None):
+        """
+        :param plan: address plan (see DEFAULT_ADDRESS_PLAN), optional
+        :type plan: dict
+        """
+        # Address plan and subnet pools
+        self.plan = {}
+        self.subnets = {}
+        self.carvers = {}
+
+        # Subnet used by default for new nodes
+        self.default_subnet = None
+
+        self.setPlan(plan)
+
+    def setPlan(self, plan=None):
+        """Changes the address plan and resets the allocation state
+
+        :param plan: address plan (see DEFAULT_ADDRESS_PLAN), optional
+        :type plan: dict
+        """
+        self.plan = dict(DEFAULT_ADDRESS_PLAN)
+        if plan is not None:
+            self.plan.update(plan)
+
+        self.reset()
+
+    def reset(self):
+        """Forgets every allocated subnet and address"""
+        self.subnets.clear()
+        self.carvers.clear()
+        self.default_subnet = None
+        for kind in ["LAN", "Link"]:
+            supernet = ipaddress.IPv4Network(self.plan[kind + "Pool"])
+            prefix_len = max(int(self.plan[kind + "Prefix"]), supernet.prefixlen)
+            self.carvers[kind] = {
+                "supernet": supernet,
+                "prefix_len": prefix_len,
+                "size": 1 << (supernet.max_prefixlen - prefix_len),
+                "count": 1 << (prefix_len - supernet.prefixlen),
+                "next": 0,
+                "free": [],
+                "taken": set()
+            }
+
+    # Subnet-related functions
+
+    @staticmethod
+    def parseAddress(address):
+        """Splits an address with prefix length (as "10.0.0.1/8") in integers, without ipaddress overhead
+
+        :param address: address with prefix length (or netmask)
+        :type address: str
+        :returns address and prefix length
+        :rtype tuple
+        :raises ValueError: if the address is not valid
+        """
+        ip, separator, prefix = str(address).partition("/")
+        octets = ip.split(".")
+        if len(octets) != 4 or not separator:
+            raise ValueError(address)
+
+        value = 0
+        for octet in octets:
+            octet = int(octet)
+            if octet < 0 or octet > 255:
+                raise ValueError(address)
+            value = (value << 8) | octet
+
+        # Netmasks (as "255.0.0.0") are left to ipaddress
+        if prefix.isdigit() and int(prefix) <= 32:
+            return value, int(prefix)
+
+        return value, ipaddress.IPv4Network("0.0.0.0/" + prefix).prefixlen
+
+    @staticmethod
+    def formatAddress(value):
+        """Returns the dotted representation of an address given as integer
+
+        :param value: address as integer
+        :type value: int
+        :rtype str
+        """
+        return "%d.%d.%d.%d" % ((value >> 24) & 0xFF, (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+
+    def getSubnetPool(self, network):
+        """Returns the pool of a subnet, creating it if needed
+
+        :param network: subnet to be looked up
+        :type network: ipaddress.IPv4Network
+        :rtype SubnetPool
+        """
+        pool = self.subnets.get((int(network.network_address), network.prefixlen))
+        if pool is None:
+            pool = SubnetPool(network)
+            self.subnets[(pool.base, network.prefixlen)] = pool
+
+            # Subnets within the plan are taken out of their pool
+            for carver, blocks in self.getCarverBlocks(network):
+                carver["taken"].update(blocks)
+
+        return pool
+
+    def getCarverBlocks(self, network):
+        """
+        Returns the blocks of the plan's pools taken up by a subnet: a block if it
+        has the plan's prefix, several if it is wider (but not the whole pool)
+
+        :param network: subnet to be looked up
+        :type network: ipaddress.IPv4Network
+        :returns pool (see reset) and range of block indexes of each pool holding the subnet
+        :rtype list
+        """
+        carver_blocks = []
+        for carver in self.carvers.values():
+            supernet = carver["supernet"]
+            if network.prefixlen == carver["prefix_len"] or supernet.prefixlen < network.prefixlen < \
+                    carver["prefix_len"]:
+                if network.subnet_of(supernet):
+                    first = (int(network.network_address) - int(supernet.network_address)) // carver["size"]
+                    carver_blocks.append((carver, range(first, first + (1 << (carver["prefix_len"] -
+                                                                              network.prefixlen)))))
+
+        return carver_blocks
+
+    def allocateSubnet(self, kind="LAN", prefix_len=None):
+        """
+        Carves a new subnet out of the plan's pool. Subnets are as big as the plan's
+        prefix says, unless a shorter prefix is asked for: then, the subnet is made
+        of several contiguous blocks (never the whole pool)
+
+        :param kind: type of subnet ("LAN" or "Link")
+        :type kind: str
+        :param prefix_len: prefix length of the subnet (optional, the plan's one if None or longer)
+        :type prefix_len: int
+        :returns new subnet or None if the pool is exhausted
+        :rtype ipaddress.IPv4Network
+        """
+        carver = self.carvers[kind]
+        if prefix_len is not None:
+            prefix_len = max(int(prefix_len), min(carver["supernet"].prefixlen + 1, carver["prefix_len"]))
+            if prefix_len < carver["prefix_len"]:
+                return self.allocateWideSubnet(carver, prefix_len)
+
+        index = None
+        while carver["free"]:
+            candidate = carver["free"].pop()
+            if candidate not in carver["taken"]:
+                index = candidate
+                break
+
+        while index is None and carver["next"] < carver["count"]:
+            candidate = carver["next"]
+            carver["next"] = carver["next"] + 1
+            if candidate not in carver["taken"]:
+                index = candidate
+
+        if index is None:
+            return None
+
+        network = ipaddress.IPv4Network((int(carver["supernet"].network_address) + index * carver["size"],
+                                         carver["prefix_len"]))
+        self.getSubnetPool(network)
+
+        return network
+
+    def allocateWideSubnet(self, carver, prefix_len):
+        """Carves a subnet wider than the plan's prefix: the first aligned run of free blocks
+
+        :param carver: pool of the plan (see reset)
+        :type carver: dict
+        :param prefix_len: prefix length of the subnet, shorter than the plan's one
+        :type prefix_len: int
+        :returns new subnet or None if there is no run of free blocks left
+        :rtype ipaddress.IPv4Network
+        """
+        run = 1 << (carver["prefix_len"] - prefix_len)
+        taken = carver["taken"]
+        for first in range(0, carver["count"], run):
+            if not any(index in taken for index in range(first, first + run)):
+                network = ipaddress.IPv4Network((int(carver["supernet"].network_address) + first * carver["size"],
+                                                 prefix_len))
+                self.getSubnetPool(network)
+                return network
+
+        return None
+
+    def releaseSubnet(self, network):
+        """Gives a subnet (and all its addresses) back to the plan's pool
+
+        :param network: subnet to be released
+        :type network: ipaddress.IPv4Network
+        """
+        if self.subnets.pop((int(network.network_address), network.prefixlen), None) is None:
+            return
+
+        if network == self.default_subnet:
+            self.default_subnet = None
+
+        for carver, blocks in self.getCarverBlocks(network):
+            carver["taken"].difference_update(blocks)
+            carver["free"].extend(blocks)
+
+    # Address-related functions
+
+    def allocateAddress(self, network=None):
+        """
+        Hands out a free address of a subnet. If none is given, the default LAN is
+        used: a wide subnet of the LAN pool (see the plan's "DefaultPrefix"), so
+        new nodes of the same segment share it. When it is full, a new one is taken
+
+        :param network: subnet to take the address from (optional)
+        :type network: ipaddress.IPv4Network
+        :returns address and prefix length, or None if there is no space left
+        :rtype tuple
+        """
+        if network is not None:
+            address = self.getSubnetPool(network).allocate()
+        else:
+            address = None
+            while address is None:
+                if self.default_subnet is None:
+                    self.default_subnet = self.allocateSubnet("LAN", self.plan["DefaultPrefix"])
+                    if self.default_subnet is None:
+                        return None
+                network = self.default_subnet
+                address = self.getSubnetPool(network).allocate()
+                if address is None:
+                    self.default_subnet = None
+
+        if address is None:
+            return None
+
+        return self.formatAddress(address), network.prefixlen
+
+    def findSubnetPool(self, address, create=False):
+        """Returns the pool of the subnet an interface address belongs to
+
+        :param address: address with prefix length, as "10.0.0.1/8"
+        :type address: str
+        :param create: creates the pool if it does not exist yet
+        :type create: bool
+        :returns pool (or None) and address as integer
+        :rtype tuple
+        """
+        try:
+            value, prefix_len = self.parseAddress(address)
+        except ValueError:
+            return None, None
+
+        base = value & ((0xFFFFFFFF << (32 - prefix_len)) & 0xFFFFFFFF)
+        pool = self.subnets.get((base, prefix_len))
+        if pool is None and create:
+            pool = self.getSubnetPool(ipaddress.IPv4Network((base, prefix_len)))
+
+        return pool, value
+
+    def reserveAddress(self, address):
+        """Marks an interface address as allocated
+
+        :param address: address with prefix length, as "10.0.0.1/8"
+        :type address: str
+        :returns if the address was valid and free
+        :rtype bool
+        """
+        pool, value = self.findSubnetPool(address, create=True)
+        if pool is None:
+            return False
+
+        return pool.reserve(value)
+
+    def releaseAddress(self, address):
+        """Gives an interface address back to its subnet
+
+        :param address: address with prefix length, as "10.0.0.1/8"
+        :type address: str
+        """
+        pool, value = self.findSubnetPool(address)
+        if pool is not None:
+            pool.release(value)
+
+
+# Topology model classes
+
+class IntfRecord:
+    """Ethernet interface of a topology node"""
+    __slots__ = ("name", "address", "link_id")
+
+    def __init__(self, name, address="", link_id=None):
+        """
+        :param name: interface name
+        :type name: str
+        :param address: IP address with prefix length, as "10.0.0.1/8" (empty if none)
+        :type address: str
+        :param link_id: ID of the link attached to the interface (None if unattached)
+        :type link_id: int
+        """
+        self.name = name
+        self.address = address
+        self.link_id = link_id
+
+
+class NodeRecord:
+    """Node (host, switch or router) of the topology model"""
+    __slots__ = ("node_id", "name", "node_type", "x", "y", "ip", "prefix_len", "intfs", "link_intfs",
+                 "free_intf_numbers", "next_intf_number", "stp_protocol", "pinned")
+
+    def __init__(self, node_id, name, node_type, x=0.0, y=0.0, ip="", prefix_len=""):
+        """
+        :param node_id: unique node identifier
+        :type node_id: int
+        :param name: node name
+        :type name: str
+        :param node_type: node type (Host, Switch or Router)
+        :type node_type: str
+        :param x: horizontal position of the node
+        :type x: float
+        :param y: vertical position of the node
+        :type y: float
+        :param ip: default IP address of the node (hosts and routers)
+        :type ip: str
+        :param prefix_len: prefix length of the default IP address
+        :type prefix_len: int
+        """
+        self.node_id = node_id
+        self.name = name
+        self.node_type = node_type
+        self.x = x
+        self.y = y
+        self.ip = ip
+        self.prefix_len = prefix_len
+
+        # Interfaces by name, interface per link and free interface numbers
+        self.intfs = {}
+        self.link_intfs = {}
+        self.free_intf_numbers = []
+        self.next_intf_number = 0
+
+        # Spanning tree protocol of switches (None to follow the scene's protocol)
+        self.stp_protocol = None
+
+        # Pinned nodes keep their position when the scene is arranged
+        self.pinned = False
+
+    def getIntfNumber(self, intf_name):
+        """Returns the number of an interface named after the node, if any
+
+        :param intf_name: interface's name
+        :type intf_name: str
+        :rtype int or None
+        """
+        intf_base = self.name + "-eth"
+        if intf_name.startswith(intf_base) and intf_name[len(intf_base):].isdigit():
+            return int(intf_name[len(intf_base):])
+
+        return None
+
+    def rebuildIntfNumbers(self):
+        """Rebuilds the free interface numbers from the node's interfaces"""
+        used_numbers = set()
+        for intf_name in self.intfs:
+            intf_number = self.getIntfNumber(intf_name)
+            if intf_number is not None:
+                used_numbers.add(intf_number)
+
+        # Numbers below the highest one in use and not taken are free
+        self.next_intf_number = max(used_numbers) + 1 if used_numbers else 0
+        self.free_intf_numbers = [number for number in range(self.next_intf_number) if number not in used_numbers]
+
+    def assignIntfName(self):
+        """Takes the lowest free interface number and assigns a new name for the new interface
+
+        :returns name for the new interface
+        :rtype str
+        """
+        intf_base = self.name + "-eth"
+        while self.free_intf_numbers:
+            intf_name = intf_base + str(heapq.heappop(self.free_intf_numbers))
+            if intf_name not in self.intfs:
+                return intf_name
+
+        while True:
+            intf_name = intf_base + str(self.next_intf_number)
+            self.next_intf_number = self.next_intf_number + 1
+            if intf_name not in self.intfs:
+                return intf_name
+
+    def getDefaultAddress(self):
+        """Returns the node's default address with its prefix length, as "10.0.0.1/8"
+
+        :rtype str
+        """
+        if self.ip == "":
+            return ""
+
+        return str(self.ip) + "/" + str(self.prefix_len)
+
+
+class LinkRecord:
+    """Link between two nodes of the topology model"""
+    __slots__ = ("link_id", "name", "node_ids", "is_up")
+
+    def __init__(self, link_id, name, node_ids, is_up=True):
+        """
+        :param link_id: unique link identifier
+        :type link_id: int
+        :param name: link name
+        :type name: str
+        :param node_ids: IDs of both linked nodes
+        :type node_ids: tuple
+        :param is_up: link state
+        :type is_up: bool
+        """
+        self.link_id = link_id
+        self.name = name
+        self.node_ids = node_ids
+        self.is_up = is_up
+
+
+class TopologyModel:
+    """
+    Qt-independent network topology: nodes, interfaces and links identified
+    by integer IDs, along with the indexes needed to query them in constant
+    time (names, adjacency) and the IP address allocator
+    """
+    # Structural changes kept in the version log
+    VERSION_LOG_SIZE = 256
+
+    def __init__(self, plan=None):
+        """
+        :param plan: address plan (see DEFAULT_ADDRESS_PLAN), optional
+        :type plan: dict
+        """
+        # Records by ID and IDs by name
+        self.nodes = {}
+        self.links = {}
+        self.node_ids = {}
+        self.link_ids = {}
+
+        # Adjacency index: for each node, link ID per neighbor node ID
+        self.adjacency = {}
+
+        # IP address allocation
+        self.ip_allocator = AddressAllocator(plan)
+
+        # Topology version, increased on every structural change, and the latest
+        # structural changes, so graph engines can be patched (see increaseVersion)
+        self.version = 0
+        self.version_log = collections.deque(maxlen=self.VERSION_LOG_SIZE)
+
+        # Spanning tree protocol of the scene's switches (see STP_PROTOCOLS)
+        self.stp_protocol = "None"
+
+        # Functions called on every change of the topology (see notifyChange)
+        self.listeners = []
+
+        # Item counting initialization
+        self.next_id = 0
+        self.item_count = {"Host": 0, "Switch": 0, "Router": 0, "Link": 0}
+        self.item_letter = {"Host": "h", "Switch": "s", "Router": "r", "Link": "l"}
+
+    def clear(self):
+        """Removes every element of the topology"""
+        self.nodes.clear()
+        self.links.clear()
+        self.node_ids.clear()
+        self.link_ids.clear()
+        self.adjacency.clear()
+        self.ip_allocator.reset()
+        self.increaseVersion("clear")
+        self.stp_protocol = "None"
+        self.next_id = 0
+        for item in self.item_count:
+            self.item_count[item] = 0
+        self.notifyChange("clear")
+
+    # Change notification functions
+
+    def increaseVersion(self, change, record=None):
+        """Increases the topology version after a structural change, which is kept in the version log
+
+        :param change: kind of change ("add_node", "remove_node", "add_link", "remove_link" or "clear")
+        :type change: str
+        :param record: node or link record added or removed (None when cleared)
+        :type record: NodeRecord or LinkRecord
+        """
+        self.version = self.version + 1
+        self.version_log.append((self.version, change, record))
+
+    def addListener(self, listener):
+        """Registers a function to be called on every change of the topology
+
+        :param listener: function called with the kind of change and its arguments (see notifyChange)
+        :type listener: callable
+        """
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        """Stops calling a function registered with addListener
+
+        :param listener: registered function
+        :type listener: callable
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notifyChange(self, change, *args):
+        """
+        Calls the registered functions after a change of the topology. Changes and their arguments:
+        "add_node" (node), "remove_node" (node), "move_node" (node, old x, old y), "rename_node"
+        (node, old name), "node_address" (node, old IP, old prefix length), "intf_address" (node,
+        interface name, old address), "add_link" (link), "remove_link" (link, removed interfaces),
+        "link_state" (link), "stp" (node or None, old protocol), "pinned" (node) and "clear"
+
+        :param change: kind of change
+        :type change: str
+        :param args: records involved in the change and previous values
+        """
+        for listener in self.listeners:
+            listener(change, *args)
+
+    # Name-related functions
+
+    def isFeasibleName(self, name):
+        """Checks if a given name is already taken or not"""
+        if len(name) == 0:
+            return False
+
+        return name not in self.node_ids and name not in self.link_ids
+
+    def newName(self, item_type):
+        """Returns the first free automatic name for a new element
+
+        :param item_type: type of element (Host, Switch, Router or Link)
+        :type item_type: str
+        :rtype str
+        """
+        while True:
+            name = self.item_letter[item_type] + str(self.item_count[item_type])
+            if self.isFeasibleName(name):
+                return name
+            else:
+                self.item_count[item_type] = self.item_count[item_type] + 1
+
+    def newId(self):
+        """Returns a new unique element ID
+
+        :rtype int
+        """
+        self.next_id = self.next_id + 1
+        return self.next_id
+
+    # Node-related functions
+
+    def addNode(self, node_type, x=0.0, y=0.0, name=None, ip=None, prefix_len=None, intfs=None):
+        """Adds a new node to the topology
+
+        :param node_type: node's type
+        :type node_type: str
+        :param x: node's horizontal position
+        :type x: float
+        :param y: node's vertical position
+        :type y: float
+        :param name: node's name (optional, assigned automatically if None)
+        :type name: str
+        :param ip: node's default IP address (optional, allocated if None)
+        :type ip: str
+        :param prefix_len: prefix length of the default IP address
+        :type prefix_len: int
+        :param intfs: interfaces (name and address) of nodes from previous sessions (optional)
+        :type intfs: dict
+        :returns new node record
+        :rtype NodeRecord
+        """
+        if name is None:
+            name = self.newName(node_type)
+
+        # Default IP address: allocated for new nodes, reserved for previous ones
+        if node_type == "Switch":
+            ip, prefix_len = "", ""
+        elif ip is None:
+            node_ip = self.ip_allocator.allocateAddress()
+            if node_ip is None:
+                node_ip = ("", "")
+            ip, prefix_len = node_ip
+        elif ip != "":
+            self.ip_allocator.reserveAddress(str(ip) + "/" + str(prefix_len))
+
+        # Creation of node and saving into indexes
+        node = NodeRecord(self.newId(), name, node_type, x, y, ip, prefix_len)
+        self.nodes[node.node_id] = node
+        self.node_ids[name] = node.node_id
+        self.adjacency[node.node_id] = {}
+        self.increaseVersion("add_node", node)
+
+        if intfs:
+            for intf_name, address in intfs.items():
+                node.intfs[intf_name] = IntfRecord(intf_name, address)
+                if address != "":
+                    self.ip_allocator.reserveAddress(address)
+            node.rebuildIntfNumbers()
+
+        self.item_count[node_type] = self.item_count[node_type] + 1
+        self.notifyChange("add_node", node)
+
+        return node
+
+    def removeNode(self, node_id):
+        """Removes a node and all the links related to it
+
+        :param node_id: ID of the node to be removed
+        :type node_id: int
+        :returns removed node record and removed link records
+        :rtype tuple
+        """
+        node = self.nodes[node_id]
+        removed_links = [self.removeLink(link_id) for link_id in list(node.link_intfs)]
+
+        # Addresses are given back
+        if node.ip != "":
+            self.ip_allocator.releaseAddress(node.getDefaultAddress())
+        for intf in node.intfs.values():
+            if intf.address != "":
+                self.ip_allocator.releaseAddress(intf.address)
+
+        self.nodes.pop(node_id)
+        self.node_ids.pop(node.name, None)
+        self.adjacency.pop(node_id, None)
+        self.increaseVersion("remove_node", node)
+        self.notifyChange("remove_node", node)
+
+        return node, removed_links
+
+    def restoreNode(self, node):
+        """Adds back a removed node, with its ID and its interfaces without link (see removeNode)
+
+        :param node: removed node record
+        :type node: NodeRecord
+        """
+        self.nodes[node.node_id] = node
+        self.node_ids[node.name] = node.node_id
+        self.adjacency[node.node_id] = {}
+        self.increaseVersion("add_node", node)
+
+        # Addresses are taken again
+        if node.ip != "":
+            self.ip_allocator.reserveAddress(node.getDefaultAddress())
+        for intf in node.intfs.values():
+            if intf.address != "":
+                self.ip_allocator.reserveAddress(intf.address)
+        self.notifyChange("add_node", node)
+
+    def moveNode(self, node_id, x, y):
+        """Changes the position of a node
+
+        :param node_id: ID of the node
+        :type node_id: int
+        :param x: new horizontal position
+        :type x: float
+        :param y: new vertical position
+        :type y: float
+        """
+        node = self.nodes[node_id]
+        old_x, old_y = node.x, node.y
+        node.x = x
+        node.y = y
+        self.notifyChange("move_node", node, old_x, old_y)
+
+    def setPinned(self, node_id, pinned=True):
+        """Pins (or unpins) a node, so it keeps its position when the topology is arranged
+
+        :param node_id: ID of the node
+        :type node_id: int
+        :param pinned: new pinning state
+        :type pinned: bool
+        """
+        node = self.nodes[node_id]
+        if node.pinned != pinned:
+            node.pinned = pinned
+            self.notifyChange("pinned", node)
+
+    def renameNode(self, node_id, new_name):
+        """Changes the name of a node (its interfaces keep their names)
+
+        :param node_id: ID of the node to be renamed
+        :type node_id: int
+        :param new_name: new name for the node
+        :type new_name: str
+        """
+        node = self.nodes[node_id]
+        old_name = node.name
+        self.node_ids.pop(node.name, None)
+        self.node_ids[new_name] = node_id
+
+        # New interfaces will be named after the new name
+        node.name = new_name
+        node.rebuildIntfNumbers()
+        self.notifyChange("rename_node", node, old_name)
+
+    def setNodeAddress(self, node_id, ip, prefix_len):
+        """Changes the default IP address of a node
+
+        :param node_id: ID of the node
+        :type node_id: int
+        :param ip: new default IP address
+        :type ip: str
+        :param prefix_len: prefix length of the new address
+        :type prefix_len: int
+        """
+        node = self.nodes[node_id]
+        old_ip, old_prefix_len = node.ip, node.prefix_len
+
+        # The old address is given back, unless one of the node's interfaces still uses it
+        old_address = node.getDefaultAddress()
+        if old_address != "" and all(intf.address != old_address for intf in node.intfs.values()):
+            self.ip_allocator.releaseAddress(old_address)
+        node.ip = ip
+        node.prefix_len = prefix_len
+        if ip != "":
+            self.ip_allocator.reserveAddress(node.getDefaultAddress())
+        self.notifyChange("node_address", node, old_ip, old_prefix_len)
+
+    def setIntfAddress(self, node_id, intf_name, address):
+        """Changes the IP address of an interface, updating the allocator
+
+        :param node_id: ID of the node
+        :type node_id: int
+        :param intf_name: interface name
+        :type intf_name: str
+        :param address: new address with prefix length, as "10.0.0.1/8" (empty if none)
+        :type address: str
+        """
+        intf = self.nodes[node_id].intfs[intf_name]
+        if address == intf.address:
+            return
+
+        if intf.address != "":
+            self.ip_allocator.releaseAddress(intf.address)
+        if address != "":
+            self.ip_allocator.reserveAddress(address)
+        old_address = intf.address
+        intf.address = address
+        self.notifyChange("intf_address", self.nodes[node_id], intf_name, old_address)
+
+    def reserveAddresses(self):
+        """Marks every address of the topology as allocated (e.g. after a plan change)"""
+        for node in self.nodes.values():
+            if node.ip != "":
+                self.ip_allocator.reserveAddress(node.getDefaultAddress())
+            for intf in node.intfs.values():
+                if intf.address != "":
+                    self.ip_allocator.reserveAddress(intf.address)
+
+    # Link-related functions
+
+    def canLink(self, node_id_1, node_id_2):
+        """Checks if the connection between two nodes is possible
+
+        :param node_id_1: ID of the first node
+        :type node_id_1: int
+        :param node_id_2: ID of the second node
+        :type node_id_2: int
+        :rtype bool
+        """
+        if node_id_1 == node_id_2 or node_id_1 not in self.nodes or node_id_2 not in self.nodes:
+            return False
+        elif self.nodes[node_id_1].node_type == "Host" and self.nodes[node_id_2].node_type == "Host":
+            return False
+        elif node_id_2 in self.adjacency[node_id_1]:
+            return False
+
+        return True
+
+    def addLink(self, node_id_1, node_id_2, name=None, is_up=True, intf_1=None, intf_2=None):
+        """Adds a new link between two nodes, creating their interfaces if needed
+
+        :param node_id_1: ID of the first node
+        :type node_id_1: int
+        :param node_id_2: ID of the second node
+        :type node_id_2: int
+        :param name: link's name (optional, assigned automatically if None)
+        :type name: str
+        :param is_up: link's state
+        :type is_up: bool
+        :param intf_1: first node's interface name (optional)
+        :type intf_1: str
+        :param intf_2: second node's interface name (optional)
+        :type intf_2: str
+        :returns new link record
+        :rtype LinkRecord
+        """
+        if name is None:
+            name = self.newName("Link")
+
+        link = LinkRecord(self.newId(), name, (node_id_1, node_id_2), is_up)
+        self.links[link.link_id] = link
+        self.link_ids[name] = link.link_id
+        self.increaseVersion("add_link", link)
+
+        # Adjacency index and interfaces update
+        self.adjacency[node_id_1][node_id_2] = link.link_id
+        self.adjacency[node_id_2][node_id_1] = link.link_id
+        self.attachIntf(self.nodes[node_id_1], link.link_id, intf_1)
+        self.attachIntf(self.nodes[node_id_2], link.link_id, intf_2)
+
+        self.item_count["Link"] = self.item_count["Link"] + 1
+        self.notifyChange("add_link", link)
+
+        return link
+
+    def setLinkState(self, link_id, is_up=True):
+        """Changes the state of a link
+
+        :param link_id: ID of the link
+        :type link_id: int
+        :param is_up: new link's state
+        :type is_up: bool
+        """
+        link = self.links[link_id]
+        if link.is_up != is_up:
+            link.is_up = is_up
+            self.notifyChange("link_state", link)
+
+    @staticmethod
+    def attachIntf(node, link_id, intf_name=None):
+        """Attaches a link to an interface of a node, creating it if needed
+
+        :param node: node record
+        :type node: NodeRecord
+        :param link_id: ID of the link
+        :type link_id: int
+        :param intf_name: interface name (optional, assigned automatically if None)
+        :type intf_name: str
+        """
+        if intf_name is not None and intf_name in node.intfs:
+            intf = node.intfs[intf_name]
+        else:
+            if intf_name is None:
+                intf_name = node.assignIntfName()
+            intf = IntfRecord(intf_name)
+            node.intfs[intf_name] = intf
+
+            # The first interface of hosts and routers takes the node's default address
+            if node.node_type != "Switch" and not node.link_intfs:
+                intf.address = node.getDefaultAddress()
+
+        intf.link_id = link_id
+        node.link_intfs[link_id] = intf.name
+
+    def removeLink(self, link_id):
+        """Removes a link and the interfaces attached to it
+
+        :param link_id: ID of the link to be removed
+        :type link_id: int
+        :returns removed link record
+        :rtype LinkRecord
+        """
+        link = self.links.pop(link_id)
+        self.link_ids.pop(link.name, None)
+        self.increaseVersion("remove_link", link)
+
+        node_id_1, node_id_2 = link.node_ids
+        self.adjacency[node_id_1].pop(node_id_2, None)
+        self.adjacency[node_id_2].pop(node_id_1, None)
+
+        removed_intfs = []
+        for node_id in link.node_ids:
+            node = self.nodes[node_id]
+            intf = node.intfs.pop(node.link_intfs.pop(link_id))
+            removed_intfs.append(intf)
+
+            # Interface address is given back, unless it is the node's default one
+            if intf.address != "" and intf.address.split("/")[0] != str(node.ip):
+                self.ip_allocator.releaseAddress(intf.address)
+
+            intf_number = node.getIntfNumber(intf.name)
+            if intf_number is not None:
+                heapq.heappush(node.free_intf_numbers, intf_number)
+        self.notifyChange("remove_link", link, removed_intfs)
+
+        return link
+
+    def restoreLink(self, link, intfs):
+        """Adds back a removed link, with its ID and the interfaces it had (see removeLink)
+
+        :param link: removed link record
+        :type link: LinkRecord
+        :param intfs: removed interfaces of both nodes, in the order of the link's nodes
+        :type intfs: list
+        """
+        self.links[link.link_id] = link
+        self.link_ids[link.name] = link.link_id
+        self.increaseVersion("add_link", link)
+
+        node_id_1, node_id_2 = link.node_ids
+        self.adjacency[node_id_1][node_id_2] = link.link_id
+        self.adjacency[node_id_2][node_id_1] = link.link_id
+
+        for node_id, intf in zip(link.node_ids, intfs):
+            node = self.nodes[node_id]
+            intf.link_id = link.link_id
+            node.intfs[intf.name] = intf
+            node.link_intfs[link.link_id] = intf.name
+            node.rebuildIntfNumbers()
+            if intf.address != "":
+                self.ip_allocator.reserveAddress(intf.address)
+        self.notifyChange("add_link", link)
+
+    def getLinkIntf(self, link_id, node_id):
+        """Returns the interface of a node attached to a link
+
+        :param link_id: ID of the link
+        :type link_id: int
+        :param node_id: ID of the node
+        :type node_id: int
+        :rtype IntfRecord
+        """
+        node = self.nodes[node_id]
+        return node.intfs[node.link_intfs[link_id]]
+
+    # Addressing functions
+
+    def getSegments(self):
+        """
+        Groups the interfaces of hosts and routers by the network segment
+        they are attached to: all the switches connected between them
+        make up a single segment, and a direct link is a segment itself
+
+        :returns list of segments, each one a list of (node, interface) pairs
+        :rtype list
+        """
+        # Switches connected between them are merged (union-find)
+        parent = {}
+
+        def findRoot(node_id):
+            root = parent.setdefault(node_id, node_id)
+            while root != parent[root]:
+                root = parent[root]
+            while node_id != root:
+                parent[node_id], node_id = root, parent[node_id]
+            return root
+
+        for link in self.links.values():
+            node_1 = self.nodes[link.node_ids[0]]
+            node_2 = self.nodes[link.node_ids[1]]
+            if node_1.node_type == "Switch" and node_2.node_type == "Switch":
+                parent[findRoot(node_1.node_id)] = findRoot(node_2.node_id)
+
+        # Interfaces are grouped according to their segment
+        segments = {}
+        for link in self.links.values():
+            link_nodes = [self.nodes[node_id] for node_id in link.node_ids]
+            switches = [node for node in link_nodes if node.node_type == "Switch"]
+            if switches:
+                segment_key = ("Switch", findRoot(switches[0].node_id))
+            else:
+                segment_key = ("Link", link.link_id)
+
+            segment = segments.setdefault(segment_key, [])
+            for node in link_nodes:
+                if node.node_type != "Switch":
+                    segment.append((node, node.intfs[node.link_intfs[link.link_id]]))
+
+        return [segment for segment in segments.values() if segment]
+
+    def readdress(self):
+        """
+        Assigns new addresses to every host and router interface in one go,
+        following the allocator's address plan: a subnet per LAN segment (wider
+        than the plan's prefix if the segment does not fit in it) and a
+        point-to-point subnet per router-to-router link
+
+        :raises ValueError: if the address plan runs out of subnets or addresses (nothing is changed)
+        """
+        # New addresses are worked out with a fresh allocator, kept only if the plan has enough space
+        allocator = AddressAllocator(self.ip_allocator.plan)
+        new_addresses = {node.node_id: {} for node in self.nodes.values() if node.node_type != "Switch"}
+        new_ips = {}
+
+        # Each segment gets its own subnet, with room for its interfaces and the network and broadcast addresses
+        for segment in self.getSegments():
+            if len(segment) == 2 and all(node.node_type == "Router" for node, intf in segment):
+                kind, prefix_len = "Link", None
+            else:
+                kind, prefix_len = "LAN", 32 - (len(segment) + 1).bit_length()
+
+            network = allocator.allocateSubnet(kind, prefix_len)
+            if network is None:
+                raise ValueError("The address plan has not enough " + kind + " subnets for this scene")
+
+            for node, intf in segment:
+                address = allocator.allocateAddress(network)
+                if address is None:
+                    raise ValueError("Subnet " + str(network) + " has not enough addresses for its segment")
+                new_addresses[node.node_id][intf.name] = str(address[0]) + "/" + str(address[1])
+
+        # Node default address: first addressed interface or, if isolated, one from the default LAN
+        for node_id, intf_addresses in new_addresses.items():
+            node_ip = None
+            for intf_name in self.nodes[node_id].intfs:
+                if intf_name in intf_addresses:
+                    node_ip = intf_addresses[intf_name].split("/")
+                    break
+
+            if node_ip is None and not self.nodes[node_id].intfs:
+                node_ip = allocator.allocateAddress()
+                if node_ip is None:
+                    raise ValueError("The address plan has not enough addresses for isolated nodes")
+
+            new_ips[node_id] = node_ip
+
+        self.ip_allocator = allocator
+
+        # Addresses are applied, and every change notified
+        for node_id, intf_addresses in new_addresses.items():
+            node = self.nodes[node_id]
+            for intf in node.intfs.values():
+                old_address = intf.address
+                intf.address = intf_addresses.get(intf.name, "")
+                if intf.address != old_address:
+                    self.notifyChange("intf_address", node, intf.name, old_address)
+
+            old_ip, old_prefix_len = node.ip, node.prefix_len
+            if new_ips[node_id] is None:
+                node.ip = ""
+            else:
+                node.ip = str(new_ips[node_id][0])
+                node.prefix_len = int(new_ips[node_id][1])
+            if (node.ip, node.prefix_len) != (old_ip, old_prefix_len):
+                self.notifyChange("node_address", node, old_ip, old_prefix_len)
+
+    # Spanning tree-related functions
+
+    def getStpProtocol(self, node_id):
+        """Returns the spanning tree protocol run by a switch
+
+        :param node_id: switch's ID
+        :type node_id: int
+        :returns protocol (see STP_PROTOCOLS)
+        :rtype str
+        """
+        node = self.nodes[node_id]
+        if node.node_type != "Switch":
+            return "None"
+        elif node.stp_protocol is None:
+            return self.stp_protocol
+
+        return node.stp_protocol
+
+    def setStpProtocol(self, protocol, node_id=None):
+        """Changes the spanning tree protocol of the scene or of a single switch
+
+        :param protocol: new protocol (see STP_PROTOCOLS), None to follow the scene's one
+        :type protocol: str
+        :param node_id: switch's ID (optional, the scene's protocol is changed if None)
+        :type node_id: int
+        :raises ValueError: if the protocol is unknown
+        """
+        if protocol not in STP_PROTOCOLS and (protocol is not None or node_id is None):
+            raise ValueError("Unknown spanning tree protocol: " + str(protocol))
+
+        if node_id is None:
+            old_protocol = self.stp_protocol
+            self.stp_protocol = protocol
+            self.notifyChange("stp", None, old_protocol)
+        else:
+            old_protocol = self.nodes[node_id].stp_protocol
+            self.nodes[node_id].stp_protocol = protocol
+            self.notifyChange("stp", self.nodes[node_id], old_protocol)
+
+    # Import/export functions
+
+    def loadData(self, data):
+        """Adds the network topology of a project file (.mn structure) to the model
+
+        :param data: structured network topology data
+        :type data: dict
+        :returns new node and link records
+        :rtype tuple
+        :raises KeyError: if the project data is corrupted
+        :raises ValueError: if the project's spanning tree protocol is unknown
+        """
+        new_nodes = []
+        new_links = []
+
+        # Scene settings
+        settings = data.get("settings", {})
+        if "STP" in settings:
+            self.setStpProtocol(settings["STP"])
+
+        # Addition of nodes, keeping their interface per link
+        node_links = {}
+        for node_data in data.get("nodes", []):
+            node = self.loadNodeData(node_data, node_links)
+            new_nodes.append(node)
+
+        # Addition of links to their interfaces
+        for link_data in data.get("links", []):
+            link = self.loadLinkData(link_data, node_links)
+            new_links.append(link)
+
+        return new_nodes, new_links
+
+    def loadNodeData(self, node_data, node_links):
+        """Adds a node of a project file (.mn structure) to the model
+
+        :param node_data: structured node data
+        :type node_data: dict
+        :param node_links: interface per link name of the loaded nodes, by node ID (the new node's is added)
+        :type node_links: dict
+        :returns new node record
+        :rtype NodeRecord
+        :raises KeyError: if the node data is corrupted
+        :raises ValueError: if the node's spanning tree protocol is unknown
+        """
+        properties = node_data["properties"]
+        node = self.addNode(node_data["type"], node_data["x_pos"], node_data["y_pos"], node_data["name"],
+                            properties.get("IP", ""), properties.get("PrefixLen", ""),
+                            properties["eth_intfs"])
+        if "STP" in properties:
+            self.setStpProtocol(properties["STP"], node.node_id)
+        node.pinned = bool(properties.get("Pinned", False))
+        node_links[node.node_id] = node_data["links"]
+
+        return node
+
+    def loadLinkData(self, link_data, node_links):
+        """Adds a link of a project file (.mn structure) to the model, between nodes already loaded
+
+        :param link_data: structured link data
+        :type link_data: dict
+        :param node_links: interface per link name of the loaded nodes, by node ID
+        :type node_links: dict
+        :returns new link record
+        :rtype LinkRecord
+        :raises KeyError: if the link data is corrupted
+        """
+        link_name = link_data["name"]
+        node_id_1, node_id_2 = [self.node_ids[node_name] for node_name in link_data["nodes"]]
+
+        return self.addLink(node_id_1, node_id_2, link_name, link_data["state"],
+                            node_links[node_id_1].get(link_name), node_links[node_id_2].get(link_name))
+
+    def saveData(self):
+        """Returns the network topology with the project file (.mn) structure
+
+        :returns structured network topology data
+        :rtype dict
+        """
+        nodes_saved = []
+        links_saved = []
+
+        # Saving nodes
+        for node in self.nodes.values():
+            properties = {"eth_intfs": {intf.name: intf.address for intf in node.intfs.values()}}
+            if node.node_type != "Switch":
+                properties["IP"] = node.ip
+                properties["PrefixLen"] = node.prefix_len
+            elif node.stp_protocol is not None:
+                properties["STP"] = node.stp_protocol
+            if node.pinned:
+                properties["Pinned"] = True
+
+            nodes_saved.append({
+                "name": node.name,
+                "type": node.node_type,
+                "x_pos": node.x,
+                "y_pos": node.y,
+                "links": {self.links[link_id].name: intf_name for link_id, intf_name in node.link_intfs.items()},
+                "properties": properties
+            })
+
+        # Saving links
+        for link in self.links.values():
+            links_saved.append({
+                "name": link.name,
+                "nodes": [self.nodes[node_id].name for node_id in link.node_ids],
+                "state": link.is_up
+            })
+
+        # Settings and nodes go first, so files can be loaded progressively (see ProjectReader)
+        return {"settings": {"STP": self.stp_protocol}, "nodes": nodes_saved, "links": links_saved}
+
+
+class UndoStack:
+    """
+    Undo/redo history of a topology model. Every change notified by the model is
+    kept as a small delta (IDs and previous values, or the record of a removed
+    element) in the current entry, an entry holding all the changes of a single
+    user action. Repeated moves of a node in an entry are kept as a single delta
+    """
+    # Bounds of the history: entries and deltas (the oldest entries are dropped)
+    MAX_ENTRIES = 500
+    MAX_DELTAS = 500000
+
+    def __init__(self, model):
+        """
+        :param model: topology model whose changes are recorded
+        :type model: TopologyModel
+        """
+        self.model = model
+        self.undo_entries = []
+        self.redo_entries = []
+        self.delta_count = 0
+
+        # Entry being recorded, nodes already moved in it and nesting of grouped changes (see beginEntry)
+        self.entry = None
+        self.entry_moves = set()
+        self.depth = 0
+
+        # Changes made while undoing or redoing, recorded as the opposite entry
+        self.applying = False
+        self.applied_changes = []
+
+        model.addListener(self.recordChange)
+
+    def clear(self):
+        """Forgets the whole history"""
+        self.undo_entries = []
+        self.redo_entries = []
+        self.delta_count = 0
+        self.entry = None
+        self.entry_moves = set()
+
+    def canUndo(self):
+        """Checks if there are changes to be undone
+
+        :rtype bool
+        """
+        return bool(self.undo_entries or self.entry)
+
+    def canRedo(self):
+        """Checks if there are undone changes to be redone
+
+        :rtype bool
+        """
+        return bool(self.redo_entries)
+
+    # Entry grouping functions
+
+    def beginEntry(self):
+        """Groups all the changes until the matching endEntry call in a single entry"""
+        if self.depth == 0:
+            self.closeEntry()
+        self.depth = self.depth + 1
+
+    def endEntry(self):
+        """Ends a group of changes started with beginEntry"""
+        self.depth = max(self.depth - 1, 0)
+        self.closeEntry()
+
+    def closeEntry(self):
+        """Ends the entry being recorded (if any, and not grouping changes), adding it to the history"""
+        if self.entry is None or self.depth > 0:
+            return
+
+        self.undo_entries.append(self.entry)
+        self.entry = None
+        self.entry_moves = set()
+
+        # The oldest entries are dropped to keep the history bounded
+        while len(self.undo_entries) > 1 and (len(self.undo_entries) > self.MAX_ENTRIES or
+                                              self.delta_count > self.MAX_DELTAS):
+            self.delta_count = self.delta_count - len(self.undo_entries.pop(0))
+
+    # Recording functions
+
+    def recordChange(self, change, *args):
+        """Keeps a change of the model as a delta (see TopologyModel.notifyChange)
+
+        :param change: kind of change
+        :type change: str
+        :param args: records involved in the change and previous values
+        """
+        if change == "clear":
+            self.clear()
+            return
+
+        if self.applying:
+            self.applied_changes.append((change, args))
+        elif self.entry is None:
+            # New changes make the undone ones unreachable
+            for entry in self.redo_entries:
+                self.delta_count = self.delta_count - len(entry)
+            self.redo_entries = []
+
+        if self.entry is None:
+            self.entry = []
+
+        if change == "move_node":
+            # Only the position before the first move is needed
+            node = args[0]
+            if node.node_id in self.entry_moves:
+                return
+            self.entry_moves.add(node.node_id)
+            delta = ("move_node", node.node_id, args[1], args[2])
+        elif change == "add_node":
+            delta = ("add_node", args[0].node_id)
+        elif change == "remove_node":
+            delta = ("remove_node", args[0])
+        elif change == "rename_node":
+            delta = ("rename_node", args[0].node_id, args[1])
+        elif change == "node_address":
+            delta = ("node_address", args[0].node_id, args[1], args[2])
+        elif change == "intf_address":
+            delta = ("intf_address", args[0].node_id, args[1], args[2])
+        elif change == "add_link":
+            delta = ("add_link", args[0].link_id)
+        elif change == "remove_link":
+            delta = ("remove_link", args[0], args[1])
+        elif change == "link_state":
+            delta = ("link_state", args[0].link_id, not args[0].is_up)
+        elif change == "stp":
+            delta = ("stp", args[0].node_id if args[0] is not None else None, args[1])
+        elif change == "pinned":
+            delta = ("pinned", args[0].node_id, not args[0].pinned)
+        else:
+            return
+
+        self.entry.append(delta)
+        self.delta_count = self.delta_count + 1
+
+    # Undo/redo functions
+
+    def undo(self):
+        """Undoes the last entry of the history
+
+        :returns changes made to the model, as (change, args) pairs (see TopologyModel.notifyChange)
+        :rtype list
+        """
+        self.closeEntry()
+        if not self.undo_entries:
+            return []
+
+        changes, entry = self.applyEntry(self.undo_entries.pop())
+        self.redo_entries.append(entry)
+
+        return changes
+
+    def redo(self):
+        """Redoes the last undone entry
+
+        :returns changes made to the model, as (change, args) pairs (see TopologyModel.notifyChange)
+        :rtype list
+        """
+        self.closeEntry()
+        if not self.redo_entries:
+            return []
+
+        changes, entry = self.applyEntry(self.redo_entries.pop())
+        self.undo_entries.append(entry)
+
+        return changes
+
+    def applyEntry(self, entry):
+        """Reverts the deltas of an entry, last to first, recording the opposite entry
+
+        :param entry: deltas to be reverted
+        :type entry: list
+        :returns changes made to the model and opposite entry
+        :rtype tuple
+        """
+        self.delta_count = self.delta_count - len(entry)
+        self.applying = True
+        self.applied_changes = []
+        self.entry = []
+        self.entry_moves = set()
+        model = self.model
+        try:
+            for delta in reversed(entry):
+                change = delta[0]
+                if change == "add_node":
+                    model.removeNode(delta[1])
+                elif change == "remove_node":
+                    model.restoreNode(delta[1])
+                elif change == "move_node":
+                    model.moveNode(delta[1], delta[2], delta[3])
+                elif change == "rename_node":
+                    model.renameNode(delta[1], delta[2])
+                elif change == "node_address":
+                    model.setNodeAddress(delta[1], delta[2], delta[3])
+                elif change == "intf_address":
+                    model.setIntfAddress(delta[1], delta[2], delta[3])
+                elif change == "add_link":
+                    model.removeLink(delta[1])
+                elif change == "remove_link":
+                    model.restoreLink(delta[1], delta[2])
+                elif change == "link_state":
+                    model.setLinkState(delta[1], delta[2])
+                elif change == "stp":
+                    model.setStpProtocol(delta[2], delta[1])
+                elif change == "pinned":
+                    model.setPinned(delta[1], delta[2])
+        finally:
+            changes = self.applied_changes
+            opposite_entry = self.entry
+            self.applying = False
+            self.applied_changes = []
+            self.entry = None
+            self.entry_moves = set()
+
+        return changes, opposite_entry
+
+
+# Project file classes
+
+class ProjectReader:
+    """
+    Incremental reader of project files (.mn): the file is read in chunks and
+    its nodes and links are decoded one by one, so big projects can be shown
+    while they are being loaded
+    """
+    # Number of characters read from the file at once
+    CHUNK_SIZE = 1 << 20
+
+    # Blank characters between JSON values
+    WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+    def __init__(self, project_file, raw_file=None):
+        """
+        :param project_file: project file, opened in text mode
+        :type project_file: io.TextIOBase
+        :param raw_file: binary file under the text one, if compressed (optional, to measure the progress)
+        :type raw_file: io.BufferedIOBase
+        """
+        self.file = project_file
+        self.raw_file = raw_file
+        self.decoder = json.JSONDecoder()
+
+        # Text read and not decoded yet, and current position in it
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+        # Reading progress
+        self.read_size = 0
+        try:
+            self.file_size = os.fstat((raw_file or project_file).fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            self.file_size = 0
+
+    @classmethod
+    def openFile(cls, file_path):
+        """Opens a project file to be read, decompressing it if needed
+
+        :param file_path: path of the project file
+        :type file_path: str
+        :returns reader of the project file
+        :rtype ProjectReader
+        """
+        raw_file = open(file_path, "rb")
+        compressed = raw_file.read(2) == GZIP_MAGIC
+        raw_file.seek(0)
+        if compressed:
+            return cls(io.TextIOWrapper(gzip.GzipFile(fileobj=raw_file, mode="rb"), encoding="utf-8"), raw_file)
+
+        return cls(io.TextIOWrapper(raw_file, encoding="utf-8"), raw_file)
+
+    def close(self):
+        """Closes the project file"""
+        self.file.close()
+        if self.raw_file is not None:
+            self.raw_file.close()
+
+    def getProgress(self):
+        """Returns the part of the file already read
+
+        :rtype float
+        """
+        if self.eof or not self.file_size:
+            return 1.0 if self.eof else 0.0
+        elif self.raw_file is not None and not self.raw_file.closed:
+            return min(self.raw_file.tell() / self.file_size, 1.0)
+
+        return min(self.read_size / self.file_size, 1.0)
+
+    def readChunk(self):
+        """Reads the next chunk of the file, forgetting the text already decoded
+
+        :returns if there was something left to read
+        :rtype bool
+        """
+        if self.eof:
+            return False
+
+        chunk = self.file.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.read_size = self.read_size + len(chunk)
+        return True
+
+    def peekChar(self):
+        """Skips blanks and returns the next character (empty if the file has ended)
+
+        :rtype str
+        """
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            elif not self.readChunk():
+                return ""
+
+    def expectChar(self, characters):
+        """Consumes the next character, which must be one of the given ones
+
+        :param characters: expected characters
+        :type characters: str
+        :returns consumed character
+        :rtype str
+        :raises json.JSONDecodeError: if another character (or the end of the file) is found
+        """
+        char = self.peekChar()
+        if not char or char not in characters:
+            raise json.JSONDecodeError("Expecting one of '" + characters + "'", self.buffer, self.pos)
+
+        self.pos = self.pos + 1
+        return char
+
+    def decodeValue(self):
+        """Decodes the next JSON value, reading as many chunks as needed
+
+        :returns decoded value
+        :raises json.JSONDecodeError: if the value is not valid JSON
+        """
+        self.peekChar()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value may just be incomplete
+                if self.readChunk():
+                    continue
+                raise
+
+            # Values ending with the buffer (as numbers) may go on in the next chunk
+            if end == len(self.buffer) and self.readChunk():
+                continue
+
+            self.pos = end
+            return value
+
+    def readItems(self):
+        """Decodes the project file element by element
+
+        :returns generator of (section, data) pairs: ("node", node data) and ("link", link data)
+                 for the elements of the nodes and links lists, (key, value) for the rest of keys
+        :raises json.JSONDecodeError: if the file does not have a JSON format
+        """
+        self.expectChar("{")
+        if self.peekChar() == "}":
+            return
+
+        while True:
+            key = self.decodeValue()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", self.buffer, self.pos)
+            self.expectChar(":")
+
+            # Lists of nodes and links are decoded element by element
+            if key in ["nodes", "links"] and self.peekChar() == "[":
+                self.pos = self.pos + 1
+                if self.peekChar() == "]":
+                    self.pos = self.pos + 1
+                else:
+                    while True:
+                        yield key[:-1], self.decodeValue()
+                        if self.expectChar(",]") == "]":
+                            break
+            else:
+                yield key, self.decodeValue()
+
+            if self.expectChar(",}") == "}":
+                return
+
+
+class ProjectWriter:
+    """
+    Writes a snapshot of a project (see TopologyModel.saveData and BinaryProjectFile.encodeModel)
+    to a temporary file, optionally compressed, which then replaces the project file at once:
+    if anything fails while writing, the previous project file is kept
+    """
+    # Number of bytes written to the file at once
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, file_path, snapshot, binary=False, compress=False):
+        """
+        :param file_path: path of the project file
+        :type file_path: str
+        :param snapshot: project data (.mn structure) or sections of the binary project file
+        :type snapshot: dict or list
+        :param binary: snapshot is a binary project file
+        :type binary: bool
+        :param compress: file is compressed with gzip
+        :type compress: bool
+        """
+        self.file_path = file_path
+        self.snapshot = snapshot
+        self.binary = binary
+        self.compress = compress
+
+    @staticmethod
+    def encodeData(data):
+        """
+        Encodes project data as JSON, element by element, with the same text as
+        json.dumps(data, sort_keys=True, indent=4, separators=(',', ':')) except
+        for the top-level keys, which keep their order (settings and nodes go
+        first, so files can be loaded progressively, see ProjectReader)
+
+        :param data: project data (.mn structure)
+        :type data: dict
+        :returns generator of text pieces and number of list elements encoded so far
+        """
+        encoder = json.JSONEncoder(sort_keys=True, indent=4, separators=(',', ':'))
+        count = 0
+        yield "{", count
+        for index, (key, value) in enumerate(data.items()):
+            text = ("," if index else "") + "\n    " + encoder.encode(key) + ":"
+            if isinstance(value, list) and value:
+                yield text + "[", count
+                for element_index, element in enumerate(value):
+                    count = count + 1
+                    element_text = encoder.encode(element).replace("\n", "\n        ")
+                    yield ("," if element_index else "") + "\n        " + element_text, count
+                yield "\n    ]", count
+            else:
+                yield text + encoder.encode(value).replace("\n", "\n    "), count
+        yield "\n}", count
+
+    def getPieces(self):
+        """Returns the content of the file in pieces, along with the part of the snapshot they reach
+
+        :returns generator of bytes and progress (from 0 to 1)
+        """
+        if self.binary:
+            total = max(sum(len(data) for name, data in self.snapshot), 1)
+            written = 0
+            for data in BinaryProjectFile.encodeSections(self.snapshot):
+                for start in range(0, len(data), self.CHUNK_SIZE):
+                    piece = data[start:start + self.CHUNK_SIZE]
+                    written = written + len(piece)
+                    yield piece, min(written / total, 1.0)
+            return
+
+        # Text pieces are gathered in chunks before being written
+        total = max(sum(len(value) for value in self.snapshot.values() if isinstance(value, list)), 1)
+        pieces = []
+        size = 0
+        for text, count in self.encodeData(self.snapshot):
+            pieces.append(text)
+            size = size + len(text)
+            if size >= self.CHUNK_SIZE:
+                yield "".join(pieces).encode("utf-8"), count / total
+                pieces = []
+                size = 0
+        yield "".join(pieces).encode("utf-8"), 1.0
+
+    def write(self, progress=None):
+        """Writes the project file (atomically: temporary file and rename)
+
+        :param progress: function called with the part of the file written, from 0 to 1 (optional)
+        :type progress: callable
+        :raises OSError: if the file cannot be written
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        handle, temp_path = tempfile.mkstemp(prefix="." + os.path.basename(self.file_path) + ".",
+                                             suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(handle, "wb") as raw_file:
+                if self.compress:
+                    target_file = gzip.GzipFile(fileobj=raw_file, mode="wb", compresslevel=6, mtime=0)
+                else:
+                    target_file = raw_file
+                for piece, done in self.getPieces():
+                    target_file.write(piece)
+                    if progress is not None:
+                        progress(done)
+                if self.compress:
+                    target_file.close()
+                raw_file.flush()
+                os.fsync(raw_file.fileno())
+
+            # The new file keeps the permissions of the previous one
+            if os.path.exists(self.file_path):
+                shutil.copymode(self.file_path, temp_path)
+            else:
+                os.chmod(temp_path, 0o644)
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        # The rename itself is made durable
+        try:
+            directory_handle = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(directory_handle)
+        except OSError:
+            pass
+        finally:
+            os.close(directory_handle)
+
+
+class BinaryProjectFile:
+    """
+    Compact binary project format (.mnb): every string (names, types, interfaces,
+    addresses) is stored once in a string table and nodes, interfaces and links
+    are fixed-width record arrays, aligned to be read straight from a memory map.
+    It keeps the same information as the JSON format (.mn), so projects can be
+    converted from one to the other without losses (see convertFile)
+    """
+    EXTENSION = ".mnb"
+    MAGIC = b"MNGUIBIN"
+    VERSION = 1
+
+    # Header: magic, version and number of sections, followed by the table of sections (name, offset and size)
+    HEADER = struct.Struct("<8sII")
+    SECTION = struct.Struct("<4s4xQQ")
+
+    # Fixed-width records (strings are indexes of the string table, links and interfaces are row indexes)
+    NODE_DTYPE = np.dtype([("name", "<u4"), ("type", "u1"), ("stp", "u1"), ("pinned", "u1"), ("pad", "u1"),
+                           ("ip", "<u4"), ("prefix_len", "<u4"), ("x", "<f8"), ("y", "<f8"),
+                           ("intf_start", "<u4"), ("intf_count", "<u4")])
+    INTF_DTYPE = np.dtype([("name", "<u4"), ("address", "<u4"), ("link", "<i4")])
+    LINK_DTYPE = np.dtype([("name", "<u4"), ("node_1", "<u4"), ("node_2", "<u4"), ("state", "u1"), ("pad", "3u1")])
+
+    # Node type codes (the same as the graph engine's) and spanning tree protocol codes (0 to follow the scene)
+    TYPE_NAMES = ("Host", "Switch", "Router")
+    STP_NAMES = (None,) + STP_PROTOCOLS
+
+    @classmethod
+    def writeModel(cls, model, file_path):
+        """Saves the topology of a model in a binary project file
+
+        :param model: topology model
+        :type model: TopologyModel
+        :param file_path: path of the project file
+        :type file_path: str
+        :raises ValueError: if some name or address contains a null character
+        """
+        sections = cls.encodeModel(model)
+        with open(file_path, "wb") as project_file:
+            for data in cls.encodeSections(sections):
+                project_file.write(data)
+
+    @classmethod
+    def encodeModel(cls, model):
+        """Returns the sections of the binary project file of a model (a snapshot of its topology)
+
+        :param model: topology model
+        :type model: TopologyModel
+        :returns name and content of every section
+        :rtype list
+        :raises ValueError: if some name or address contains a null character
+        """
+        strings = {}
+        nodes = model.nodes
+        links = model.links
+        link_rows = {link_id: row for row, link_id in enumerate(links)}
+
+        # Node and interface records
+        node_array = np.zeros(len(nodes), dtype=cls.NODE_DTYPE)
+        node_rows = {}
+        node_records = []
+        intf_records = []
+        for row, node in enumerate(nodes.values()):
+            node_rows[node.node_id] = row
+            node_records.append((strings.setdefault(node.name, len(strings)), cls.TYPE_NAMES.index(node.node_type),
+                                 cls.STP_NAMES.index(node.stp_protocol), node.pinned, 0,
+                                 strings.setdefault(node.ip, len(strings)),
+                                 strings.setdefault(json.dumps(node.prefix_len), len(strings)),
+                                 node.x, node.y, len(intf_records), len(node.intfs)))
+            for intf in node.intfs.values():
+                intf_records.append((strings.setdefault(intf.name, len(strings)),
+                                     strings.setdefault(intf.address, len(strings)),
+                                     link_rows.get(intf.link_id, -1)))
+        if node_records:
+            node_array[:] = node_records
+        intf_array = np.array(intf_records, dtype=cls.INTF_DTYPE)
+
+        # Link records
+        link_array = np.array([(strings.setdefault(link.name, len(strings)), node_rows[link.node_ids[0]],
+                                node_rows[link.node_ids[1]], link.is_up, (0, 0, 0)) for link in links.values()],
+                              dtype=cls.LINK_DTYPE)
+
+        # String table, separated by null characters
+        if any("\0" in string for string in strings):
+            raise ValueError("Names and addresses cannot contain null characters")
+        string_data = "\0".join(strings).encode("utf-8")
+        settings_data = json.dumps({"STP": model.stp_protocol}).encode("utf-8")
+
+        return [(b"SETS", settings_data), (b"STRS", string_data), (b"NODE", node_array.tobytes()),
+                (b"INTF", intf_array.tobytes()), (b"LINK", link_array.tobytes())]
+
+    @classmethod
+    def encodeSections(cls, sections):
+        """Encodes the header, the table of sections and the sections (aligned to 8 bytes) of a file
+
+        :param sections: name and content of every section
+        :type sections: list
+        :returns generator of the file's content, in pieces
+        """
+        offset = cls.HEADER.size + cls.SECTION.size * len(sections)
+        table = []
+        for name, data in sections:
+            offset = (offset + 7) // 8 * 8
+            table.append(cls.SECTION.pack(name, offset, len(data)))
+            offset = offset + len(data)
+
+        yield cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(sections)) + b"".join(table)
+        position = cls.HEADER.size + cls.SECTION.size * len(sections)
+        for name, data in sections:
+            padding = (8 - position % 8) % 8
+            yield b"\0" * padding + data
+            position = position + padding + len(data)
+
+    @classmethod
+    def readSections(cls, buffer):
+        """Returns the sections of a binary project file
+
+        :param buffer: content of the file (e.g. a memory map)
+        :type buffer: mmap.mmap or bytes
+        :returns offset and size of every section, by name
+        :rtype dict
+        :raises ValueError: if the file is not a binary project file or it is corrupted
+        """
+        if len(buffer) < cls.HEADER.size:
+            raise ValueError("File too short")
+        magic, version, count = cls.HEADER.unpack_from(buffer, 0)
+        if magic != cls.MAGIC or version > cls.VERSION:
+            raise ValueError("Not a MiniGUI binary project (or a newer version)")
+        if cls.HEADER.size + cls.SECTION.size * count > len(buffer):
+            raise ValueError("Table of sections out of the file")
+
+        sections = {}
+        for index in range(count):
+            name, offset, size = cls.SECTION.unpack_from(buffer, cls.HEADER.size + cls.SECTION.size * index)
+            if offset + size > len(buffer):
+                raise ValueError("Section out of the file")
+            sections[name.decode("ascii")] = (offset, size)
+
+        return sections
+
+    @classmethod
+    def readColumns(cls, buffer):
+        """Decodes the settings, the string table and the records of a binary project file
+
+        :param buffer: content of the file (e.g. a memory map)
+        :type buffer: mmap.mmap or bytes
+        :returns settings, strings, node columns, interface names, addresses and links, and link columns
+        :rtype tuple
+        :raises ValueError: if the file is not a binary project file or it is corrupted
+        :raises KeyError: if some section is missing
+        """
+        sections = cls.readSections(buffer)
+
+        def readArray(name, dtype):
+            offset, size = sections[name]
+            if size % dtype.itemsize:
+                raise ValueError("Section " + name + " corrupted")
+            return np.frombuffer(buffer, dtype, size // dtype.itemsize, offset)
+
+        def readBytes(name):
+            offset, size = sections[name]
+            return buffer[offset:offset + size]
+
+        # Records are copied to Python objects, so the buffer can be closed afterwards
+        strings = readBytes("STRS").decode("utf-8").split("\0")
+        settings = json.loads(readBytes("SETS").decode("utf-8"))
+        node_array = readArray("NODE", cls.NODE_DTYPE)
+        intf_array = readArray("INTF", cls.INTF_DTYPE)
+        link_array = readArray("LINK", cls.LINK_DTYPE)
+        node_columns = [node_array[field].tolist() for field in
+                        ("name", "type", "stp", "pinned", "ip", "prefix_len", "x", "y", "intf_start",
+                         "intf_count")]
+        intf_names = [strings[index] for index in intf_array["name"].tolist()]
+        intf_addresses = [strings[index] for index in intf_array["address"].tolist()]
+        intf_links = intf_array["link"].tolist()
+        link_columns = [link_array[field].tolist() for field in ("name", "node_1", "node_2", "state")]
+        del node_array, intf_array, link_array
+
+        return settings, strings, node_columns, intf_names, intf_addresses, intf_links, link_columns
+
+    @classmethod
+    def readModel(cls, model, file_path):
+        """Adds the topology of a binary project file to a model
+
+        :param model: topology model
+        :type model: TopologyModel
+        :param file_path: path of the project file
+        :type file_path: str
+        :returns new node and link records
+        :rtype tuple
+        :raises ValueError: if the file is not a binary project file or it is corrupted
+        :raises KeyError: if the project data is corrupted
+        """
+        with open(file_path, "rb") as project_file:
+            if os.fstat(project_file.fileno()).st_size == 0:
+                raise ValueError("Empty file")
+
+            # Compressed projects are decompressed in memory, the rest are mapped
+            if project_file.read(2) == GZIP_MAGIC:
+                project_file.seek(0)
+                try:
+                    columns = cls.readColumns(gzip.decompress(project_file.read()))
+                except (OSError, EOFError):
+                    raise ValueError("Compressed file corrupted")
+            else:
+                with mmap.mmap(project_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    columns = cls.readColumns(buffer)
+        settings, strings, node_columns, intf_names, intf_addresses, intf_links, link_columns = columns
+
+        if "STP" in settings:
+            model.setStpProtocol(settings["STP"])
+
+        # Addition of nodes with their interfaces, keeping the interface of every link end
+        new_nodes = []
+        link_intfs = {}
+        prefix_lens = {index: json.loads(strings[index]) for index in set(node_columns[5])}
+        for name, type_code, stp_code, pinned, ip, prefix_len, x, y, intf_start, intf_count in zip(*node_columns):
+            intf_end = intf_start + intf_count
+            node = model.addNode(cls.TYPE_NAMES[type_code], x, y, strings[name], strings[ip], prefix_lens[prefix_len],
+                                 dict(zip(intf_names[intf_start:intf_end], intf_addresses[intf_start:intf_end])))
+            if stp_code:
+                model.setStpProtocol(cls.STP_NAMES[stp_code], node.node_id)
+            node.pinned = bool(pinned)
+            for intf_row in range(intf_start, intf_end):
+                if intf_links[intf_row] >= 0:
+                    link_intfs[(len(new_nodes), intf_links[intf_row])] = intf_names[intf_row]
+            new_nodes.append(node)
+
+        # Addition of links to their interfaces
+        new_links = []
+        for row, (name, node_1, node_2, state) in enumerate(zip(*link_columns)):
+            new_links.append(model.addLink(new_nodes[node_1].node_id, new_nodes[node_2].node_id, strings[name],
+                                           bool(state), link_intfs.get((node_1, row)), link_intfs.get((node_2, row))))
+
+        return new_nodes, new_links
+
+    @classmethod
+    def convertFile(cls, source_path, target_path):
+        """Converts a project file from JSON (.mn) to binary (.mnb) format, or the other way around
+
+        :param source_path: path of the project to be converted (binary if it has the .mnb extension)
+        :type source_path: str
+        :param target_path: path of the converted project (binary if it has the .mnb extension)
+        :type target_path: str
+        """
+        model = TopologyModel()
+        if source_path.endswith(cls.EXTENSION):
+            cls.readModel(model, source_path)
+        else:
+            reader = ProjectReader.openFile(source_path)
+            try:
+                model.loadData(json.load(reader.file))
+            finally:
+                reader.close()
+
+        if target_path.endswith(cls.EXTENSION):
+            ProjectWriter(target_path, cls.encodeModel(model), binary=True).write()
+        else:
+            ProjectWriter(target_path, model.saveData()).write()
+
+
+class ChangeJournal:
+    """
+    Append-only journal of the changes made to a topology model since its last
+    full save, one compact JSON list per line. Node moves are gathered and only
+    their last position is written. Flushing the journal to disk (sync) is cheap,
+    so it can be done often, and replaying the journal onto the last saved project
+    recovers the changes lost in a crash
+    """
+    VERSION = 1
+    EXTENSION = ".journal"
+
+    def __init__(self, model):
+        """
+        :param model: topology model whose changes are journaled
+        :type model: TopologyModel
+        """
+        self.model = model
+        self.file = None
+        self.journal_path = None
+        self.project_path = None
+        self.moved_nodes = {}
+        self.pending = False
+
+        model.addListener(self.recordChange)
+
+    @classmethod
+    def getJournalPath(cls, project_path):
+        """Returns the path of the journal of a project
+
+        :param project_path: path of the project file (None for new projects)
+        :type project_path: str
+        :rtype str
+        """
+        if project_path is None:
+            directory = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or os.getcwd()
+            return os.path.join(directory, "untitled.mn" + cls.EXTENSION)
+
+        return project_path + cls.EXTENSION
+
+    def start(self, project_path, append=False):
+        """Starts journaling the changes of a project
+
+        :param project_path: path of the project file (None for new projects)
+        :type project_path: str
+        :param append: changes already in the journal are kept (as after a recovery)
+        :type append: bool
+        """
+        self.stop(delete=False)
+        self.project_path = project_path
+        self.journal_path = self.getJournalPath(project_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+
+        if append and os.path.exists(self.journal_path):
+            self.file = open(self.journal_path, "a", encoding="utf-8")
+        else:
+            self.file = open(self.journal_path, "w", encoding="utf-8")
+            self.file.write(json.dumps({"journal": self.VERSION, "project": project_path}) + "\n")
+        self.pending = True
+
+    def stop(self, delete=True):
+        """Stops journaling changes
+
+        :param delete: the journal file is deleted (its changes are saved or discarded)
+        :type delete: bool
+        """
+        if self.file is None:
+            return
+
+        if not delete:
+            self.writeMoves()
+        self.file.close()
+        self.file = None
+        self.moved_nodes = {}
+        if delete and os.path.exists(self.journal_path):
+            os.unlink(self.journal_path)
+
+    def sync(self):
+        """Makes the journaled changes durable (autosave)"""
+        if self.file is None or not (self.pending or self.moved_nodes):
+            return
+
+        self.writeMoves()
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = False
+
+    def getCheckpoint(self):
+        """Returns the position of the journal matching the current state of the model (e.g. when saving)
+
+        :rtype int
+        """
+        if self.file is None:
+            return 0
+
+        self.writeMoves()
+        self.file.flush()
+        return self.file.tell()
+
+    def compact(self, checkpoint, project_path):
+        """
+        Drops the changes journaled before a checkpoint, once they are saved in
+        the project file, and keeps journaling the project (maybe at a new path)
+
+        :param checkpoint: position returned by getCheckpoint when the project was saved
+        :type checkpoint: int
+        :param project_path: path of the saved project file
+        :type project_path: str
+        """
+        if self.file is None:
+            return
+
+        # Changes made while saving are kept
+        self.writeMoves()
+        self.file.flush()
+        with open(self.journal_path, "r", encoding="utf-8") as journal_file:
+            journal_file.seek(checkpoint)
+            changes = journal_file.read()
+
+        self.stop(delete=True)
+        self.start(project_path)
+        self.file.write(changes)
+        self.pending = True
+
+    # Journal writing functions
+
+    def writeEntry(self, entry):
+        """Appends an entry to the journal
+
+        :param entry: change and its values
+        :type entry: list
+        """
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.pending = True
+
+    def writeMoves(self):
+        """Writes the last position of the nodes moved since the previous entry"""
+        if self.file is None or not self.moved_nodes:
+            return
+
+        moved_nodes = self.moved_nodes
+        self.moved_nodes = {}
+        for name, node in moved_nodes.values():
+            self.writeEntry(["move_node", name, node.x, node.y])
+
+    def recordChange(self, change, *args):
+        """Journals a change of the model (see TopologyModel.notifyChange)
+
+        :param change: kind of change
+        :type change: str
+        :param args: records involved in the change and previous values
+        """
+        if self.file is None:
+            return
+
+        # Moves are gathered (with the node's name when moved, as a rename is notified once applied),
+        # the rest of changes are written in order
+        if change == "move_node":
+            self.moved_nodes[args[0].node_id] = (args[0].name, args[0])
+            return
+        self.writeMoves()
+
+        if change == "add_node":
+            node = args[0]
+            self.writeEntry(["add_node", node.name, node.node_type, node.x, node.y, node.ip, node.prefix_len,
+                             {intf.name: intf.address for intf in node.intfs.values()},
+                             node.stp_protocol, node.pinned])
+        elif change == "remove_node":
+            self.writeEntry(["remove_node", args[0].name])
+        elif change == "rename_node":
+            self.writeEntry(["rename_node", args[1], args[0].name])
+        elif change == "node_address":
+            self.writeEntry(["node_address", args[0].name, args[0].ip, args[0].prefix_len])
+        elif change == "intf_address":
+            self.writeEntry(["intf_address", args[0].name, args[1], args[0].intfs[args[1]].address])
+        elif change == "add_link":
+            link = args[0]
+            node_1, node_2 = [self.model.nodes[node_id] for node_id in link.node_ids]
+            self.writeEntry(["add_link", link.name, node_1.name, node_2.name, link.is_up,
+                             node_1.link_intfs[link.link_id], node_2.link_intfs[link.link_id]])
+        elif change == "remove_link":
+            self.writeEntry(["remove_link", args[0].name])
+        elif change == "link_state":
+            self.writeEntry(["link_state", args[0].name, args[0].is_up])
+        elif change == "stp":
+            node = args[0]
+            if node is None:
+                self.writeEntry(["stp", None, self.model.stp_protocol])
+            else:
+                self.writeEntry(["stp", node.name, node.stp_protocol])
+        elif change == "pinned":
+            self.writeEntry(["pinned", args[0].name, args[0].pinned])
+        elif change == "clear":
+            self.writeEntry(["clear"])
+
+    # Recovery functions
+
+    @classmethod
+    def readJournal(cls, journal_path):
+        """Reads the entries of a journal (a last entry cut by a crash is ignored)
+
+        :param journal_path: path of the journal
+        :type journal_path: str
+        :returns journal's header and entries
+        :rtype tuple
+        :raises ValueError: if the file is not a journal
+        """
+        entries = []
+        with open(journal_path, "r", encoding="utf-8") as journal_file:
+            try:
+                header = json.loads(journal_file.readline())
+            except json.JSONDecodeError:
+                raise ValueError("Not a MiniGUI journal")
+            if not isinstance(header, dict) or header.get("journal") != cls.VERSION:
+                raise ValueError("Not a MiniGUI journal")
+
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if isinstance(entry, list) and entry:
+                    entries.append(entry)
 
+        return header, entries
 
-# Thread classes
+    @classmethod
+    def hasChanges(cls, journal_path):
+        """Checks if a journal exists and has changes to be recovered
 
-class MiniCLI(threading.Thread):
+        :param journal_path: path of the journal
+        :type journal_path: str
+        :rtype bool
+        """
+        if not os.path.exists(journal_path):
+            return False
+
+        try:
+            return bool(cls.readJournal(journal_path)[1])
+        except (OSError, ValueError):
+            return False
+
+    @staticmethod
+    def replay(model, entries):
+        """
+        Applies journaled changes to a model. Changes that do not fit the model (e.g.
+        already applied ones, if the project was saved just before the crash) are skipped
+
+        :param model: topology model, with the last saved project
+        :type model: TopologyModel
+        :param entries: journal entries (see readJournal)
+        :type entries: list
+        :returns number of changes applied
+        :rtype int
+        """
+        applied = 0
+        node_ids = model.node_ids
+        link_ids = model.link_ids
+        for entry in entries:
+            change = entry[0]
+            try:
+                if change == "add_node":
+                    name, node_type, x, y, ip, prefix_len, intfs, stp_protocol, pinned = entry[1:]
+                    if name in node_ids:
+                        continue
+                    node = model.addNode(node_type, x, y, name, ip, prefix_len, intfs)
+                    if stp_protocol is not None:
+                        model.setStpProtocol(stp_protocol, node.node_id)
+                    node.pinned = bool(pinned)
+                elif change == "remove_node":
+                    model.removeNode(node_ids[entry[1]])
+                elif change == "move_node":
+                    model.moveNode(node_ids[entry[1]], entry[2], entry[3])
+                elif change == "rename_node":
+                    if entry[2] in node_ids or entry[2] in link_ids:
+                        continue
+                    model.renameNode(node_ids[entry[1]], entry[2])
+                elif change == "node_address":
+                    model.setNodeAddress(node_ids[entry[1]], entry[2], entry[3])
+                elif change == "intf_address":
+                    model.setIntfAddress(node_ids[entry[1]], entry[2], entry[3])
+                elif change == "add_link":
+                    name, node_name_1, node_name_2, is_up, intf_1, intf_2 = entry[1:]
+                    if name in link_ids or not model.canLink(node_ids[node_name_1], node_ids[node_name_2]):
+                        continue
+                    model.addLink(node_ids[node_name_1], node_ids[node_name_2], name, is_up, intf_1, intf_2)
+                elif change == "remove_link":
+                    model.removeLink(link_ids[entry[1]])
+                elif change == "link_state":
+                    model.setLinkState(link_ids[entry[1]], bool(entry[2]))
+                elif change == "stp":
+                    model.setStpProtocol(entry[2], node_ids[entry[1]] if entry[1] is not None else None)
+                elif change == "pinned":
+                    model.setPinned(node_ids[entry[1]], bool(entry[2]))
+                elif change == "clear":
+                    model.clear()
+                else:
+                    continue
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+            applied = applied + 1
+
+        return applied
+
+
+# Graph analytics classes
+
+class TopologyGraph:
     """
-    Thread class for Mininet CLI, needed to not conflict
-    with PyQt5 event loop
+    Graph engine over a CSR (compressed sparse row) adjacency of the
+    topology model, brought up to date only when the topology changes.
+    Node rows and edges follow the order of the model's nodes and links.
+    A few changes (see TopologyModel.increaseVersion) are patched into the
+    node and edge arrays, without reading the whole model again; after
+    bulk changes (beyond the model's version log), they are rebuilt.
+    The CSR arrays are always sorted again from the edges, in NumPy
     """
-    def __init__(self, net=None):
-        super(MiniCLI, self).__init__(daemon=True)
-        self.net = net
+    # Numeric codes of node types
+    TYPE_CODES = {"Host": 0, "Switch": 1, "Router": 2}
 
-    def run(self):
-        if self.net is not None:
-            CLI(self.net)
-            print("CLI execution has finished")
+    def __init__(self, model):
+        """
+        :param model: topology model to be analysed
+        :type model: TopologyModel
+        """
+        self.model = model
+        self.version = None
+
+        # Node rows: IDs, row per ID and type codes
+        self.node_ids = np.zeros(0, dtype=np.int64)
+        self.node_rows = {}
+        self.node_types = np.zeros(0, dtype=np.int8)
+
+        # Edges (one per link) and CSR adjacency (both directions)
+        self.edge_src = np.zeros(0, dtype=np.int64)
+        self.edge_dst = np.zeros(0, dtype=np.int64)
+        self.edge_links = np.zeros(0, dtype=np.int64)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.indices_links = np.zeros(0, dtype=np.int64)
+
+        # Cached results for the current version
+        self.cache = {}
+
+    def refresh(self):
+        """Brings the CSR adjacency up to date if the model has changed since the last refresh"""
+        model = self.model
+        if self.version == model.version:
+            return
 
+        # Changes since the last refresh, if the model's version log still has all of them
+        changes = None
+        if self.version is not None and model.version - self.version <= len(model.version_log):
+            changes = list(model.version_log)[len(model.version_log) - (model.version - self.version):]
+            if any(change == "clear" for version, change, record in changes):
+                changes = None
 
-class SceneAutoUpdate(QThread):
+        if changes is None:
+            self.rebuildEdges()
+        else:
+            self.patchEdges(changes)
+        self.buildAdjacency()
+
+        self.cache = {}
+        self.version = model.version
+
+    def rebuildEdges(self):
+        """Reads the node rows and the edges of the whole model"""
+        model = self.model
+        self.node_ids = np.fromiter(model.nodes.keys(), dtype=np.int64, count=len(model.nodes))
+        self.node_rows = {node_id: row for row, node_id in enumerate(model.nodes)}
+        self.node_types = np.fromiter((self.TYPE_CODES[node.node_type] for node in model.nodes.values()),
+                                      dtype=np.int8, count=len(model.nodes))
+
+        # Edge list, with the row of both ends of each link
+        rows = self.node_rows
+        links = model.links
+        self.edge_links = np.fromiter(links.keys(), dtype=np.int64, count=len(links))
+        self.edge_src = np.fromiter((rows[link.node_ids[0]] for link in links.values()),
+                                    dtype=np.int64, count=len(links))
+        self.edge_dst = np.fromiter((rows[link.node_ids[1]] for link in links.values()),
+                                    dtype=np.int64, count=len(links))
+
+    def patchEdges(self, changes):
+        """
+        Applies structural changes of the model to the node rows and the edges: added
+        nodes and links are appended and removed ones taken out (later rows move up one
+        place), as in the model's dictionaries, so the result is the same as rebuilding them
+
+        :param changes: (version, change, record) entries of the model's version log, in order
+        :type changes: list
+        """
+        rows = self.node_rows
+        for version, change, record in changes:
+            if change == "add_node":
+                rows[record.node_id] = len(self.node_ids)
+                self.node_ids = np.append(self.node_ids, record.node_id)
+                self.node_types = np.append(self.node_types, np.int8(self.TYPE_CODES[record.node_type]))
+            elif change == "remove_node":
+                row = rows.pop(record.node_id)
+                for node_id in self.node_ids[row + 1:].tolist():
+                    rows[node_id] = rows[node_id] - 1
+                self.node_ids = np.delete(self.node_ids, row)
+                self.node_types = np.delete(self.node_types, row)
+                self.edge_src = self.edge_src - (self.edge_src > row)
+                self.edge_dst = self.edge_dst - (self.edge_dst > row)
+            elif change == "add_link":
+                self.edge_links = np.append(self.edge_links, record.link_id)
+                self.edge_src = np.append(self.edge_src, rows[record.node_ids[0]])
+                self.edge_dst = np.append(self.edge_dst, rows[record.node_ids[1]])
+            elif change == "remove_link":
+                position = np.flatnonzero(self.edge_links == record.link_id)
+                self.edge_links = np.delete(self.edge_links, position)
+                self.edge_src = np.delete(self.edge_src, position)
+                self.edge_dst = np.delete(self.edge_dst, position)
+
+    def buildAdjacency(self):
+        """Builds the CSR adjacency from the edges: edges in both directions sorted by origin row"""
+        src = np.concatenate((self.edge_src, self.edge_dst))
+        dst = np.concatenate((self.edge_dst, self.edge_src))
+        order = np.argsort(src, kind="stable")
+        self.indices = dst[order]
+        self.indices_links = np.concatenate((self.edge_links, self.edge_links))[order]
+        self.indptr = np.zeros(len(self.node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(self.node_ids)), out=self.indptr[1:])
+
+    # Basic queries
+
+    def getDegrees(self):
+        """Returns the degree of each node row
+
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        return np.diff(self.indptr)
+
+    def getDegreeStats(self):
+        """Returns degree statistics of the topology
+
+        :returns dictionary with minimum, maximum and mean degree, and mean degree per node type
+        :rtype dict
+        """
+        degrees = self.getDegrees()
+        stats = {"min": 0, "max": 0, "mean": 0.0, "per_type": {}}
+        if len(degrees) == 0:
+            return stats
+
+        stats["min"] = int(degrees.min())
+        stats["max"] = int(degrees.max())
+        stats["mean"] = float(degrees.mean())
+        for node_type, code in self.TYPE_CODES.items():
+            mask = self.node_types == code
+            if mask.any():
+                stats["per_type"][node_type] = float(degrees[mask].mean())
+
+        return stats
+
+    def expandFrontier(self, frontier):
+        """Returns all the neighbors of a set of rows, along with the row they were reached from
+
+        :param frontier: node rows
+        :type frontier: numpy.ndarray
+        :returns neighbor rows and origin rows
+        :rtype tuple
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Position of each neighbor within indices: start of its row plus offset within the row
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + offsets
+
+        return self.indices[positions], np.repeat(frontier, counts)
+
+    # Connectivity
+
+    def getComponentLabels(self, edge_mask=None):
+        """
+        Labels each node row with the smallest row of its connected component
+        (hooking and pointer jumping over the edge list)
+
+        :param edge_mask: edges to be taken into account (optional, all of them if None)
+        :type edge_mask: numpy.ndarray
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        src, dst = self.edge_src, self.edge_dst
+        if edge_mask is not None:
+            src, dst = src[edge_mask], dst[edge_mask]
+
+        labels = np.arange(len(self.node_ids))
+        while True:
+            # Each root is hooked to the smallest root it is linked to
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, labels[src], labels[dst])
+            np.minimum.at(new_labels, labels[dst], labels[src])
+
+            # Pointer jumping until every row points to its root
+            while True:
+                jumped = new_labels[new_labels]
+                if np.array_equal(jumped, new_labels):
+                    break
+                new_labels = jumped
+
+            if np.array_equal(new_labels, labels):
+                return labels
+            labels = new_labels
+
+    def getComponents(self):
+        """Returns the connected components of the topology
+
+        :returns list of components, each one a list of node IDs
+        :rtype list
+        """
+        self.refresh()
+        if "components" not in self.cache:
+            labels = self.getComponentLabels()
+            order = np.argsort(labels, kind="stable")
+            splits = np.flatnonzero(np.diff(labels[order])) + 1
+            self.cache["components"] = [self.node_ids[group].tolist() for group in np.split(order, splits)
+                                        if len(group)]
+
+        return self.cache["components"]
+
+    def getReachable(self, source_ids):
+        """Returns which nodes can be reached from a set of nodes
+
+        :param source_ids: IDs of the source nodes
+        :type source_ids: list
+        :returns mask of reachable node rows
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        visited = np.zeros(len(self.node_ids), dtype=bool)
+        frontier = np.array([self.node_rows[node_id] for node_id in source_ids], dtype=np.int64)
+        visited[frontier] = True
+
+        while len(frontier):
+            neighbors, origins = self.expandFrontier(frontier)
+            neighbors = np.unique(neighbors[~visited[neighbors]])
+            visited[neighbors] = True
+            frontier = neighbors
+
+        return visited
+
+    def getShortestPath(self, source_id, target_id):
+        """Returns the shortest path (in hops) between two nodes
+
+        :param source_id: ID of the first node
+        :type source_id: int
+        :param target_id: ID of the last node
+        :type target_id: int
+        :returns list of node IDs of the path (empty if there is none)
+        :rtype list
+        """
+        self.refresh()
+        source = self.node_rows[source_id]
+        target = self.node_rows[target_id]
+        parents = np.full(len(self.node_ids), -1, dtype=np.int64)
+        parents[source] = source
+        frontier = np.array([source], dtype=np.int64)
+
+        # Breadth-first search, level by level
+        while len(frontier) and parents[target] < 0:
+            neighbors, origins = self.expandFrontier(frontier)
+            mask = parents[neighbors] < 0
+            frontier, first = np.unique(neighbors[mask], return_index=True)
+            parents[frontier] = origins[mask][first]
+
+        if parents[target] < 0:
+            return []
+
+        path = [target]
+        while path[-1] != source:
+            path.append(int(parents[path[-1]]))
+
+        return [int(self.node_ids[row]) for row in reversed(path)]
+
+    def getHopDistances(self, source_id):
+        """Returns the distance (in hops) from a node to every node (-1 if unreachable)
+
+        :param source_id: ID of the source node
+        :type source_id: int
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        return self.getRowDistances([self.node_rows[source_id]])
+
+    def getRowDistances(self, source_rows):
+        """Returns the distance (in hops) from a set of rows to every node (-1 if unreachable)
+
+        :param source_rows: rows of the source nodes
+        :type source_rows: numpy.ndarray
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        distances = np.full(len(self.node_ids), -1, dtype=np.int64)
+        frontier = np.unique(np.asarray(source_rows, dtype=np.int64))
+        distances[frontier] = 0
+
+        level = 0
+        while len(frontier):
+            level = level + 1
+            neighbors, origins = self.expandFrontier(frontier)
+            frontier = np.unique(neighbors[distances[neighbors] < 0])
+            distances[frontier] = level
+
+        return distances
+
+    def getCoreRows(self):
+        """
+        Returns the rows of the core nodes of the topology: routers if any or,
+        otherwise, the switches farthest from hosts (as the core of a fat-tree)
+
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        routers = np.flatnonzero(self.node_types == self.TYPE_CODES["Router"])
+        if len(routers):
+            return routers
+
+        switches = np.flatnonzero(self.node_types == self.TYPE_CODES["Switch"])
+        hosts = np.flatnonzero(self.node_types == self.TYPE_CODES["Host"])
+        if len(switches) and len(hosts):
+            host_distances = self.getRowDistances(hosts)[switches]
+            if host_distances.max() > 0:
+                return switches[host_distances == host_distances.max()]
+
+        # Without routers or hosts, the most linked node
+        if len(self.node_ids) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.array([int(np.argmax(self.getDegrees()))], dtype=np.int64)
+
+    def getLayers(self):
+        """
+        Returns the layer of every node: hops from the core nodes (see getCoreRows)
+        or, for components without core nodes, from their most linked node
+
+        :returns layer of each node row
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        if "layers" in self.cache:
+            return self.cache["layers"]
+
+        layers = self.getRowDistances(self.getCoreRows())
+        degrees = self.getDegrees()
+        while np.any(layers < 0):
+            unreached = np.flatnonzero(layers < 0)
+            root = unreached[np.argmax(degrees[unreached])]
+            component_layers = self.getRowDistances([root])
+            reached = (component_layers >= 0) & (layers < 0)
+            layers[reached] = component_layers[reached]
+
+        self.cache["layers"] = layers
+        return layers
+
+    def getPivotPositions(self, pivot_count=50):
+        """
+        Returns 2D node positions (in hops) that keep the hop distances between nodes,
+        computed with pivot MDS: classical scaling of the distances to a few pivots,
+        chosen far from each other
+
+        :param pivot_count: maximum number of pivots
+        :type pivot_count: int
+        :returns node positions, one row (x, y) per node row
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        if "pivot_positions" in self.cache:
+            return self.cache["pivot_positions"]
+
+        node_count = len(self.node_ids)
+        pivot_count = min(pivot_count, node_count)
+        if pivot_count < 3:
+            return np.zeros((node_count, 2))
+
+        # Hop distances to pivots: every pivot is the farthest node from the previous ones
+        distances = np.zeros((node_count, pivot_count))
+        nearest = np.full(node_count, np.inf)
+        pivot = 0
+        for column in range(pivot_count):
+            pivot_distances = self.getHopDistances(int(self.node_ids[pivot])).astype(float)
+            pivot_distances[pivot_distances < 0] = pivot_distances.max() + 1
+            distances[:, column] = pivot_distances
+            nearest = np.minimum(nearest, pivot_distances)
+            pivot = int(np.argmax(nearest))
+
+        # Double centering of squared distances and projection on the two main components
+        squared = distances ** 2
+        centered = -0.5 * (squared - squared.mean(axis=0) - squared.mean(axis=1)[:, np.newaxis] + squared.mean())
+        left, singular, right = np.linalg.svd(centered, full_matrices=False)
+        positions = left[:, :2] * np.sqrt(singular[:2])
+
+        self.cache["pivot_positions"] = positions
+        return positions
+
+    # Structure
+
+    def getArticulationPoints(self):
+        """Returns the nodes whose removal splits their component (iterative Tarjan)
+
+        :returns list of node IDs
+        :rtype list
+        """
+        self.refresh()
+        if "articulation" in self.cache:
+            return self.cache["articulation"]
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        count = len(self.node_ids)
+        order = [-1] * count
+        low = [0] * count
+        points = set()
+        counter = 0
+
+        for root in range(count):
+            if order[root] >= 0:
+                continue
+
+            order[root] = low[root] = counter
+            counter = counter + 1
+            root_children = 0
+            stack = [(root, -1, indptr[root])]
+            while stack:
+                row, parent, position = stack[-1]
+                if position < indptr[row + 1]:
+                    stack[-1] = (row, parent, position + 1)
+                    neighbor = indices[position]
+                    if order[neighbor] < 0:
+                        order[neighbor] = low[neighbor] = counter
+                        counter = counter + 1
+                        stack.append((neighbor, row, indptr[neighbor]))
+                        if row == root:
+                            root_children = root_children + 1
+                    elif neighbor != parent:
+                        low[row] = min(low[row], order[neighbor])
+                else:
+                    stack.pop()
+                    if parent >= 0:
+                        low[parent] = min(low[parent], low[row])
+                        if parent != root and low[row] >= order[parent]:
+                            points.add(parent)
+
+            if root_children > 1:
+                points.add(root)
+
+        self.cache["articulation"] = [int(self.node_ids[row]) for row in sorted(points)]
+        return self.cache["articulation"]
+
+    def getSwitchDomains(self):
+        """
+        Labels each node row with the smallest row of its switched (L2) domain:
+        switches connected between them (the rest of rows are labelled alone)
+
+        :rtype numpy.ndarray
+        """
+        self.refresh()
+        if "switch_domains" not in self.cache:
+            switch_code = self.TYPE_CODES["Switch"]
+            edge_mask = ((self.node_types[self.edge_src] == switch_code) &
+                         (self.node_types[self.edge_dst] == switch_code))
+            self.cache["switch_domains"] = self.getComponentLabels(edge_mask)
+
+        return self.cache["switch_domains"]
+
+    def getSwitchLoops(self):
+        """
+        Finds the loops of the switched (L2) domain: links between switches
+        that close a cycle with respect to a spanning forest
+
+        :returns list of link IDs closing loops
+        :rtype list
+        """
+        self.refresh()
+        if "switch_loops" in self.cache:
+            return self.cache["switch_loops"]
+
+        switch_code = self.TYPE_CODES["Switch"]
+        edge_mask = ((self.node_types[self.edge_src] == switch_code) &
+                     (self.node_types[self.edge_dst] == switch_code))
+
+        # Only components with, at least, as many links as switches have loops
+        labels = self.getSwitchDomains()
+        edge_labels = labels[self.edge_src[edge_mask]]
+        edge_count = np.bincount(edge_labels, minlength=len(labels))
+        node_count = np.bincount(labels[self.node_types == switch_code], minlength=len(labels))
+        looped = edge_count >= np.maximum(node_count, 1)
+
+        # Spanning forest within looped components: remaining links close the loops
+        loops = []
+        parent = {}
+        candidates = np.flatnonzero(edge_mask)[looped[edge_labels]]
+        for src, dst, link_id in zip(self.edge_src[candidates].tolist(), self.edge_dst[candidates].tolist(),
+                                     self.edge_links[candidates].tolist()):
+            root_src = self.findRoot(parent, src)
+            root_dst = self.findRoot(parent, dst)
+            if root_src == root_dst:
+                loops.append(link_id)
+            else:
+                parent[root_src] = root_dst
+
+        self.cache["switch_loops"] = loops
+        return loops
+
+    @staticmethod
+    def findRoot(parent, row):
+        """Union-find lookup with path compression
+
+        :param parent: parent of each visited row
+        :type parent: dict
+        :param row: node row
+        :type row: int
+        :rtype int
+        """
+        root = parent.setdefault(row, row)
+        while root != parent[root]:
+            root = parent[root]
+        while row != root:
+            parent[row], row = root, parent[row]
+
+        return root
+
+
+# Topology validation classes
+
+class TopologyValidator:
     """
-    Thread class to update automatically the scene with information
-    from Mininet simulation
+    Checks the topology before starting Mininet, looking for mistakes that
+    break the network or overload the machine (L2 loops, duplicate addresses...)
     """
-    updateSignal = pyqtSignal()
+    # Maximum number of issues reported per check
+    MAX_ISSUES = 200
 
-    def __init__(self, timer=None):
-        super(SceneAutoUpdate, self).__init__()
-        self.update_active = True
-        if not isinstance(timer, float):
-            self.timer = DEFAULT_TIMER
+    def __init__(self, model, graph):
+        """
+        :param model: topology model to be checked
+        :type model: TopologyModel
+        :param graph: graph engine of the model
+        :type graph: TopologyGraph
+        """
+        self.model = model
+        self.graph = graph
+        self.issues = []
+
+    def addIssue(self, severity, text, node_ids=None, link_ids=None):
+        """Stores a new issue found in the topology
+
+        :param severity: issue severity ("Error" or "Warning")
+        :type severity: str
+        :param text: issue description
+        :type text: str
+        :param node_ids: IDs of the nodes involved (optional)
+        :type node_ids: list
+        :param link_ids: IDs of the links involved (optional)
+        :type link_ids: list
+        """
+        self.issues.append({"severity": severity, "text": text,
+                            "nodes": node_ids or [], "links": link_ids or []})
+
+    def addIssues(self, severity, entries, summary):
+        """Stores a list of issues of the same check, up to the limit
+
+        :param severity: issue severity ("Error" or "Warning")
+        :type severity: str
+        :param entries: (text, node IDs, link IDs) of each issue
+        :type entries: list
+        :param summary: text used to summarise the issues beyond the limit
+        :type summary: str
+        """
+        for text, node_ids, link_ids in entries[:self.MAX_ISSUES]:
+            self.addIssue(severity, text, node_ids, link_ids)
+
+        if len(entries) > self.MAX_ISSUES:
+            self.addIssue(severity, "... and " + str(len(entries) - self.MAX_ISSUES) + " more " + summary)
+
+    def validate(self, basic_mode=True):
+        """Runs all the checks
+
+        :param basic_mode: switches forward with "action=normal" flows (basic mode)
+        :type basic_mode: bool
+        :returns list of issues found
+        :rtype list
+        """
+        self.issues = []
+        self.checkSwitchLoops(basic_mode)
+        self.checkEmptyAddresses()
+        self.checkDuplicateAddresses()
+        self.checkOverlappingPrefixes()
+        self.checkSplitSegments()
+        self.checkRouterReachability()
+
+        return self.issues
+
+    # Checks
+
+    def checkSwitchLoops(self, basic_mode=True):
+        """
+        Reports links between switches that close a loop, which flood broadcast
+        traffic forever unless every switch of their L2 domain runs a spanning
+        tree protocol (a single switch without it keeps forwarding the storm)
+
+        :param basic_mode: switches forward with "action=normal" flows (basic mode)
+        :type basic_mode: bool
+        """
+        loops = self.graph.getSwitchLoops()
+        if not loops:
+            return
+
+        # Switches without spanning tree of each L2 domain
+        labels = self.graph.getSwitchDomains()
+        unprotected = {}
+        for node in self.model.nodes.values():
+            if node.node_type == "Switch" and self.model.getStpProtocol(node.node_id) == "None":
+                unprotected.setdefault(int(labels[self.graph.node_rows[node.node_id]]), []).append(node.name)
+
+        entries = []
+        for link_id in loops:
+            link = self.model.links[link_id]
+            switches = unprotected.get(int(labels[self.graph.node_rows[link.node_ids[0]]]))
+            if not switches:
+                continue
+            nodes = [self.model.nodes[node_id].name for node_id in link.node_ids]
+            entries.append(("Link " + link.name + " (" + nodes[0] + " - " + nodes[1] + ") closes a loop "
+                            "between switches: broadcast storms will take up every CPU core unless "
+                            "spanning tree is enabled in every switch connected to it (missing in " +
+                            ", ".join(switches[:4]) + (", ..." if len(switches) > 4 else "") + ")",
+                            list(link.node_ids), [link_id]))
+
+        self.addIssues("Error" if basic_mode else "Warning", entries, "links closing switch loops")
+
+    def checkEmptyAddresses(self):
+        """Reports host and router interfaces without IP address"""
+        entries = []
+        for node in self.model.nodes.values():
+            if node.node_type == "Switch":
+                continue
+            for intf in node.intfs.values():
+                if intf.address == "":
+                    entries.append(("Interface " + intf.name + " of " + node.name + " has no IP address",
+                                    [node.node_id], [intf.link_id] if intf.link_id is not None else []))
+
+        self.addIssues("Warning", entries, "interfaces without IP address")
+
+    def checkDuplicateAddresses(self):
+        """Reports IP addresses assigned to more than one interface"""
+        owners = {}
+        for node in self.model.nodes.values():
+            for intf in node.intfs.values():
+                if intf.address != "":
+                    owners.setdefault(intf.address.split("/")[0], []).append((node, intf))
+
+        entries = []
+        for address, intfs in owners.items():
+            if len(intfs) > 1:
+                entries.append(("Address " + address + " is used by " +
+                                ", ".join(node.name + " (" + intf.name + ")" for node, intf in intfs),
+                                [node.node_id for node, intf in intfs],
+                                [intf.link_id for node, intf in intfs if intf.link_id is not None]))
+
+        self.addIssues("Error", entries, "duplicate addresses")
+
+    def checkOverlappingPrefixes(self):
+        """
+        Reports subnets used in more than one network segment and subnets
+        overlapping with other ones (one of them contained in the other)
+        """
+        # Subnets of each segment (with one of their interfaces to point at)
+        subnets = {}
+        for index, segment in enumerate(self.model.getSegments()):
+            for node, intf in segment:
+                if intf.address == "":
+                    continue
+                try:
+                    value, prefix_len = AddressAllocator.parseAddress(intf.address)
+                except ValueError:
+                    continue
+                base = value & ((0xFFFFFFFF << (32 - prefix_len)) & 0xFFFFFFFF)
+                subnets.setdefault((base, prefix_len), {}).setdefault(index, node)
+
+        # Same subnet in different segments
+        entries = []
+        for (base, prefix_len), segments in subnets.items():
+            if len(segments) > 1:
+                nodes = list(segments.values())
+                entries.append(("Subnet " + AddressAllocator.formatAddress(base) + "/" + str(prefix_len) +
+                                " is used in " + str(len(segments)) + " different segments (e.g. " +
+                                ", ".join(node.name for node in nodes[:4]) + ")",
+                                [node.node_id for node in nodes], []))
+
+        # Subnets contained in other ones: sweep over subnets sorted by start address
+        containers = []
+        for base, prefix_len in sorted(subnets):
+            end = base + (1 << (32 - prefix_len)) - 1
+            while containers and containers[-1][2] < base:
+                containers.pop()
+            if containers:
+                outer_base, outer_len, outer_end = containers[-1]
+                inner_node = next(iter(subnets[(base, prefix_len)].values()))
+                outer_node = next(iter(subnets[(outer_base, outer_len)].values()))
+                entries.append(("Subnet " + AddressAllocator.formatAddress(base) + "/" + str(prefix_len) +
+                                " (" + inner_node.name + ") overlaps with " +
+                                AddressAllocator.formatAddress(outer_base) + "/" + str(outer_len) +
+                                " (" + outer_node.name + ")",
+                                [inner_node.node_id, outer_node.node_id], []))
+            containers.append((base, prefix_len, end))
+
+        self.addIssues("Warning", entries, "overlapping subnets")
+
+    def checkSplitSegments(self):
+        """Reports network segments whose interfaces are in different subnets, which cannot reach each other"""
+        entries = []
+        for segment in self.model.getSegments():
+            # Interfaces of each subnet of the segment
+            subnets = {}
+            for node, intf in segment:
+                if intf.address == "":
+                    continue
+                try:
+                    value, prefix_len = AddressAllocator.parseAddress(intf.address)
+                except ValueError:
+                    continue
+                base = value & ((0xFFFFFFFF << (32 - prefix_len)) & 0xFFFFFFFF)
+                subnets.setdefault((base, prefix_len), []).append((node, intf))
+
+            if len(subnets) > 1:
+                names = [AddressAllocator.formatAddress(base) + "/" + str(prefix_len) + " (" + intfs[0][0].name + ")"
+                         for (base, prefix_len), intfs in list(subnets.items())[:4]]
+                firsts = [intfs[0] for intfs in subnets.values()]
+                entries.append(("A network segment is split in " + str(len(subnets)) + " subnets: " +
+                                ", ".join(names) + (", ..." if len(subnets) > 4 else "") +
+                                ". Its interfaces only reach the ones in their own subnet",
+                                [node.node_id for node, intf in firsts],
+                                [intf.link_id for node, intf in firsts if intf.link_id is not None]))
+
+        self.addIssues("Warning", entries, "split segments")
+
+    def checkRouterReachability(self):
+        """Reports hosts with no path to any router (only if the topology has routers)"""
+        router_ids = [node.node_id for node in self.model.nodes.values() if node.node_type == "Router"]
+        if not router_ids:
+            return
+
+        reachable = self.graph.getReachable(router_ids)
+        host_code = TopologyGraph.TYPE_CODES["Host"]
+        entries = []
+        for row in np.flatnonzero(~reachable & (self.graph.node_types == host_code)).tolist():
+            node = self.model.nodes[int(self.graph.node_ids[row])]
+            entries.append(("Host " + node.name + " has no path to any router", [node.node_id], []))
+
+        self.addIssues("Warning", entries, "hosts without path to a router")
+
+
+# Layout classes
+
+class ForceLayout:
+    """
+    Fruchterman-Reingold force-directed layout over NumPy arrays: repulsive
+    forces are only computed between close nodes, aggregating the farther
+    ones by grid cells (grid approximation), so every iteration takes
+    linear time
+    """
+    def __init__(self, edges, positions, pinned=None, ideal_length=120.0, iterations=300, seed_positions=None):
+        """
+        :param edges: rows of both ends of each link, one row (src, dst) per link
+        :type edges: numpy.ndarray
+        :param positions: initial node positions, one row (x, y) per node
+        :type positions: numpy.ndarray
+        :param pinned: nodes that keep their position (optional)
+        :type pinned: numpy.ndarray
+        :param ideal_length: ideal distance between linked nodes
+        :type ideal_length: float
+        :param iterations: number of iterations
+        :type iterations: int
+        :param seed_positions: positions (in hops) used if nodes are piled up, as those of pivot MDS (optional)
+        :type seed_positions: numpy.ndarray
+        """
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.pinned = np.zeros(len(self.positions), dtype=bool) if pinned is None else np.asarray(pinned, dtype=bool)
+        self.ideal_length = float(ideal_length)
+        self.iterations = int(iterations)
+        self.iteration = 0
+
+        # Side of the square where nodes are expected to fit
+        node_count = len(self.positions)
+        self.side = self.ideal_length * math.sqrt(max(node_count, 1))
+
+        # Nodes too close to each other (as new ones, placed at the same spot) are scattered first:
+        # seed positions are already close to the final layout, so they only need small moves
+        if self.scatterPositions(seed_positions):
+            self.start_temperature = self.ideal_length * 2
         else:
-            self.timer = timer
+            self.start_temperature = self.side / 10
+        self.temperature = self.start_temperature
 
-    def run(self):
-        time.sleep(10.0)
-        while self.update_active:
-            time.sleep(self.timer)
-            self.updateSignal.emit()
+    def scatterPositions(self, seed_positions=None):
+        """Scatters the free nodes if they are piled up in a small area
 
+        :param seed_positions: positions (in hops) to scatter nodes to (random positions if None)
+        :type seed_positions: numpy.ndarray
+        :returns if nodes were scattered to the seed positions
+        :rtype bool
+        """
+        free = ~self.pinned
+        if free.sum() < 2:
+            return False
 
-# Extended class from Mininet base class
+        extent = np.ptp(self.positions[free], axis=0).max()
+        if extent >= self.side / 4:
+            return False
 
-class Router(Node):
-    """Extended class to convert Linux node in router"""
-    def __init__(self, name, **params):
-        super(Router, self).__init__(name, **params)
+        rng = np.random.default_rng(0)
+        center = self.positions[free].mean(axis=0)
+        scattered = rng.uniform(-self.side / 2, self.side / 2, (int(free.sum()), 2))
+        if seed_positions is not None:
+            seeds = np.asarray(seed_positions, dtype=float)[free]
+            scattered = (seeds - seeds.mean(axis=0)) * self.ideal_length + scattered / self.side * self.ideal_length
 
-    def config(self, **params):
-        super(Router, self).config(**params)
-        self.cmd('sysctl net.ipv4.ip_forward=1')
+        self.positions[free] = center + scattered
 
-    def terminate(self):
-        self.cmd('sysctl net.ipv4.ip_forward=0')
-        super(Router, self).terminate()
+        return seed_positions is not None
+
+    def isFinished(self):
+        """Returns if all the iterations have been done
+
+        :rtype bool
+        """
+        return self.iteration >= self.iterations
+
+    def getRepulsiveForces(self):
+        """
+        Returns the repulsive forces (k^2 / d) on every node, using a grid of cells
+        as wide as the ideal length: forces between nodes of the same cell are exact,
+        while the cells around (up to twice the ideal length) repel as a whole from
+        their centroid, weighted by their number of nodes
+
+        :returns repulsive force on each node, one row (x, y) per node
+        :rtype numpy.ndarray
+        """
+        positions = self.positions
+        node_count = len(positions)
+        length = self.ideal_length
+
+        # Cell of each node, identified by a single integer key
+        cells = np.floor(positions / length).astype(np.int64)
+        cells = cells - cells.min(axis=0) + 2
+        height = int(cells[:, 1].max()) + 3
+        keys = cells[:, 0] * height + cells[:, 1]
+
+        # Occupied cells: number of nodes and centroid
+        cell_keys, node_cells, cell_counts = np.unique(keys, return_inverse=True, return_counts=True)
+        node_cells = node_cells.ravel()
+        centroids = np.column_stack((np.bincount(node_cells, positions[:, 0]) / cell_counts,
+                                     np.bincount(node_cells, positions[:, 1]) / cell_counts))
+
+        # Exact forces within each cell: every node against all the nodes of its cell
+        order = np.argsort(node_cells, kind="stable")
+        cell_starts = np.concatenate(([0], np.cumsum(cell_counts)[:-1]))
+        counts = cell_counts[node_cells]
+        total = int(counts.sum())
+        range_starts = np.repeat(cell_starts[node_cells] - np.cumsum(counts) + counts, counts)
+        sources = np.repeat(np.arange(node_count), counts)
+        targets = order[range_starts + np.arange(total)]
+        distinct = sources != targets
+        sources = sources[distinct]
+        delta = positions[sources] - positions[targets[distinct]]
+        factor = length * length / np.maximum(np.einsum("ij,ij->i", delta, delta), 0.01)
+        forces = np.zeros((node_count, 2))
+        if len(sources):
+            forces[:, 0] = np.bincount(sources, delta[:, 0] * factor, node_count)
+            forces[:, 1] = np.bincount(sources, delta[:, 1] * factor, node_count)
+
+        # Approximated forces from the cells around
+        for offset_x in range(-2, 3):
+            for offset_y in range(-2, 3):
+                if offset_x == 0 and offset_y == 0:
+                    continue
+                # Neighbor cells are looked up once per occupied cell (sorted keys)
+                neighbor_keys = cell_keys + offset_x * height + offset_y
+                cell_neighbors = np.minimum(np.searchsorted(cell_keys, neighbor_keys), len(cell_keys) - 1)
+                occupied = cell_keys[cell_neighbors] == neighbor_keys
+                rows = np.flatnonzero(occupied[node_cells])
+                if len(rows) == 0:
+                    continue
+                neighbors = cell_neighbors[node_cells[rows]]
+                delta = positions[rows] - centroids[neighbors]
+                distance_sq = np.maximum(np.einsum("ij,ij->i", delta, delta), 0.01)
+                factor = np.where(distance_sq < (2 * length) ** 2,
+                                  cell_counts[neighbors] * length * length / distance_sq, 0.0)
+                forces[rows] += delta * factor[:, np.newaxis]
+
+        return forces
+
+    def step(self):
+        """Runs one iteration of the layout
+
+        :returns new node positions
+        :rtype numpy.ndarray
+        """
+        positions = self.positions
+        node_count = len(positions)
+        length = self.ideal_length
+        if node_count == 0 or self.isFinished():
+            self.iteration = self.iterations
+            return positions
+
+        # Repulsive forces between close nodes
+        displacement = self.getRepulsiveForces()
+
+        # Attractive forces (d^2 / k) between linked nodes
+        if len(self.edges):
+            src = self.edges[:, 0]
+            dst = self.edges[:, 1]
+            delta = positions[src] - positions[dst]
+            factor = np.sqrt(np.einsum("ij,ij->i", delta, delta)) / length
+            force_x = delta[:, 0] * factor
+            force_y = delta[:, 1] * factor
+            displacement[:, 0] += np.bincount(dst, force_x, node_count) - np.bincount(src, force_x, node_count)
+            displacement[:, 1] += np.bincount(dst, force_y, node_count) - np.bincount(src, force_y, node_count)
+
+        # Displacement limited by the temperature, which cools down linearly
+        displacement[self.pinned] = 0.0
+        norm = np.maximum(np.sqrt(np.einsum("ij,ij->i", displacement, displacement)), 1e-9)
+        positions += displacement * (np.minimum(norm, self.temperature) / norm)[:, np.newaxis]
+
+        self.iteration = self.iteration + 1
+        self.temperature = max(self.start_temperature * (1 - self.iteration / self.iterations), length / 50)
+
+        return positions
+
+
+class LayeredLayout:
+    """
+    Hierarchical layout: nodes are placed in horizontal layers (as core,
+    aggregation, edge and hosts of a data center), ordered within each
+    layer with barycenter sweeps to reduce link crossings
+    """
+    def __init__(self, edges, layers, positions, pinned=None, layer_distance=150.0, node_distance=90.0, sweeps=4):
+        """
+        :param edges: rows of both ends of each link, one row (src, dst) per link
+        :type edges: numpy.ndarray
+        :param layers: layer of each node row
+        :type layers: numpy.ndarray
+        :param positions: current node positions, one row (x, y) per node
+        :type positions: numpy.ndarray
+        :param pinned: nodes that keep their position (optional)
+        :type pinned: numpy.ndarray
+        :param layer_distance: vertical distance between layers
+        :type layer_distance: float
+        :param node_distance: minimum horizontal distance between nodes of the same layer
+        :type node_distance: float
+        :param sweeps: number of downward and upward barycenter sweeps
+        :type sweeps: int
+        """
+        self.edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        self.layers = np.asarray(layers, dtype=np.int64)
+        self.positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self.pinned = np.zeros(len(self.positions), dtype=bool) if pinned is None else np.asarray(pinned, dtype=bool)
+        self.layer_distance = float(layer_distance)
+        self.node_distance = float(node_distance)
+        self.sweeps = int(sweeps)
+        self.finished = False
+
+    def isFinished(self):
+        """Returns if the layout has been computed
+
+        :rtype bool
+        """
+        return self.finished
+
+    def getLayerEdges(self):
+        """
+        Returns the links between consecutive layers, grouped by their lower layer
+
+        :returns upper and lower node rows of the links of each lower layer
+        :rtype dict
+        """
+        layers = self.layers
+        src = self.edges[:, 0]
+        dst = self.edges[:, 1]
+        upper = np.where(layers[src] < layers[dst], src, dst)
+        lower = np.where(layers[src] < layers[dst], dst, src)
+        consecutive = layers[lower] - layers[upper] == 1
+        upper = upper[consecutive]
+        lower = lower[consecutive]
+
+        layer_edges = {}
+        for layer in np.unique(layers[lower]).tolist():
+            mask = layers[lower] == layer
+            layer_edges[layer] = (upper[mask], lower[mask])
+
+        return layer_edges
+
+    def sortLayer(self, rows, ranks, neighbors, others):
+        """Sorts the nodes of a layer by the barycenter of their neighbors in the adjacent layer
+
+        :param rows: node rows of the layer
+        :type rows: numpy.ndarray
+        :param ranks: relative position (0 to 1) of every node within its layer, updated in place
+        :type ranks: numpy.ndarray
+        :param neighbors: rows of the layer's end of the links with the adjacent layer
+        :type neighbors: numpy.ndarray
+        :param others: rows of the adjacent layer's end of the same links
+        :type others: numpy.ndarray
+        """
+        node_count = len(ranks)
+        weights = np.bincount(neighbors, minlength=node_count)[rows]
+        sums = np.bincount(neighbors, ranks[others], minlength=node_count)[rows]
+
+        # Nodes without neighbors in the adjacent layer keep their relative position
+        barycenters = np.where(weights > 0, sums / np.maximum(weights, 1), ranks[rows])
+        order = rows[np.lexsort((ranks[rows], barycenters))]
+        ranks[order] = (np.arange(len(order)) + 0.5) / len(order)
+
+    def step(self):
+        """Computes the whole layout
+
+        :returns new node positions
+        :rtype numpy.ndarray
+        """
+        self.finished = True
+        layers = self.layers
+        node_count = len(layers)
+        if node_count == 0:
+            return self.positions
+
+        # Initial order within each layer: current horizontal position
+        layer_rows = {}
+        ranks = np.zeros(node_count)
+        order = np.lexsort((self.positions[:, 0], layers))
+        for layer in np.unique(layers).tolist():
+            rows = order[layers[order] == layer]
+            layer_rows[layer] = rows
+            ranks[rows] = (np.arange(len(rows)) + 0.5) / len(rows)
+
+        # Barycenter sweeps: downwards (by upper neighbors) and upwards (by lower neighbors)
+        layer_edges = self.getLayerEdges()
+        top_layers = sorted(layer_rows)
+        for sweep in range(self.sweeps):
+            for layer in top_layers[1:]:
+                if layer in layer_edges:
+                    upper, lower = layer_edges[layer]
+                    self.sortLayer(layer_rows[layer], ranks, lower, upper)
+            for layer in reversed(top_layers[:-1]):
+                if layer + 1 in layer_edges:
+                    upper, lower = layer_edges[layer + 1]
+                    self.sortLayer(layer_rows[layer], ranks, upper, lower)
+
+        # Positions: every layer spreads over the width of the widest one, centered where the nodes were
+        width = max(len(rows) for rows in layer_rows.values()) * self.node_distance
+        free = ~self.pinned
+        center = self.positions[free].mean(axis=0) if free.any() else np.zeros(2)
+        new_positions = np.column_stack(((ranks - 0.5) * width + center[0],
+                                         (layers - (layers.max() / 2)) * self.layer_distance + center[1]))
+        self.positions[free] = new_positions[free]
+
+        return self.positions
+
+
+# Topology generation classes
+
+class TopologyGenerator:
+    """
+    Builds regular (Mininet-like) and random topologies as node types and
+    links between node indexes, which are then added to a topology model
+    in one go. It can be used as well to produce benchmark fixtures, as in:
+    TopologyGenerator(seed=0).build(TopologyModel(), "Fat-tree", k=8)
+    """
+    # Available shapes, with their parameters
+    SHAPES = {
+        "Linear": ("switches", "hosts"),
+        "Star": ("hosts",),
+        "Tree": ("depth", "fanout"),
+        "Fat-tree": ("k",),
+        "Ring": ("switches", "hosts"),
+        "Full mesh": ("switches", "hosts"),
+        "Erdős–Rényi": ("switches", "hosts", "probability"),
+        "Barabási–Albert": ("switches", "hosts", "links"),
+    }
+
+    # Shapes arranged in layers (the rest are arranged with a force-directed layout)
+    LAYERED_SHAPES = ("Linear", "Star", "Tree", "Fat-tree")
+
+    # Size limits (nodes plus links): larger topologies are confirmed by the user, bigger ones are rejected
+    LARGE_ELEMENTS = 50000
+    MAX_ELEMENTS = 250000
+
+    def __init__(self, seed=None):
+        """
+        :param seed: seed of random topologies (optional)
+        :type seed: int
+        """
+        self.rng = np.random.default_rng(seed)
+        self.node_types = []
+        self.edges = []
+
+    # Construction functions
+
+    @staticmethod
+    def getSize(shape, **params):
+        """Returns the number of nodes and links of a topology (expected ones if it is random), without generating it
+
+        :param shape: topology shape (see SHAPES)
+        :type shape: str
+        :param params: shape parameters (see generate)
+        :returns number of nodes and links
+        :rtype tuple
+        :raises ValueError: if the shape is unknown
+        """
+        switches = max(int(params.get("switches", 1)), 0)
+        hosts = max(int(params.get("hosts", 1)), 0)
+
+        if shape == "Linear":
+            return switches * (1 + hosts), max(switches - 1, 0) + switches * hosts
+        elif shape == "Star":
+            return 1 + hosts, hosts
+        elif shape == "Tree":
+            depth, fanout = max(int(params.get("depth", 2)), 1), max(int(params.get("fanout", 2)), 1)
+            switches = sum(fanout ** level for level in range(depth))
+            return switches + fanout ** depth, switches - 1 + fanout ** depth
+        elif shape == "Fat-tree":
+            k = max(int(params.get("k", 4)), 2)
+            return 5 * k * k // 4 + k ** 3 // 4, 3 * k ** 3 // 4
+        elif shape == "Ring":
+            return switches * (1 + hosts), (switches if switches > 2 else max(switches - 1, 0)) + switches * hosts
+        elif shape == "Full mesh":
+            return switches * (1 + hosts), switches * (switches - 1) // 2 + switches * hosts
+        elif shape == "Erdős–Rényi":
+            probability = min(max(float(params.get("probability", 0.1)), 0.0), 1.0)
+            return switches * (1 + hosts), int(round(probability * switches * (switches - 1) / 2)) + switches * hosts
+        elif shape == "Barabási–Albert":
+            links = max(1, min(int(params.get("links", 2)), switches - 1)) if switches > 1 else 0
+            return switches * (1 + hosts), (switches - links) * links + switches * hosts
+
+        raise ValueError("Unknown topology shape: " + str(shape))
+
+    def addNodes(self, node_type, count):
+        """Adds a group of nodes of the same type
+
+        :param node_type: type of the nodes
+        :type node_type: str
+        :param count: number of nodes
+        :type count: int
+        :returns indexes of the new nodes
+        :rtype numpy.ndarray
+        """
+        first = len(self.node_types)
+        self.node_types.extend([node_type] * int(count))
+        return np.arange(first, first + int(count))
+
+    def addEdges(self, src, dst):
+        """Adds links between two groups of nodes (element by element)
+
+        :param src: indexes of the first nodes
+        :type src: numpy.ndarray
+        :param dst: indexes of the second nodes
+        :type dst: numpy.ndarray
+        """
+        self.edges.append(np.column_stack((np.asarray(src, dtype=np.int64).ravel(),
+                                           np.asarray(dst, dtype=np.int64).ravel())))
+
+    def addHosts(self, switches, hosts):
+        """Adds the same number of hosts to every switch
+
+        :param switches: indexes of the switches
+        :type switches: numpy.ndarray
+        :param hosts: number of hosts per switch
+        :type hosts: int
+        """
+        if hosts > 0:
+            self.addEdges(self.addNodes("Host", len(switches) * hosts), np.repeat(switches, hosts))
+
+    def generate(self, shape, **params):
+        """Generates a topology
+
+        :param shape: topology shape (see SHAPES)
+        :type shape: str
+        :param params: shape parameters: switches, hosts (per switch, or total for stars), depth, fanout,
+                       k (fat-tree), probability (Erdős–Rényi) and links (per new switch, Barabási–Albert)
+        :returns node types and links (one row of node indexes per link)
+        :rtype tuple
+        :raises ValueError: if the shape is unknown, the parameters are not valid or the topology is too big
+        """
+        self.node_types = []
+        self.edges = []
+        switches = int(params.get("switches", 1))
+        hosts = int(params.get("hosts", 1))
+        if switches < 1 or hosts < 0:
+            raise ValueError("Topologies need, at least, one switch")
+
+        node_count, link_count = self.getSize(shape, **params)
+        if node_count + link_count > self.MAX_ELEMENTS:
+            raise ValueError("The topology would have " + str(node_count) + " nodes and " + str(link_count) +
+                             " links, more than the " + str(self.MAX_ELEMENTS) + " elements a scene can hold")
+
+        if shape == "Linear":
+            self.linear(switches, hosts)
+        elif shape == "Star":
+            self.star(hosts)
+        elif shape == "Tree":
+            self.tree(int(params.get("depth", 2)), int(params.get("fanout", 2)))
+        elif shape == "Fat-tree":
+            self.fatTree(int(params.get("k", 4)))
+        elif shape == "Ring":
+            self.ring(switches, hosts)
+        elif shape == "Full mesh":
+            self.fullMesh(switches, hosts)
+        elif shape == "Erdős–Rényi":
+            self.erdosRenyi(switches, hosts, float(params.get("probability", 0.1)))
+        elif shape == "Barabási–Albert":
+            self.barabasiAlbert(switches, hosts, int(params.get("links", 2)))
+        else:
+            raise ValueError("Unknown topology shape: " + str(shape))
+
+        edges = np.concatenate(self.edges) if self.edges else np.zeros((0, 2), dtype=np.int64)
+        return list(self.node_types), edges
+
+    def build(self, model, shape, stp_protocol="RSTP", **params):
+        """
+        Generates a topology and adds it to a topology model. If the topology has
+        loops between switches, they are protected with a spanning tree protocol
+
+        :param model: topology model where the topology is added
+        :type model: TopologyModel
+        :param shape: topology shape (see SHAPES)
+        :type shape: str
+        :param stp_protocol: spanning tree protocol of looped topologies (see STP_PROTOCOLS)
+        :type stp_protocol: str
+        :param params: shape parameters (see generate)
+        :returns new node and link records
+        :rtype tuple
+        """
+        node_types, edges = self.generate(shape, **params)
+        new_nodes = [model.addNode(node_type) for node_type in node_types]
+        new_links = [model.addLink(new_nodes[src].node_id, new_nodes[dst].node_id) for src, dst in edges.tolist()]
+
+        if TopologyGraph(model).getSwitchLoops():
+            model.setStpProtocol(stp_protocol)
+
+        return new_nodes, new_links
+
+    @staticmethod
+    def placeNodes(graph, layered=False, ideal_length=120.0):
+        """Gives positions to all the nodes of the graph's model, as freshly generated ones
+
+        :param graph: graph engine of the model
+        :type graph: TopologyGraph
+        :param layered: nodes are placed in layers (with a force-directed layout if False)
+        :type layered: bool
+        :param ideal_length: ideal distance between linked nodes
+        :type ideal_length: float
+        """
+        graph.refresh()
+        edges = np.column_stack((graph.edge_src, graph.edge_dst))
+        positions = np.zeros((len(graph.node_ids), 2))
+        if layered:
+            layout = LayeredLayout(edges, graph.getLayers(), positions)
+        else:
+            # The pivot seed is already a good layout: big topologies are only refined a few iterations
+            iterations = int(np.clip(250000 / max(len(positions), 1), 10, 50))
+            layout = ForceLayout(edges, positions, ideal_length=ideal_length, iterations=iterations,
+                                 seed_positions=graph.getPivotPositions())
+        while not layout.isFinished():
+            layout.step()
+
+        model = graph.model
+        for node_id, (x, y) in zip(graph.node_ids.tolist(), layout.positions.tolist()):
+            model.moveNode(node_id, x, y)
+
+    # Shapes
+
+    def linear(self, switches, hosts=1):
+        """Chain of switches with hosts on each of them (Mininet LinearTopo)"""
+        switch_nodes = self.addNodes("Switch", switches)
+        self.addEdges(switch_nodes[:-1], switch_nodes[1:])
+        self.addHosts(switch_nodes, hosts)
+
+    def star(self, hosts):
+        """Single switch with all the hosts linked to it (Mininet SingleSwitchTopo)"""
+        self.addHosts(self.addNodes("Switch", 1), hosts)
+
+    def tree(self, depth=2, fanout=2):
+        """Tree of switches with hosts on the last level (Mininet TreeTopo)"""
+        if depth < 1 or fanout < 1:
+            raise ValueError("Tree depth and fanout must be positive")
+
+        level = self.addNodes("Switch", 1)
+        for current_depth in range(1, depth):
+            children = self.addNodes("Switch", len(level) * fanout)
+            self.addEdges(children, np.repeat(level, fanout))
+            level = children
+        self.addHosts(level, fanout)
+
+    def fatTree(self, k=4):
+        """k-ary fat-tree: (k/2)^2 core switches and k pods of k/2 aggregation and k/2 edge switches"""
+        if k < 2 or k % 2:
+            raise ValueError("Fat-tree k must be an even number")
+
+        half = k // 2
+        core = self.addNodes("Switch", half * half)
+        for pod in range(k):
+            aggregation = self.addNodes("Switch", half)
+            edge = self.addNodes("Switch", half)
+
+            # Aggregation switch i is linked to core switches i * k/2 ... (i + 1) * k/2 - 1
+            self.addEdges(np.repeat(aggregation, half), core)
+            # Every aggregation switch is linked to every edge switch of its pod
+            self.addEdges(np.repeat(aggregation, half), np.tile(edge, half))
+            self.addHosts(edge, half)
+
+    def ring(self, switches, hosts=1):
+        """Ring of switches with hosts on each of them"""
+        switch_nodes = self.addNodes("Switch", switches)
+        if switches > 2:
+            self.addEdges(switch_nodes, np.roll(switch_nodes, -1))
+        elif switches == 2:
+            self.addEdges(switch_nodes[:1], switch_nodes[1:])
+        self.addHosts(switch_nodes, hosts)
+
+    def fullMesh(self, switches, hosts=1):
+        """Switches linked all to all, with hosts on each of them"""
+        switch_nodes = self.addNodes("Switch", switches)
+        src, dst = np.triu_indices(switches, 1)
+        self.addEdges(switch_nodes[src], switch_nodes[dst])
+        self.addHosts(switch_nodes, hosts)
+
+    def erdosRenyi(self, switches, hosts=1, probability=0.1):
+        """Switches linked at random, each pair with the same probability G(n, p)"""
+        if not 0.0 <= probability <= 1.0:
+            raise ValueError("Link probability must be between 0 and 1")
+
+        switch_nodes = self.addNodes("Switch", switches)
+        pair_count = switches * (switches - 1) // 2
+        link_count = int(self.rng.binomial(pair_count, probability)) if pair_count else 0
+
+        # Pairs sampled until enough distinct ones are found (all of them if dense)
+        if link_count > pair_count // 2:
+            src, dst = np.triu_indices(switches, 1)
+            chosen = self.rng.choice(pair_count, link_count, replace=False)
+            src, dst = src[chosen], dst[chosen]
+        else:
+            keys = np.zeros(0, dtype=np.int64)
+            while len(keys) < link_count:
+                src = self.rng.integers(0, switches, 2 * (link_count - len(keys)) + 16)
+                dst = self.rng.integers(0, switches, len(src))
+                distinct = src != dst
+                new_keys = np.minimum(src, dst)[distinct] * switches + np.maximum(src, dst)[distinct]
+                keys = np.unique(np.concatenate((keys, new_keys)))
+            keys = self.rng.permutation(keys)[:link_count]
+            src, dst = keys // switches, keys % switches
+
+        self.addEdges(switch_nodes[src], switch_nodes[dst])
+        self.addHosts(switch_nodes, hosts)
+
+    def barabasiAlbert(self, switches, hosts=1, links=2):
+        """Scale-free network: every new switch links to existing ones, preferably to the most linked"""
+        links = max(1, min(int(links), switches - 1)) if switches > 1 else 0
+        switch_nodes = self.addNodes("Switch", switches)
+        if links == 0:
+            self.addHosts(switch_nodes, hosts)
+            return
+
+        # Every node appears in the list once per link: choosing from it is choosing by degree
+        src = []
+        dst = []
+        repeated = list(range(links))
+        uniform = self.rng.random(switches * links * 4).tolist()
+        draw = 0
+        for new_node in range(links, switches):
+            targets = set()
+            while len(targets) < links:
+                if draw == len(uniform):
+                    uniform = self.rng.random(switches * links).tolist()
+                    draw = 0
+                targets.add(repeated[int(uniform[draw] * len(repeated))])
+                draw = draw + 1
+            for target in targets:
+                src.append(new_node)
+                dst.append(target)
+            repeated.extend(targets)
+            repeated.extend([new_node] * links)
+
+        self.addEdges(switch_nodes[np.array(src, dtype=np.int64)], switch_nodes[np.array(dst, dtype=np.int64)])
+        self.addHosts(switch_nodes, hosts)
 
 
 # Node/Link properties dialog classes
@@ -184,7 +4048,7 @@ class HostDialog(BaseDialog):
         eth_layout.setColumnMinimumWidth(5, 10)
         widget.setLayout(eth_layout)
 
-        host_intfs = self.host.properties["eth_intfs"]
+        host_intfs = self.host.record.intfs
         host_scene = self.host.scene()
 
         if not host_intfs:
@@ -209,12 +4073,12 @@ class HostDialog(BaseDialog):
             eth_layout.addWidget(QLabel("/"), index + 1, 3)
 
             # Retrieving interface information
-            if host_intfs[interface] == "":
+            if host_intfs[interface].address == "":
                 eth_ip = ""
                 eth_mask = ""
             else:
-                eth_ip = host_intfs[interface].split("/")[0]
-                eth_mask = host_intfs[interface].split("/")[1]
+                eth_ip = host_intfs[interface].address.split("/")[0]
+                eth_mask = host_intfs[interface].address.split("/")[1]
 
             # IP address label
             intf_ip_label = QLineEdit(str(eth_ip))
@@ -228,8 +4092,8 @@ class HostDialog(BaseDialog):
 
             # Interface (& link) status
             intf_state_button = QCheckBox()
-            intf_id = self.host.searchLinkByIntf(interface)
-            if host_scene.scene_links[intf_id].isLinkUp():
+            intf_id = host_intfs[interface].link_id
+            if intf_id is not None and host_scene.scene_links[intf_id].isLinkUp():
                 intf_state_button.setChecked(True)
 
             intf_state_list[interface] = intf_state_button
@@ -514,7 +4378,7 @@ class RouterDialog(BaseDialog):
         eth_layout.setColumnMinimumWidth(5, 10)
         widget.setLayout(eth_layout)
 
-        router_intfs = self.router.properties["eth_intfs"]
+        router_intfs = self.router.record.intfs
         router_scene = self.router.scene()
 
         if not router_intfs:
@@ -539,12 +4403,12 @@ class RouterDialog(BaseDialog):
             eth_layout.addWidget(QLabel("/"), index + 1, 3)
 
             # Retrieving interface information
-            if router_intfs[interface] == "":
+            if router_intfs[interface].address == "":
                 eth_ip = ""
                 eth_mask = ""
             else:
-                eth_ip = router_intfs[interface].split("/")[0]
-                eth_mask = router_intfs[interface].split("/")[1]
+                eth_ip = router_intfs[interface].address.split("/")[0]
+                eth_mask = router_intfs[interface].address.split("/")[1]
 
             # IP address label
             intf_ip_label = QLineEdit(str(eth_ip))
@@ -558,8 +4422,8 @@ class RouterDialog(BaseDialog):
 
             # Interface (& link) status
             intf_state_button = QCheckBox()
-            intf_id = self.router.searchLinkByIntf(interface)
-            if router_scene.scene_links[intf_id].isLinkUp():
+            intf_id = router_intfs[interface].link_id
+            if intf_id is not None and router_scene.scene_links[intf_id].isLinkUp():
                 intf_state_button.setChecked(True)
 
             intf_state_list[interface] = intf_state_button
@@ -731,95 +4595,429 @@ class RouterDialog(BaseDialog):
                 route_layout.addWidget(del_button, index + 1, 6)
 
 
+class AddressPlanDialog(BaseDialog):
+    """Dialog class to display and edit the address plan"""
+    def __init__(self, plan):
+        """
+        :param plan: current address plan
+        :type plan: dict
+        """
+        super(AddressPlanDialog, self).__init__()
+
+        # Class attributes
+        self.plan = plan
+        self.results = {}
+
+        # Modification of window's properties
+        self.setWindowTitle("Address plan")
+        self.setFixedWidth(400)
+
+        # Address plan structure initialization
+        self.setAddressPlanLayout()
+
+    def setAddressPlanLayout(self):
+        """Displays the address pools and subnet sizes of LANs and router links"""
+        plan_layout = QGridLayout()
+        plan_layout.setColumnMinimumWidth(2, 10)
+        self.base_layout.insertLayout(0, plan_layout)
+
+        plan_layout.addWidget(QLabel("Address pool"), 0, 1)
+        plan_layout.addWidget(QLabel("Subnet prefix"), 0, 3)
+
+        index = 1
+        for kind, text in [("LAN", "LANs"), ("Link", "Router links")]:
+            pool_edit = QLineEdit(str(self.plan[kind + "Pool"]))
+            prefix_edit = QSpinBox()
+            prefix_edit.setRange(1, 32)
+            prefix_edit.setValue(int(self.plan[kind + "Prefix"]))
+
+            plan_layout.addWidget(QLabel(text), index, 0)
+            plan_layout.addWidget(pool_edit, index, 1)
+            plan_layout.addWidget(prefix_edit, index, 3)
+            self.results[kind + "Pool"] = pool_edit
+            self.results[kind + "Prefix"] = prefix_edit
+
+            index = index + 1
+
+        # New nodes take their addresses from a wider LAN, so a big segment stays in one subnet
+        default_edit = QSpinBox()
+        default_edit.setRange(1, 32)
+        default_edit.setValue(int(self.plan["DefaultPrefix"]))
+
+        plan_layout.addWidget(QLabel("New nodes"), index, 0)
+        plan_layout.addWidget(QLabel("A subnet of the LANs pool"), index, 1)
+        plan_layout.addWidget(default_edit, index, 3)
+        self.results["DefaultPrefix"] = default_edit
+
+
+class ValidationDialog(BaseDialog):
+    """Dialog class to display the issues found in the topology"""
+    def __init__(self, issues, scene, starting=True):
+        """
+        :param issues: issues found by the topology validator
+        :type issues: list
+        :param scene: scene where the elements of each issue are focused
+        :type scene: SceneGUI
+        :param starting: the dialog is shown before starting Mininet
+        :type starting: bool
+        """
+        super(ValidationDialog, self).__init__()
+
+        # Class attributes
+        self.issues = issues
+        self.scene = scene
+
+        # Modification of window's properties
+        self.setWindowTitle("Topology validation")
+        self.setMinimumWidth(600)
+
+        # Validation structure initialization
+        self.setIssuesList(starting)
+
+    def setIssuesList(self, starting=True):
+        """Displays the list of issues, focusing their elements in the scene when clicked
+
+        :param starting: the dialog is shown before starting Mininet
+        :type starting: bool
+        """
+        errors = len([issue for issue in self.issues if issue["severity"] == "Error"])
+        if not self.issues:
+            text = "No issues were found in the topology."
+        else:
+            text = (str(errors) + " errors and " + str(len(self.issues) - errors) + " warnings were found. "
+                    "Click on an issue to see its elements in the scene.")
+        if starting:
+            text = text + " Do you want to start the network anyway?"
+
+        label = QLabel(text)
+        label.setWordWrap(True)
+        self.base_layout.insertWidget(0, label)
+
+        issues_list = QListWidget()
+        for issue in self.issues:
+            issues_list.addItem(str(issue["severity"]) + ": " + str(issue["text"]))
+        issues_list.currentRowChanged.connect(self.focusIssue)
+        self.base_layout.insertWidget(1, issues_list)
+
+    def focusIssue(self, row):
+        """Selects and centers in the scene the elements of an issue
+
+        :param row: position of the issue in the list
+        :type row: int
+        """
+        if row < 0 or row >= len(self.issues):
+            return
+
+        issue = self.issues[row]
+        items = ([self.scene.scene_nodes[node_id] for node_id in issue["nodes"] if node_id in self.scene.scene_nodes] +
+                 [self.scene.scene_links[link_id] for link_id in issue["links"] if link_id in self.scene.scene_links])
+        if not items:
+            return
+
+        self.scene.clearSelection()
+        for item in items:
+            if isinstance(item, LinkGUI):
+                self.scene.showSceneLink(item)
+            item.setSelected(True)
+        items[0].setFocus()
+
+        for view in self.scene.views():
+            view.centerOn(items[0])
+
+
+class GenerateDialog(BaseDialog):
+    """Dialog class to choose the shape and size of a generated topology"""
+    # Switches of a full mesh (a link per pair of them)
+    MAX_MESH_SWITCHES = 500
+
+    def __init__(self):
+        super(GenerateDialog, self).__init__()
+
+        # Class attributes
+        self.results = {}
+
+        # Modification of window's properties
+        self.setWindowTitle("Generate topology")
+        self.setFixedWidth(400)
+
+        # Generation parameters structure initialization
+        self.setGenerateLayout()
+        self.updateShapeFields()
+
+    def setGenerateLayout(self):
+        """Displays the topology shapes and their parameters"""
+        generate_layout = QGridLayout()
+        self.base_layout.insertLayout(0, generate_layout)
+
+        shape_box = QComboBox()
+        shape_box.addItems(list(TopologyGenerator.SHAPES.keys()))
+        shape_box.currentTextChanged.connect(self.updateShapeFields)
+        generate_layout.addWidget(QLabel("Shape"), 0, 0)
+        generate_layout.addWidget(shape_box, 0, 1)
+        self.results["shape"] = shape_box
+
+        # Parameters: name, label, minimum, maximum, default value
+        parameters = [("switches", "Switches", 1, 100000, 10),
+                      ("hosts", "Hosts (per switch)", 0, 100000, 1),
+                      ("depth", "Tree depth", 1, 16, 2),
+                      ("fanout", "Tree fanout", 1, 64, 2),
+                      ("k", "Fat-tree k", 2, 48, 4),
+                      ("links", "Links per new switch", 1, 64, 2)]
+
+        index = 1
+        for name, text, minimum, maximum, value in parameters:
+            spin_box = QSpinBox()
+            spin_box.setRange(minimum, maximum)
+            spin_box.setValue(value)
+            spin_box.valueChanged.connect(self.updateSize)
+            generate_layout.addWidget(QLabel(text), index, 0)
+            generate_layout.addWidget(spin_box, index, 1)
+            self.results[name] = spin_box
+            index = index + 1
+        self.results["k"].setSingleStep(2)
+
+        probability_box = QDoubleSpinBox()
+        probability_box.setRange(0.0, 1.0)
+        probability_box.setDecimals(4)
+        probability_box.setSingleStep(0.01)
+        probability_box.setValue(0.1)
+        probability_box.valueChanged.connect(self.updateSize)
+        generate_layout.addWidget(QLabel("Link probability"), index, 0)
+        generate_layout.addWidget(probability_box, index, 1)
+        self.results["probability"] = probability_box
+
+        seed_box = QSpinBox()
+        seed_box.setRange(-1, 2 ** 31 - 1)
+        seed_box.setSpecialValueText("Random")
+        seed_box.setValue(-1)
+        generate_layout.addWidget(QLabel("Seed"), index + 1, 0)
+        generate_layout.addWidget(seed_box, index + 1, 1)
+        self.results["seed"] = seed_box
+
+        # Looped topologies (e.g. rings or meshes) need spanning tree to start in basic mode
+        stp_box = QComboBox()
+        stp_box.addItems(list(STP_PROTOCOLS))
+        stp_box.setCurrentText("RSTP")
+        stp_box.setToolTip("Spanning tree protocol of the switches, if the topology has loops between them")
+        generate_layout.addWidget(QLabel("Spanning tree (loops)"), index + 2, 0)
+        generate_layout.addWidget(stp_box, index + 2, 1)
+        self.results["stp"] = stp_box
+
+        # Size of the topology, updated as the parameters change
+        self.size_label = QLabel()
+        self.size_label.setWordWrap(True)
+        generate_layout.addWidget(self.size_label, index + 3, 0, 1, 2)
+
+    def updateShapeFields(self):
+        """Enables only the parameters used by the selected shape"""
+        shape = self.results["shape"].currentText()
+        for name in ["switches", "hosts", "depth", "fanout", "k", "links", "probability"]:
+            self.results[name].setEnabled(name in TopologyGenerator.SHAPES[shape])
+        self.results["seed"].setEnabled(shape in ["Erdős–Rényi", "Barabási–Albert"])
+
+        # Full meshes grow with the square of their switches
+        self.results["switches"].setMaximum(self.MAX_MESH_SWITCHES if shape == "Full mesh" else 100000)
+        self.updateSize()
+
+    def updateSize(self):
+        """Shows the number of nodes and links of the chosen topology, and if it is too big"""
+        shape, params, seed, stp_protocol = self.getParameters()
+        node_count, link_count = TopologyGenerator.getSize(shape, **params)
+        text = ("About " if shape == "Erdős–Rényi" else "") + str(node_count) + " nodes and " + str(link_count) + \
+            " links"
+        if node_count + link_count > TopologyGenerator.MAX_ELEMENTS:
+            text = text + ": too big, the limit is " + str(TopologyGenerator.MAX_ELEMENTS) + " elements"
+        elif node_count + link_count > TopologyGenerator.LARGE_ELEMENTS:
+            text = text + ": large, it may take a while and a lot of memory"
+        self.size_label.setText(text)
+
+    def getParameters(self):
+        """Returns the selected shape and its parameters
+
+        :returns shape, its parameters, the seed (None if random) and the spanning tree protocol of loops
+        :rtype tuple
+        """
+        shape = self.results["shape"].currentText()
+        params = {name: self.results[name].value() for name in TopologyGenerator.SHAPES[shape]}
+        seed = self.results["seed"].value()
+
+        return shape, params, (seed if seed >= 0 else None), self.results["stp"].currentText()
+
+
 # MiniGUI scene-related classes
 
-class TagGUI(QGraphicsTextItem):
-    """Base class for scene tags (name, interfaces, IP address)"""
-    def __init__(self, text=None, parent=None):
+class SceneTheme:
+    """
+    Theme-dependent resources of the scene (text colors of the tags, colors and pens of the
+    links), shared by all the items and read when they are painted: switching the theme
+    only swaps the theme object in use (see getTheme) and paints the scene again
+    """
+    # Theme objects, by name (built the first time they are used)
+    THEMES = {}
+
+    def __init__(self, name):
         """
-        :param text: text to be introduced in tag
-        :type text: str
-        :param parent: element in charge of tag
+        :param name: name of the theme (light or dark)
+        :type name: str
         """
-        super(TagGUI, self).__init__(text, parent)
+        self.name = name
+        dark = name == "dark"
+
+        # Text colors of the tags, by kind of tag
+        self.tag_colors = {
+            "Eth": QColor(Qt.cyan if dark else Qt.darkCyan),
+            "Ip": QColor(Qt.green if dark else Qt.darkBlue),
+            "Name": QColor(Qt.white if dark else Qt.black)
+        }
 
-        # Text font change
-        font = QFont()
-        font.setBold(True)
-        self.setFont(font)
+        # Colors of the links, by state (up or down) and if they have the user's attention (focus or hover)
+        self.link_colors = {
+            (True, False): QColor(Qt.darkGray if dark else Qt.gray),
+            (True, True): QColor(Qt.darkBlue),
+            (False, False): QColor(Qt.red),
+            (False, True): QColor(Qt.darkRed)
+        }
 
+        # Pens of the links, by dashed line (down or blocked) and color (see LinkGUI.getPenKey)
+        self.link_pens = {}
+        for dashed in (False, True):
+            for color_key, color in self.link_colors.items():
+                pen = QPen(color, 2)
+                pen.setStyle(Qt.DashLine if dashed else Qt.SolidLine)
+                self.link_pens[(dashed,) + color_key] = pen
+
+        # Pens of the link layer by style group (see LinkGUI.getStyleGroup): near and far away (one pixel wide)
+        self.layer_pens = {}
+        for group in range(4):
+            pen = self.link_pens[(group != 0, group < 2, False)]
+            far_pen = QPen(pen)
+            far_pen.setWidth(0)
+            self.layer_pens[group] = (pen, far_pen)
+
+    @classmethod
+    def getTheme(cls):
+        """Returns the theme object of the application's theme (APP_THEME)
+
+        :returns theme object
+        :rtype SceneTheme
+        """
+        theme = cls.THEMES.get(APP_THEME)
+        if theme is None:
+            theme = cls.THEMES[APP_THEME] = SceneTheme(APP_THEME)
+
+        return theme
+
+
+class TagGUI(QGraphicsItem):
+    """
+    Base class for scene tags (name, interfaces, IP address). Tags paint a static
+    text, laid out only when it changes, and keep their bounding rectangle
+    """
+    # Margin around the text (the same as the one of QGraphicsTextItem documents)
+    MARGIN = 4.0
+
+    # Kind of tag, which sets its text color (see SceneTheme)
+    KIND = "Name"
+
+    # Font shared by all the tags, created with the first tag
+    FONT = None
 
-class EthTagGUI(TagGUI):
-    """Extended class for node's interface name tags"""
     def __init__(self, text=None, parent=None):
         """
         :param text: text to be introduced in tag
         :type text: str
         :param parent: element in charge of tag
         """
-        super(EthTagGUI, self).__init__(text, parent)
-        self.updateColor()
+        super(TagGUI, self).__init__(parent)
 
-    def updateColor(self):
-        """Changes the text color if app theme is changed"""
-        if APP_THEME == "light":
-            self.setDefaultTextColor(Qt.darkCyan)
-        elif APP_THEME == "dark":
-            self.setDefaultTextColor(Qt.cyan)
+        # Text font (bold)
+        if TagGUI.FONT is None:
+            TagGUI.FONT = QFont()
+            TagGUI.FONT.setBold(True)
 
+        # Text, its layout and the tag's rectangle
+        self.text = ""
+        self.static_text = QStaticText()
+        self.static_text.setTextFormat(Qt.PlainText)
+        self.static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+        self.rect = QRectF()
+        self.tag_size = (0.0, 0.0)
+        self.setPlainText(text if text is not None else "")
 
-class IpTagGUI(TagGUI):
-    """Extended class for interface's IP address tags"""
-    def __init__(self, text=None, parent=None):
+    def toPlainText(self):
+        """Returns the tag's text
+
+        :rtype str
         """
-        :param text: text to be introduced in tag
+        return self.text
+
+    def setPlainText(self, text):
+        """Changes the tag's text, laying it out and computing the tag's size
+
+        :param text: new text of the tag
         :type text: str
-        :param parent: element in charge of tag
         """
-        super(IpTagGUI, self).__init__(text, parent)
-        self.updateColor()
+        self.prepareGeometryChange()
+        self.text = str(text)
+        self.static_text.setText(self.text)
+        self.static_text.prepare(QTransform(), TagGUI.FONT)
 
-    def updateColor(self):
-        """Changes the text color if app theme is changed"""
-        if APP_THEME == "light":
-            self.setDefaultTextColor(Qt.darkBlue)
-        elif APP_THEME == "dark":
-            self.setDefaultTextColor(Qt.green)
+        size = self.static_text.size()
+        self.rect = QRectF(0.0, 0.0, size.width() + 2 * self.MARGIN, size.height() + 2 * self.MARGIN)
+        self.tag_size = (self.rect.width(), self.rect.height())
+        self.update()
 
+    def getTagSize(self):
+        """Returns the tag's size
 
-class NameTagGUI(TagGUI):
-    """Extended class for node's name tags"""
-    def __init__(self, text=None, parent=None):
+        :returns width and height of the tag
+        :rtype tuple
         """
-        :param text: text to be introduced in tag
-        :type text: str
-        :param parent: element in charge of tag
+        return self.tag_size
+
+    def boundingRect(self):
+        """Returns the tag's rectangle, computed when its text changes
+
+        :rtype QRectF
         """
-        super(NameTagGUI, self).__init__(text, parent)
-        self.updateColor()
+        return self.rect
 
-    def updateColor(self):
-        """Changes the text color if app theme is changed"""
-        if APP_THEME == "light":
-            self.setDefaultTextColor(Qt.black)
-        elif APP_THEME == "dark":
-            self.setDefaultTextColor(Qt.white)
+    def paint(self, painter, option, widget=None):
+        """Paints the tag's text, with the color of the current theme
+
+        :param painter: painter of the scene's view
+        :type painter: QPainter
+        :param option: style options of the item
+        :type option: QStyleOptionGraphicsItem
+        :param widget: widget being painted on
+        :type widget: QWidget
+        """
+        painter.setFont(TagGUI.FONT)
+        painter.setPen(SceneTheme.getTheme().tag_colors[self.KIND])
+        painter.drawStaticText(QPointF(self.MARGIN, self.MARGIN), self.static_text)
+
+
+class EthTagGUI(TagGUI):
+    """Extended class for node's interface name tags"""
+    KIND = "Eth"
+
+
+class IpTagGUI(TagGUI):
+    """Extended class for interface's IP address tags"""
+    KIND = "Ip"
+
+
+class NameTagGUI(TagGUI):
+    """Extended class for node's name tags"""
+    KIND = "Name"
 
 
 class NodeGUI(QGraphicsPixmapItem):
     """Represents a node (host, switch or router) of SceneGUI class"""
-    def __init__(self, x, y, node_type, node_name, properties=None, new_node=False, net_ctrl=None):
+    def __init__(self, record, new_node=False, net_ctrl=None):
         """
-        :param x: horizontal position of node
-        :type x: float
-        :param y: vertical position of node
-        :type y: float
-        :param node_type: type of the new node
-        :type node_type: str
-        :param node_name: name of the new node
-        :type node_name: str
-        :param properties: properties of the node in previous sessions (optional)
-        :type properties: dict
+        :param record: node of the topology model shown by this item
+        :type record: NodeRecord
         :param new_node: determines if the node is created in this session or not
         :type new_node: bool
         :param net_ctrl: pointer to MiniGUI class (optional)
@@ -831,39 +5029,39 @@ class NodeGUI(QGraphicsPixmapItem):
         self.net_controller = net_ctrl
 
         # Initial attributes
+        self.record = record
         self.width = 64
         self.height = 64
-        self.node_name = node_name
-        self.node_type = node_type
-        self.icon = None
         self.image = None
-        self.links = {}
-        self.properties = {}
         self.scene_tags = {"name": None, "IP": {}, "eth": {}}
+        self.tags_pending = False
 
         # Setting up initial attributes
-        self.setNodeAttributes(x, y, properties, new_node)
+        self.setNodeAttributes(new_node)
+
+    @property
+    def node_name(self):
+        """Name of the node, as stored in the topology model"""
+        return self.record.name
+
+    @property
+    def node_type(self):
+        """Type of the node, as stored in the topology model"""
+        return self.record.node_type
 
-    def setNodeAttributes(self, x, y, properties=None, new_node=False):
+    def setNodeAttributes(self, new_node=False):
         """Defines all the internal properties of the node
 
-        :param x: horizontal position of node
-        :type x: float
-        :param y: vertical position of node
-        :type y: float
-        :param properties: properties of the node in previous sessions (optional)
-        :type properties: dict
         :param new_node: determines if the node is created in this session or not
         :type new_node: bool
         """
-        # Acquisition of images
-        images = imagesMiniGUI()
-
-        # Setting up icon and image of the node
-        self.icon = images[self.node_type]
-        self.image = QPixmap(self.icon).scaled(self.width, self.height, Qt.KeepAspectRatio)
+        # Setting up the image of the node (shared by all the nodes of its type)
+        self.image = pixmapMiniGUI(self.node_type, self.width, self.height)
         self.setPixmap(self.image)
 
+        # Offset of the node's center, where links end (the size of the icon never changes)
+        self.center_offset = self.boundingRect().center()
+
         # Setting of flag and internal attributes of the element
         self.setShapeMode(QGraphicsPixmapItem.BoundingRectShape)
         self.setFlag(QGraphicsItem.ItemSendsScenePositionChanges, True)
@@ -874,92 +5072,25 @@ class NodeGUI(QGraphicsPixmapItem):
 
         # Positioning of element on the scene
         self.setZValue(100)
-        self.setPos(x, y)
+        self.setPos(self.record.x, self.record.y)
 
         # Moving element in order to center it where user has clicked (only for new elements)
         if new_node:
             offset = self.boundingRect().topLeft() - self.boundingRect().center()
             self.moveBy(offset.x(), offset.y())
-
-        # Properties assignment / creation
-        self.properties["eth_intfs"] = {}
-        if self.node_type != "Switch":
-            self.properties["IP"] = properties["IP"]
-            self.properties["PrefixLen"] = properties["PrefixLen"]
-            if not new_node:
-                self.properties["eth_intfs"] = properties["eth_intfs"]
-        elif self.node_type == "Switch" and properties is not None:
-            self.properties = properties
+            self.record.x = self.x()
+            self.record.y = self.y()
 
     # Auxiliary functions
 
-    def addNewLink(self, name):
-        """Adds a new link to the node and creates a new interface for it
-
-        :param name: new link's name
-        :type name: str
-        """
-        if name not in self.links:
-            # Creating a new interface name and assignation to link
-            new_intf = self.assignIntfName()
-            self.links[name] = new_intf
-
-            # Creation of interface properties
-            if self.node_type != "Switch" and len(self.links) == 1:
-                self.properties["eth_intfs"][new_intf] = (str(self.properties["IP"]) + "/" +
-                                                          str(self.properties["PrefixLen"]))
-            else:
-                self.properties["eth_intfs"][new_intf] = ""
-
-            return new_intf
-        else:
-            return self.links[name]
-
-    def deleteLink(self, name):
-        """Deletes a link and everything related to it (properties & scene tags)
-
-        :param name: to-be-deleted link's name
-        :type name: str
-        """
-        if name in self.links:
-            intf = self.links.pop(name)
-            self.properties["eth_intfs"].pop(intf)
-            self.scene_tags["eth"].pop(intf)
-            if intf in self.scene_tags["IP"]:
-                self.scene_tags["IP"].pop(intf)
-
-    def searchLinkByIntf(self, intf_name):
-        """Searches a link through its associated interface
+    def removeIntfTags(self, intf_name):
+        """Forgets the scene tags of an interface
 
         :param intf_name: interface's name
         :type intf_name: str
         """
-        for link in self.links:
-            if intf_name == self.links[link]:
-                return link
-
-        return None
-
-    def assignIntfName(self):
-        """Checks all interfaces and assigns a new name for the new interface
-
-        :returns name for the new interface
-        :rtype str
-        """
-        if not self.properties["eth_intfs"]:
-            return self.node_name + "-eth0"
-
-        intf_count = 0
-        intf_base = self.node_name + "-eth"
-        intf_name = intf_base + str(intf_count)
-        for index in range(len(self.properties["eth_intfs"])):
-            if str(intf_name) in self.properties["eth_intfs"]:
-                intf_count = intf_count + 1
-                intf_name = intf_base + str(intf_count)
-            else:
-                break
-
-        return intf_name
+        self.scene_tags["eth"].pop(intf_name, None)
+        self.scene_tags["IP"].pop(intf_name, None)
 
     def changeSceneNameTag(self, new_name):
         """
@@ -970,6 +5101,8 @@ class NodeGUI(QGraphicsPixmapItem):
         :type new_name: str
         """
         tag = self.scene_tags["name"]
+        if tag is None:
+            return
         tag.setPlainText(str(new_name))
         tag.setX((self.boundingRect().width() - tag.boundingRect().width()) / 2)
 
@@ -981,12 +5114,12 @@ class NodeGUI(QGraphicsPixmapItem):
         if "IP" not in self.scene_tags:
             return
 
-        for eth in self.properties["eth_intfs"]:
+        for eth, intf in self.record.intfs.items():
             if eth in self.scene_tags["IP"]:
                 tag = self.scene_tags["IP"][eth]
-                tag.setPlainText(str(self.properties["eth_intfs"][eth]).split("/")[0])
+                tag.setPlainText(str(intf.address).split("/")[0])
                 tag.setX((self.scene_tags["eth"][eth].boundingRect().width() - tag.boundingRect().width()) / 2)
-            elif eth not in self.scene_tags["IP"] and self.properties["eth_intfs"][eth] != "":
+            elif eth not in self.scene_tags["IP"] and eth in self.scene_tags["eth"] and intf.address != "":
                 scene = self.scene()
                 eth_tag = self.scene_tags["eth"][eth]
                 if scene is not None and isinstance(scene, SceneGUI):
@@ -1012,10 +5145,8 @@ class NodeGUI(QGraphicsPixmapItem):
 
             # Node name
             new_name = dialog.results["node_name"].text()
-            if isinstance(scene, SceneGUI) and new_name != self.node_name and scene.isFeasibleName(new_name):
-                scene.scene_nodes[new_name] = scene.scene_nodes.pop(self.node_name)
-                self.node_name = new_name
-                self.changeSceneNameTag(new_name)
+            if isinstance(scene, SceneGUI) and new_name != self.node_name and scene.model.isFeasibleName(new_name):
+                scene.renameSceneNode(self, new_name)
 
             # IP Address per Ethernet interface
             if "eth_intfs_ip" in dialog.results:
@@ -1023,18 +5154,20 @@ class NodeGUI(QGraphicsPixmapItem):
                     new_eth_ip = dialog.results["eth_intfs_ip"][eth].text()
                     new_eth_mask = dialog.results["eth_intfs_mask"][eth].text()
                     if len(new_eth_ip) > 0 and len(new_eth_mask) > 0:
-                        self.properties["eth_intfs"][eth] = str(new_eth_ip) + "/" + str(new_eth_mask)
+                        scene.model.setIntfAddress(self.record.node_id, eth, str(new_eth_ip) + "/" + str(new_eth_mask))
                         if eth == (self.node_name + "-eth0"):
-                            self.properties["IP"] = new_eth_ip
-                            self.properties["PrefixLen"] = new_eth_mask
+                            scene.model.setNodeAddress(self.record.node_id, new_eth_ip, new_eth_mask)
 
             # Link status
             if "eth_intfs_state" in dialog.results:
                 for eth in dialog.results["eth_intfs_state"]:
+                    link_id = self.record.intfs[eth].link_id
+                    if link_id is None:
+                        continue
                     new_eth_state = dialog.results["eth_intfs_state"][eth].isChecked()
-                    scene.scene_links[self.searchLinkByIntf(eth)].setLinkState(new_eth_state)
+                    scene.scene_links[link_id].setLinkState(new_eth_state)
                     if scene.net_running:
-                        self.net_controller.updateNetLinkStatus(scene.scene_links[self.searchLinkByIntf(eth)])
+                        self.net_controller.updateNetLinkStatus(scene.scene_links[link_id])
 
             # Changes are added to scene
             self.changeSceneIpTags()
@@ -1044,40 +5177,37 @@ class NodeGUI(QGraphicsPixmapItem):
             if scene.net_running:
                 self.net_controller.updateNetNodeInterfaces(self)
 
+    def setPinned(self, pinned=True):
+        """Pins (or unpins) the node, so it keeps its position when arranging the scene
+
+        :param pinned: new pinning state
+        :type pinned: bool
+        """
+        scene = self.scene()
+        if scene is not None and isinstance(scene, SceneGUI):
+            scene.model.setPinned(self.record.node_id, pinned)
+            scene.scene_modified = True
+        else:
+            self.record.pinned = pinned
+
     def changePixmapColor(self, mode=None):
         """Changes the node's scene icon according to the selected tool
 
         :param mode: name of operation being executed (select or delete)
         :type mode: str
         """
-        # Initial variables
-        painter = QPainter()
-        image = QImage(self.icon).scaled(self.width, self.height, Qt.KeepAspectRatio)
-        mask = QImage(image)
-        mask_color = Qt.blue
-
-        if mode is not None and mode == "Delete":
-            mask_color = Qt.red
-
-        # 1st layer
-        painter.begin(mask)
-        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
-        painter.fillRect(mask.rect(), mask_color)
-        painter.end()
-
-        # 2nd layer
-        painter.begin(image)
-        painter.setCompositionMode(QPainter.CompositionMode_Overlay)
-        painter.drawImage(0, 0, mask)
-        painter.end()
+        if mode != "Delete":
+            mode = "Select"
 
-        self.setPixmap(QPixmap(image))
+        self.setPixmap(pixmapMiniGUI(self.node_type, self.width, self.height, mode))
 
     def updateIcon(self):
-        """Updates the node's pixmap"""
-        images = imagesMiniGUI()
-        self.icon = images[self.node_type]
-        self.image = QPixmap(self.icon).scaled(self.width, self.height, Qt.KeepAspectRatio)
+        """Updates the node's pixmap (a simple shape when the scene is shown without details)"""
+        scene = self.scene()
+        if isinstance(scene, SceneGUI) and not scene.show_details:
+            self.image = pixmapMiniGUI(self.node_type, self.width, self.height, "Shape")
+        else:
+            self.image = pixmapMiniGUI(self.node_type, self.width, self.height)
         self.setPixmap(self.image)
 
     # Event handlers
@@ -1092,8 +5222,12 @@ class NodeGUI(QGraphicsPixmapItem):
         """
         if change == QGraphicsItem.ItemScenePositionHasChanged:
             scene = self.scene()
-            if scene is not None and isinstance(scene, SceneGUI):
+            if scene is not None and isinstance(scene, SceneGUI) and not scene.bulk_insert:
+                scene.model.moveNode(self.record.node_id, value.x(), value.y())
                 scene.updateSceneLinks(self)
+            else:
+                self.record.x = value.x()
+                self.record.y = value.y()
 
         return QGraphicsItem.itemChange(self, change, value)
 
@@ -1110,6 +5244,15 @@ class NodeGUI(QGraphicsPixmapItem):
         if scene is None or not isinstance(scene, SceneGUI):
             return
 
+        # Pinned nodes keep their position when arranging the scene
+        pin_act = QAction("Pin position", self.net_controller)
+        pin_act.setStatusTip("Keep the node's position when arranging the scene")
+        pin_act.setCheckable(True)
+        pin_act.setChecked(self.record.pinned)
+        pin_act.toggled.connect(lambda checked: self.setPinned(checked))
+        context_menu.addAction(pin_act)
+        context_menu.addSeparator()
+
         # Contextual menu changes according to the node's type: if Switch, menu is different
         if self.node_type != "Switch":
             # Properties menu
@@ -1136,6 +5279,21 @@ class NodeGUI(QGraphicsPixmapItem):
             if not scene.net_running:
                 routing_act.setEnabled(False)
 
+            # Spanning tree protocol of the switch
+            stp_menu = context_menu.addMenu("Spanning tree")
+            stp_group = QActionGroup(stp_menu)
+            stp_options = [(None, "Scene default (" + str(scene.model.stp_protocol) + ")")]
+            stp_options.extend((protocol, protocol) for protocol in STP_PROTOCOLS)
+            for protocol, text in stp_options:
+                stp_act = QAction(text, stp_menu)
+                stp_act.setCheckable(True)
+                stp_act.setChecked(self.record.stp_protocol == protocol)
+                stp_act.triggered.connect(lambda checked, p=protocol: self.net_controller.changeStpProtocol(p, self))
+                stp_group.addAction(stp_act)
+                stp_menu.addAction(stp_act)
+            if scene.net_running:
+                stp_menu.setEnabled(False)
+
         action = context_menu.exec(event.screenPos())
 
     def focusInEvent(self, event):
@@ -1196,7 +5354,7 @@ class NodeGUI(QGraphicsPixmapItem):
 
 class LinkGUI(QGraphicsLineItem):
     """Represents the link that connects two nodes of SceneGUI class"""
-    def __init__(self, x1, y1, x2, y2, net_ctrl=None):
+    def __init__(self, x1, y1, x2, y2, record=None, net_ctrl=None):
         """
         :param x1: horizontal position of first link's end
         :type x1: float
@@ -1206,6 +5364,8 @@ class LinkGUI(QGraphicsLineItem):
         :type x2: float
         :param y2: vertical position of second link's end
         :type y2: float
+        :param record: link of the topology model shown by this item (None while being drawn)
+        :type record: LinkRecord
         :param net_ctrl: pointer to MiniGUI class (optional)
         :type net_ctrl: MiniGUI
         """
@@ -1215,140 +5375,553 @@ class LinkGUI(QGraphicsLineItem):
         self.net_controller = net_ctrl
 
         # Initial attributes
-        self.link_name = ""
-        self.nodes = []
-        self.is_up = True
+        self.record = record
         self.scene_tags = {}
+        self.tags_pending = False
+        self.is_blocked = False
+
+        # Scene of the link, also while its item is not added to it (drawn by the link layer)
+        self.link_scene = None
 
-        # Aesthetic attribute
-        self.pen = QPen()
+        # Key of the theme's pen the link is painted with (see getPenKey)
+        self.pen_key = (False, True, False)
 
         # Setting up initial attributes
         self.setLinkAttributes()
 
     def setLinkAttributes(self):
         """Sets up the link's internal properties"""
-        # Set color and width of the link
-        self.pen.setWidth(2)
-        if APP_THEME == "light":
-            self.pen.setColor(Qt.gray)
-        else:
-            self.pen.setColor(Qt.darkGray)
-
-        self.setPen(self.pen)
+        # Width of the link (the item's pen only sets its shape: links are painted with the theme's pens)
+        self.setPen(QPen(Qt.black, 2))
 
         # Setting of internal attributes
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.ItemIsFocusable, True)
         self.setAcceptHoverEvents(True)
 
+    @property
+    def link_name(self):
+        """Name of the link, as stored in the topology model"""
+        if self.record is None:
+            return ""
+
+        return self.record.name
+
     # Auxiliary functions
 
+    def getScene(self):
+        """Returns the scene of the link, even if its item is not added to it (see LinkLayerGUI)
+
+        :returns scene of the link
+        :rtype SceneGUI
+        """
+        scene = self.scene()
+        if scene is None:
+            scene = self.link_scene
+
+        return scene
+
     def isLinkUp(self):
         """Returns a boolean with the link state
 
         :returns the state of the link
         :rtype bool
         """
-        return self.is_up
+        return self.record is None or self.record.is_up
+
+    def getStyleGroup(self):
+        """Returns the group of links drawn with the same style as this one (see LinkLayerGUI)
+
+        :returns style group: 0 up, 1 up and blocked, 2 down, 3 down and blocked
+        :rtype int
+        """
+        return (0 if self.isLinkUp() else 2) + (1 if self.is_blocked else 0)
+
+    def getPenKey(self, is_up, attention):
+        """Returns the key of the theme's pen for the link (see SceneTheme.link_pens)
+
+        :param is_up: the link is drawn with the color of links up
+        :type is_up: bool
+        :param attention: the link has the user's attention (focus or hover)
+        :type attention: bool
+        :returns dashed line (link down or blocked), color of links up and attention
+        :rtype tuple
+        """
+        return not self.isLinkUp() or self.is_blocked, is_up, attention
+
+    def setPenKey(self, pen_key):
+        """Changes the theme's pen the link is painted with
+
+        :param pen_key: key of the pen (see getPenKey)
+        :type pen_key: tuple
+        """
+        if pen_key != self.pen_key:
+            self.pen_key = pen_key
+            self.update()
+
+    def setLinkState(self, is_up=True):
+        """Sets up the link's state and modifies its style accordingly
+
+        :param is_up: new link's state
+        :type is_up: bool
+        """
+        # Setting up new link's state
+        scene = self.getScene()
+        if self.record is not None and scene is not None and isinstance(scene, SceneGUI):
+            scene.model.setLinkState(self.record.link_id, is_up)
+        elif self.record is not None:
+            self.record.is_up = is_up
+
+        # Modification of link's style
+        self.changeLineColor()
+
+        # The link layer draws the link with its new style
+        if self.record is not None and scene is not None and isinstance(scene, SceneGUI):
+            scene.updateLayerLinks([self])
+
+    def setLinkBlocked(self, is_blocked=False):
+        """Sets up if the link is blocked by the spanning tree protocol, drawing it dashed if so
+
+        :param is_blocked: new link's blocking state
+        :type is_blocked: bool
+        """
+        if is_blocked == self.is_blocked:
+            return
+
+        self.is_blocked = is_blocked
+        self.setLinkState(self.isLinkUp())
+
+    def updateEndPoint(self, x2, y2):
+        """Changes the position of one of the ends of the line
+
+        :param x2: new horizontal position of link's end
+        :type x2: float
+        :param y2: new vertical position of link's end
+        :type y2: float
+        """
+        line = self.line()
+        self.setLine(line.x1(), line.y1(), x2, y2)
+
+    def deleteSceneTags(self):
+        """Deletes all the scene tags related to this link"""
+        scene = self.getScene()
+        if scene is not None and isinstance(scene, SceneGUI):
+            tags = self.scene_tags
+            for tag in tags:
+                scene.removeItem(tags[tag])
+
+    def changeLineColor(self):
+        """
+        Changes the line color attending the link's state and if
+        the scene is focused on the item (colors of the current theme)
+        """
+        self.setPenKey(self.getPenKey(self.isLinkUp(), self.hasFocus()))
+
+    def paint(self, painter, option, widget=None):
+        """Paints the line with the theme's pen of the link (see SceneTheme), and its outline if selected
+
+        :param painter: painter of the scene's view
+        :type painter: QPainter
+        :param option: style options of the item
+        :type option: QStyleOptionGraphicsItem
+        :param widget: widget being painted on
+        :type widget: QWidget
+        """
+        painter.setPen(SceneTheme.getTheme().link_pens[self.pen_key])
+        painter.drawLine(self.line())
+
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(option.palette.windowText(), 0, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPath(self.shape())
+
+    # Event handlers
+
+    def focusInEvent(self, event):
+        """It is called when link gains focus from the scene
+
+        :param event: application's event
+        :type event: QFocusEvent
+        """
+        self.changeLineColor()
+
+    def focusOutEvent(self, event):
+        """It is called when link loses focus from the scene
+
+        :param event: application's event
+        :type event: QFocusEvent
+        """
+        self.changeLineColor()
+
+    def hoverEnterEvent(self, event):
+        """It is called when pointer enters the link's space
+
+        :param event: application's event
+        :type event: QGraphicsSceneHoverEvent
+        """
+        scene = self.scene()
+        is_up = self.isLinkUp() and scene.current_tool != "Delete"
+        self.setPenKey(self.getPenKey(is_up, True))
+
+    def hoverLeaveEvent(self, event):
+        """It is called when pointer leaves the link's space
+
+        :param event: application's event
+        :type event: QGraphicsSceneHoverEvent
+        """
+        self.changeLineColor()
+
+
+class LinkSegmentIndex:
+    """
+    Spatial index of the links' segments, used to find links by position while they are
+    drawn by the link layer (see LinkLayerGUI): segments are kept in NumPy arrays and their
+    rows are bucketed in a uniform grid, so queries only test the segments of the cells they
+    touch (and a moved segment only changes its own cells)
+    """
+    # Side of the grid's cells (in scene units)
+    CELL_SIZE = 128.0
+
+    # Queries whose cells hold more than 1/SCAN_RATIO of the segments test all of them
+    SCAN_RATIO = 8
+
+    def __init__(self):
+        self.count = 0
+        self.rows = {}
+        self.link_ids = np.zeros(0, dtype=np.int64)
+        self.segments = np.zeros((0, 4))
+        self.groups = np.zeros(0, dtype=np.int8)
+        self.lines = np.zeros(0, dtype=object)
+
+        # Grid: rows of the segments within each cell, and cells of each row
+        self.cells = {}
+        self.row_cells = {}
+
+    def clear(self):
+        """Deletes all the segments of the index"""
+        self.__init__()
+
+    def reserve(self, size):
+        """Grows the arrays of the index (doubling their size) to hold a number of segments
+
+        :param size: number of segments
+        :type size: int
+        """
+        capacity = len(self.link_ids)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity, 1024)
+        for name in ["link_ids", "segments", "groups", "lines"]:
+            array = getattr(self, name)
+            new_array = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            new_array[:self.count] = array[:self.count]
+            setattr(self, name, new_array)
+
+    # Grid functions
+
+    def getCellRange(self, left, top, right, bottom):
+        """Returns the columns and rows of the grid's cells covered by a rectangle
+
+        :returns first and last column, first and last row
+        :rtype tuple
+        """
+        size = self.CELL_SIZE
+        return (math.floor(left / size), math.floor(right / size),
+                math.floor(top / size), math.floor(bottom / size))
+
+    def getSegmentCells(self, x1, y1, x2, y2):
+        """Returns the grid's cells a segment goes through (column by column, only the rows it crosses)
+
+        :returns cells of the segment
+        :rtype list
+        """
+        if x1 > x2:
+            x1, y1, x2, y2 = x2, y2, x1, y1
+
+        size = self.CELL_SIZE
+        slope = (y2 - y1) / (x2 - x1) if x2 != x1 else 0.0
+        cells = []
+        for col in range(math.floor(x1 / size), math.floor(x2 / size) + 1):
+            # Vertical span of the part of the segment within the column
+            start_y = y1 + (max(x1, col * size) - x1) * slope
+            end_y = y1 + (min(x2, (col + 1) * size) - x1) * slope if x2 != x1 else y2
+            cells.extend((col, row) for row in range(math.floor(min(start_y, end_y) / size),
+                                                     math.floor(max(start_y, end_y) / size) + 1))
+
+        return cells
+
+    def bucketSegment(self, row, cells):
+        """Moves the segment of a row to some cells of the grid
+
+        :param row: row of the segment
+        :type row: int
+        :param cells: cells of the segment (None to take it out of the grid)
+        :type cells: list
+        """
+        for cell in self.row_cells.pop(row, ()):
+            rows = self.cells[cell]
+            rows.discard(row)
+            if not rows:
+                del self.cells[cell]
+
+        if cells:
+            self.row_cells[row] = cells
+            for cell in cells:
+                self.cells.setdefault(cell, set()).add(row)
+
+    def getCandidates(self, left, top, right, bottom):
+        """Returns the segments within the grid's cells covered by a rectangle
+
+        :returns sorted rows of the segments and the segments
+        :rtype tuple
+        """
+        first_col, last_col, first_row, last_row = self.getCellRange(left, top, right, bottom)
+        if (last_col - first_col + 1) * (last_row - first_row + 1) < len(self.cells):
+            cells = self.cells
+            buckets = [cells[(col, row)] for col in range(first_col, last_col + 1)
+                       for row in range(first_row, last_row + 1) if (col, row) in cells]
+
+            # Testing all the segments at once is cheaper than gathering a large part of them from the cells
+            if self.SCAN_RATIO * sum(map(len, buckets)) < self.count:
+                rows = np.unique(np.fromiter(itertools.chain.from_iterable(buckets), dtype=np.int64))
+                return rows, self.segments[rows]
+
+        return np.arange(self.count), self.segments[:self.count]
+
+    # Segment functions
+
+    def setSegment(self, link_id, line, group):
+        """Adds or updates the segment of a link
+
+        :param link_id: ID of the link
+        :type link_id: int
+        :param line: segment of the link
+        :type line: QLineF
+        :param group: style group of the link (see LinkGUI.getStyleGroup)
+        :type group: int
+        """
+        row = self.rows.get(link_id)
+        if row is None:
+            self.reserve(self.count + 1)
+            row = self.count
+            self.count += 1
+            self.rows[link_id] = row
+            self.link_ids[row] = link_id
+
+        segment = (line.x1(), line.y1(), line.x2(), line.y2())
+        if row not in self.row_cells or tuple(self.segments[row]) != segment:
+            self.bucketSegment(row, self.getSegmentCells(*segment))
+
+        self.segments[row] = segment
+        self.groups[row] = group
+        self.lines[row] = line
+
+    def removeSegment(self, link_id):
+        """Deletes the segment of a link (the last segment takes its place)
+
+        :param link_id: ID of the link
+        :type link_id: int
+        """
+        row = self.rows.pop(link_id, None)
+        if row is None:
+            return
+
+        self.bucketSegment(row, None)
+        last = self.count - 1
+        if row != last:
+            self.link_ids[row] = self.link_ids[last]
+            self.segments[row] = self.segments[last]
+            self.groups[row] = self.groups[last]
+            self.lines[row] = self.lines[last]
+            self.rows[int(self.link_ids[row])] = row
+            self.bucketSegment(row, self.row_cells[last])
+            self.bucketSegment(last, None)
+        self.lines[last] = None
+        self.count = last
+
+    def getOverlapMask(self, segments, rect):
+        """Returns which segments have their bounding box within a rectangle
+
+        :param segments: segments to be checked
+        :type segments: numpy.ndarray
+        :param rect: rectangle of the scene
+        :type rect: QRectF
+        :returns mask of the segments
+        :rtype numpy.ndarray
+        """
+        return ((np.minimum(segments[:, 0], segments[:, 2]) <= rect.right()) &
+                (np.maximum(segments[:, 0], segments[:, 2]) >= rect.left()) &
+                (np.minimum(segments[:, 1], segments[:, 3]) <= rect.bottom()) &
+                (np.maximum(segments[:, 1], segments[:, 3]) >= rect.top()))
+
+    def getBounds(self, group):
+        """Returns the rectangle that holds all the segments of a style group
+
+        :param group: style group
+        :type group: int
+        :returns bounding rectangle (empty if there are no segments)
+        :rtype QRectF
+        """
+        segments = self.segments[:self.count][self.groups[:self.count] == group]
+        if not len(segments):
+            return QRectF()
+
+        left = float(min(segments[:, 0].min(), segments[:, 2].min()))
+        top = float(min(segments[:, 1].min(), segments[:, 3].min()))
+        right = float(max(segments[:, 0].max(), segments[:, 2].max()))
+        bottom = float(max(segments[:, 1].max(), segments[:, 3].max()))
+        return QRectF(left, top, right - left, bottom - top)
+
+    def getLines(self, group, rect):
+        """Returns the segments of a style group that may cross a rectangle
+
+        :param group: style group
+        :type group: int
+        :param rect: rectangle of the scene
+        :type rect: QRectF
+        :returns segments
+        :rtype list
+        """
+        rows, segments = self.getCandidates(rect.left(), rect.top(), rect.right(), rect.bottom())
+        mask = (self.groups[rows] == group) & self.getOverlapMask(segments, rect)
+        return self.lines[rows[mask]].tolist()
 
-    def setLinkState(self, is_up=True):
-        """Sets up the link's state and modifies its style accordingly
+    def linkAt(self, x, y, radius):
+        """Returns the link whose segment is the closest one to a point
 
-        :param is_up: new link's state
-        :type is_up: bool
+        :param x: horizontal position of the point
+        :type x: float
+        :param y: vertical position of the point
+        :type y: float
+        :param radius: maximum distance from the point to the segment
+        :type radius: float
+        :returns ID of the link (None if no segment is close enough)
+        :rtype int
         """
-        # Setting up new link's state
-        self.is_up = is_up
+        rows, segments = self.getCandidates(x - radius, y - radius, x + radius, y + radius)
+        if not len(rows):
+            return None
 
-        # Modification of link's style
-        if is_up:
-            self.pen.setStyle(Qt.SolidLine)
-        else:
-            self.pen.setStyle(Qt.DashLine)
+        delta_x = segments[:, 2] - segments[:, 0]
+        delta_y = segments[:, 3] - segments[:, 1]
+        length = delta_x * delta_x + delta_y * delta_y
+        ratio = ((x - segments[:, 0]) * delta_x + (y - segments[:, 1]) * delta_y) / np.where(length > 0, length, 1.0)
+        ratio = np.clip(ratio, 0.0, 1.0)
+        distance = (segments[:, 0] + ratio * delta_x - x) ** 2 + (segments[:, 1] + ratio * delta_y - y) ** 2
 
-        self.changeLineColor()
+        closest = int(np.argmin(distance))
+        if distance[closest] > radius * radius:
+            return None
 
-    def updateEndPoint(self, x2, y2):
-        """Changes the position of one of the ends of the line
+        return int(self.link_ids[rows[closest]])
 
-        :param x2: new horizontal position of link's end
-        :type x2: float
-        :param y2: new vertical position of link's end
-        :type y2: float
+    def linksIn(self, rect):
+        """Returns the links whose segment crosses a rectangle
+
+        :param rect: rectangle of the scene
+        :type rect: QRectF
+        :returns IDs of the links
+        :rtype list
         """
-        line = self.line()
-        self.setLine(line.x1(), line.y1(), x2, y2)
+        rows, segments = self.getCandidates(rect.left(), rect.top(), rect.right(), rect.bottom())
+        mask = self.getOverlapMask(segments, rect)
+        rows, segments = rows[mask], segments[mask]
 
-    def deleteSceneTags(self):
-        """Deletes all the scene tags related to this link"""
-        scene = self.scene()
-        if scene is not None and isinstance(scene, SceneGUI):
-            tags = self.scene_tags
-            for tag in tags:
-                scene.removeItem(tags[tag])
+        # Segments (with their box within the rectangle) cross it unless all its corners are at the same side
+        delta_x = segments[:, 2] - segments[:, 0]
+        delta_y = segments[:, 3] - segments[:, 1]
+        sides = np.array([delta_x * (corner_y - segments[:, 1]) - delta_y * (corner_x - segments[:, 0])
+                          for corner_x, corner_y in [(rect.left(), rect.top()), (rect.right(), rect.top()),
+                                                     (rect.left(), rect.bottom()), (rect.right(), rect.bottom())]])
+        crossing = ~(np.all(sides > 0, axis=0) | np.all(sides < 0, axis=0))
 
-    def changeLineColor(self):
+        return self.link_ids[rows][crossing].tolist()
+
+
+class LinkLayerGUI(QGraphicsItem):
+    """
+    Draws at once all the links of a style group (see LinkGUI.getStyleGroup), reading their
+    segments from the scene's link index: links are not shown as items, except the hovered
+    and selected ones (see SceneGUI.showSceneLink)
+    """
+    def __init__(self, group):
         """
-        Changes the line color attending the link's state and if
-        the scene is focused on the item
+        :param group: style group of the links drawn by the layer
+        :type group: int
         """
-        if self.is_up and self.hasFocus():
-            self.pen.setColor(Qt.darkBlue)
-        elif self.is_up and not self.hasFocus() and APP_THEME == "light":
-            self.pen.setColor(Qt.gray)
-        elif self.is_up and not self.hasFocus() and APP_THEME == "dark":
-            self.pen.setColor(Qt.darkGray)
-        elif not self.is_up and self.hasFocus():
-            self.pen.setColor(Qt.darkRed)
-        elif not self.is_up and not self.hasFocus():
-            self.pen.setColor(Qt.red)
+        super(LinkLayerGUI, self).__init__()
 
-        self.setPen(self.pen)
+        # Initial attributes
+        self.group = group
+        self.rect = QRectF()
 
-    # Event handlers
+        # Layers are below links and nodes, and they are not hit (links are found through the index)
+        self.setZValue(-1)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
 
-    def focusInEvent(self, event):
-        """It is called when link gains focus from the scene
+    def setBounds(self, rect):
+        """Changes the rectangle that holds the layer's links
 
-        :param event: application's event
-        :type event: QFocusEvent
+        :param rect: bounding rectangle of the links
+        :type rect: QRectF
         """
-        self.changeLineColor()
+        if rect != self.rect:
+            self.prepareGeometryChange()
+            self.rect = rect
+        self.update()
 
-    def focusOutEvent(self, event):
-        """It is called when link loses focus from the scene
+    def boundingRect(self):
+        """Returns the layer's bounding rectangle, with room for the pen's width (empty if it has no links)
 
-        :param event: application's event
-        :type event: QFocusEvent
+        :returns bounding rectangle
+        :rtype QRectF
         """
-        self.changeLineColor()
+        if self.rect.isNull():
+            return QRectF()
 
-    def hoverEnterEvent(self, event):
-        """It is called when pointer enters the link's space
+        return self.rect.adjusted(-2.0, -2.0, 2.0, 2.0)
 
-        :param event: application's event
-        :type event: QGraphicsSceneHoverEvent
-        """
-        scene = self.scene()
-        if self.is_up and scene.current_tool != "Delete":
-            self.pen.setColor(Qt.darkBlue)
-        else:
-            self.pen.setColor(Qt.darkRed)
+    def shape(self):
+        """Returns an empty shape, so the layer is not hit by the mouse nor by the selection
 
-        self.setPen(self.pen)
+        :returns empty shape
+        :rtype QPainterPath
+        """
+        return QPainterPath()
 
-    def hoverLeaveEvent(self, event):
-        """It is called when pointer leaves the link's space
+    def paint(self, painter, option, widget=None):
+        """Draws the layer's links that cross the exposed rectangle, with the pens of the current theme
 
-        :param event: application's event
-        :type event: QGraphicsSceneHoverEvent
+        :param painter: painter of the scene's view
+        :type painter: QPainter
+        :param option: style options of the item
+        :type option: QStyleOptionGraphicsItem
+        :param widget: widget painted on
+        :type widget: QWidget
         """
-        self.changeLineColor()
+        scene = self.scene()
+        lines = scene.link_index.getLines(self.group, option.exposedRect)
+        if not lines:
+            return
+
+        pen, far_pen = SceneTheme.getTheme().layer_pens[self.group]
+        painter.setPen(far_pen if scene.batch_links else pen)
+        painter.drawLines(lines)
 
 
 class SceneGUI(QGraphicsScene):
     """It displays the topology network created by the user"""
+    # Minimum number of links updated at once with NumPy
+    BULK_LINKS = 200
+
+    # Maximum number of items whose pending tags are built on every event loop pass
+    TAGS_CHUNK = 2000
+
+    # Distance from the pointer to a link drawn by the link layer to hit it, in pixels
+    LINK_HIT_RADIUS = 4.0
+
     def __init__(self, net_ctrl=None):
         """
         :param net_ctrl: reference to MiniGUI main class
@@ -1364,23 +5937,67 @@ class SceneGUI(QGraphicsScene):
         self.current_tool = None
         self.scene_modified = False
 
-        # Node & Link dictionaries
+        # Topology model shown by the scene and its graph engine
+        self.model = TopologyModel()
+        self.graph = TopologyGraph(self.model)
+
+        # Undo/redo history, an entry per user action (closed when the event loop is back)
+        self.undo_stack = UndoStack(self.model)
+        self.undo_timer = QTimer()
+        self.undo_timer.setSingleShot(True)
+        self.undo_timer.setInterval(0)
+        self.undo_timer.timeout.connect(self.closeUndoEntry)
+        self.model.addListener(self.startUndoTimer)
+
+        # Node & Link items, by model ID
         self.scene_nodes = {}
         self.scene_links = {}
 
-        # Item counting initialization
-        self.item_count = {"Host": 0, "Switch": 0, "Router": 0, "Link": 0}
-        self.item_letter = {"Host": "h", "Switch": "s", "Router": "r", "Link": "l"}
+        # Links waiting for their geometry to be updated, flushed once per frame
+        self.dirty_links = set()
+        self.links_timer = QTimer()
+        self.links_timer.setSingleShot(True)
+        self.links_timer.setInterval(16)
+        self.links_timer.timeout.connect(self.flushSceneLinks)
+
+        # Items added in bulk, whose tags are built afterwards in chunks
+        self.bulk_insert = False
+        self.pending_tags = []
+        self.tags_timer = QTimer()
+        self.tags_timer.setSingleShot(True)
+        self.tags_timer.setInterval(0)
+        self.tags_timer.timeout.connect(self.buildPendingTags)
+
+        # Progressive loading: interface per link name of the loaded nodes and links waiting for their nodes
+        self.load_node_links = {}
+        self.load_waiting_links = []
+
+        # Level of detail (see setDetailLevel): details are tags and node icons, links may be batched
+        self.show_details = True
+        self.batch_links = False
+
+        # Link layer (see LinkLayerGUI): always shown if chosen by the user, otherwise only when batching links.
+        # Links are found through the index and only the hovered and selected ones are shown as items
+        self.link_layer = False
+        self.link_index = LinkSegmentIndex()
+        self.link_layers = []
+        self.shown_links = set()
+        self.hover_link = None
+        self.layers_timer = QTimer()
+        self.layers_timer.setSingleShot(True)
+        self.layers_timer.setInterval(0)
+        self.layers_timer.timeout.connect(self.updateLinkLayers)
+        self.release_timer = QTimer()
+        self.release_timer.setSingleShot(True)
+        self.release_timer.setInterval(0)
+        self.release_timer.timeout.connect(self.releaseSceneLinks)
+        self.selectionChanged.connect(self.release_timer.start)
+        self.addLinkLayers()
 
         # Event handling initialization
         self.new_link = None
         self.link_orig_node = None
 
-        # IP address related variables
-        self.default_ip_last = 1
-        self.default_ip_base = "10.0.0."
-        self.default_ip = self.default_ip_base + str(self.default_ip_last)
-
     # Scene-related functions
 
     @staticmethod
@@ -1398,8 +6015,8 @@ class SceneGUI(QGraphicsScene):
         new_pos_y = node.boundingRect().bottomLeft().y()
         name_tag.setPos(new_pos_x, new_pos_y)
 
-    def addSceneNode(self, x, y, node_type, name=None, properties=None):
-        """Adds a new node to the scene
+    def addSceneNode(self, x, y, node_type):
+        """Adds a new node to the model and to the scene
 
         :param x: node's horizontal position in scene
         :type x: float
@@ -1407,49 +6024,119 @@ class SceneGUI(QGraphicsScene):
         :type y: float
         :param node_type: node's type
         :type node_type: str
-        :param name: node's name (optional)
-        :type name: str
-        :param properties: node's properties
-        :type properties: dict
         :returns node object
         :rtype NodeGUI
         """
-        # Property checking (in case the node is loaded up from previous project)
-        if properties is None and node_type != "Switch":
-            node_properties = {"IP": self.default_ip, "PrefixLen": 8}
-            self.default_ip_last = self.default_ip_last + 1
-            self.default_ip = self.default_ip_base + str(self.default_ip_last)
-        else:
-            node_properties = properties
+        record = self.model.addNode(node_type, x, y)
+        node = self.addSceneNodeItem(record, new_node=True)
+        node.setFocus()
 
-        # Name checking
-        if name is not None:
-            node_new = False
-            node_name = name
-        else:
-            node_new = True
-            while True:
-                node_name = self.item_letter[node_type] + str(self.item_count[node_type])
-                if self.isFeasibleName(node_name):
-                    break
-                else:
-                    self.item_count[node_type] = self.item_count[node_type] + 1
+        # New nodes are centered where the user has clicked
+        self.model.moveNode(record.node_id, node.x(), node.y())
+
+        return node
+
+    def addSceneNodeItem(self, record, new_node=False, build_tags=True):
+        """Creates the scene item of a node of the model
 
+        :param record: node of the topology model
+        :type record: NodeRecord
+        :param new_node: determines if the node is created in this session or not
+        :type new_node: bool
+        :param build_tags: name tag is created now (if not, it is left pending)
+        :type build_tags: bool
+        :returns node object
+        :rtype NodeGUI
+        """
         # Creation of node and saving into scene's node list
-        node = NodeGUI(x, y, node_type, node_name, node_properties, node_new, self.net_controller)
-        self.scene_nodes[node_name] = node
+        node = NodeGUI(record, new_node, self.net_controller)
+        self.scene_nodes[record.node_id] = node
 
-        # Addition of node to scene, gaining focus and modifying the scene
-        self.addSceneNodeNameTag(node, node_name)
+        # Addition of node to scene and modifying the scene
+        if build_tags:
+            self.addSceneNodeNameTag(node, record.name)
+            node.scene_tags["name"].setVisible(self.show_details)
+        else:
+            node.tags_pending = True
+            self.pending_tags.append(node)
         self.addItem(node)
-        node.setFocus()
-
-        # Modification of scene's state variables
+        if not self.show_details:
+            node.updateIcon()
         self.scene_modified = True
-        self.item_count[node_type] = self.item_count[node_type] + 1
 
         return node
 
+    def addSceneRecords(self, new_nodes, new_links):
+        """
+        Creates the scene items of many nodes and links of the model at once (bulk
+        insertion): items are built from the model, without hit testing, and their
+        tags are left pending, to be built afterwards in chunks (see buildPendingTags)
+
+        :param new_nodes: nodes of the topology model
+        :type new_nodes: list
+        :param new_links: links of the topology model
+        :type new_links: list
+        """
+        # Scene index, repaints and link updates on node moves are suspended while the items are added
+        index_method = self.itemIndexMethod()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        views = [view for view in self.views() if view.updatesEnabled()]
+        for view in views:
+            view.setUpdatesEnabled(False)
+        self.bulk_insert = True
+
+        for record in new_nodes:
+            self.addSceneNodeItem(record, build_tags=False)
+        for record in new_links:
+            self.addSceneLinkItem(record, build_tags=False)
+
+        self.bulk_insert = False
+        self.setItemIndexMethod(index_method)
+        for view in views:
+            view.setUpdatesEnabled(True)
+
+        if self.pending_tags:
+            self.tags_timer.start()
+
+    def buildPendingTags(self):
+        """Creates the tags of the next chunk of items added in bulk, and places them"""
+        chunk = self.pending_tags[:self.TAGS_CHUNK]
+        del self.pending_tags[:self.TAGS_CHUNK]
+
+        # Items removed from the scene or already built are skipped
+        link_ids = []
+        for item in chunk:
+            if not item.tags_pending or item.scene() is not self:
+                continue
+            item.tags_pending = False
+            if isinstance(item, NodeGUI):
+                self.addSceneNodeNameTag(item, item.record.name)
+                item.scene_tags["name"].setVisible(self.show_details)
+            else:
+                orig_node = self.scene_nodes[item.record.node_ids[0]]
+                dest_node = self.scene_nodes[item.record.node_ids[1]]
+                self.addSceneLinkEthTags(item, orig_node, orig_node.record.link_intfs[item.record.link_id],
+                                         dest_node, dest_node.record.link_intfs[item.record.link_id], False)
+                link_ids.append(item.record.link_id)
+
+        # Interface tags of the chunk are placed at once
+        self.updateSceneLinksGeometry(link_ids)
+
+        if self.pending_tags:
+            self.tags_timer.start()
+
+    def buildAllPendingTags(self):
+        """Creates the tags of all the items added in bulk right now"""
+        self.tags_timer.stop()
+        while self.pending_tags:
+            self.buildPendingTags()
+        self.tags_timer.stop()
+
+    def clearPendingTags(self):
+        """Forgets the tags left pending (as when the scene is cleared)"""
+        self.tags_timer.stop()
+        self.pending_tags = []
+
     def addSceneLink(self, x, y):
         """Initiates the process of creation of a new link in the scene
 
@@ -1473,8 +6160,8 @@ class SceneGUI(QGraphicsScene):
         :rtype bool
         """
         if node.node_type != "Switch":
-            node_eths = node.properties["eth_intfs"]
-            if eth in node_eths and node_eths[eth] != "":
+            node_eths = node.record.intfs
+            if eth in node_eths and node_eths[eth].address != "":
                 return True
 
         return False
@@ -1491,8 +6178,7 @@ class SceneGUI(QGraphicsScene):
         :type eth_tag: EthTagGUI
         """
         # Getting IP address from interface
-        node_ip_dict = node.properties["eth_intfs"]
-        tag_text = node_ip_dict[eth].split("/")[0]
+        tag_text = node.record.intfs[eth].address.split("/")[0]
 
         # Creating IP tag and association with node
         ip_tag = IpTagGUI(tag_text, eth_tag)
@@ -1503,9 +6189,11 @@ class SceneGUI(QGraphicsScene):
         ip_tag_y_pos = eth_tag.boundingRect().bottomLeft().y() * 0.75
         ip_tag.setPos(ip_tag_x_pos, ip_tag_y_pos)
 
-    def addSceneLinkEthTags(self, orig_node, orig_eth, dest_node, dest_eth):
+    def addSceneLinkEthTags(self, link, orig_node, orig_eth, dest_node, dest_eth, update_tags=True):
         """Creates and adds the Ethernet interface (& IP) tags to scene
 
+        :param link: reference to link object
+        :type link: LinkGUI
         :param orig_node: reference to first node object
         :type orig_node: NodeGUI
         :param orig_eth: first node interface name
@@ -1514,16 +6202,20 @@ class SceneGUI(QGraphicsScene):
         :type dest_node: NodeGUI
         :param dest_eth: second node interface name
         :type dest_eth: str
+        :param update_tags: tags are placed now (if not, it is up to the caller)
+        :type update_tags: bool
         """
         # Creating the interface tags
         orig_tag = EthTagGUI(orig_eth, None)
         dest_tag = EthTagGUI(dest_eth, None)
 
         # Storing pointer in link and scene
-        self.new_link.scene_tags[orig_node.node_name] = orig_tag
-        self.new_link.scene_tags[dest_node.node_name] = dest_tag
+        link.scene_tags[orig_node.record.node_id] = orig_tag
+        link.scene_tags[dest_node.record.node_id] = dest_tag
         orig_node.scene_tags["eth"][orig_eth] = orig_tag
         dest_node.scene_tags["eth"][dest_eth] = dest_tag
+        orig_tag.setVisible(self.show_details)
+        dest_tag.setVisible(self.show_details)
         self.addItem(orig_tag)
         self.addItem(dest_tag)
 
@@ -1534,292 +6226,770 @@ class SceneGUI(QGraphicsScene):
         if self.checkNodeIpTag(dest_node, dest_eth):
             self.addSceneLinkIpTags(dest_node, dest_eth, dest_tag)
 
-        # Update of newest tags' position within the scene
-        self.updateSceneLinkTags(self.new_link, orig_node, dest_node)
+        # Update of newest tags' position within the scene
+        if update_tags:
+            self.updateSceneLinkTags(link, orig_node, dest_node)
+
+    def finishSceneLink(self):
+        """Finishes the creation process of a link between two nodes"""
+        # Retrieving information from link and selected nodes
+        line = self.new_link.line()
+        orig_node = self.itemAt(line.p1(), QTransform())
+        dest_node = self.itemAt(line.p2(), QTransform())
+
+        # Creation of the link in the model and association with the scene item
+        record = self.model.addLink(orig_node.record.node_id, dest_node.record.node_id)
+        self.new_link.record = record
+        self.new_link.link_scene = self
+        self.scene_links[record.link_id] = self.new_link
+
+        # Adding new interface tags to scene
+        orig_eth = orig_node.record.link_intfs[record.link_id]
+        dest_eth = dest_node.record.link_intfs[record.link_id]
+        self.addSceneLinkEthTags(self.new_link, orig_node, orig_eth, dest_node, dest_eth)
+
+        # Links drawn by the link layer are shown as items while they are selected
+        self.updateLayerLinks([self.new_link])
+        if self.isLinkLayerShown():
+            self.shown_links.add(self.new_link)
+
+        # Resetting temporary variables to initial state
+        self.new_link = None
+        self.link_orig_node = None
+        self.scene_modified = True
+
+    def addSceneLinkItem(self, record, update_tags=True, build_tags=True):
+        """Creates the scene item of a link of the model between two existing node items
+
+        :param record: link of the topology model
+        :type record: LinkRecord
+        :param update_tags: tags are placed now (if not, it is up to the caller)
+        :type update_tags: bool
+        :param build_tags: interface tags are created now (if not, they are left pending)
+        :type build_tags: bool
+        :returns link object
+        :rtype LinkGUI
+        """
+        orig_node = self.scene_nodes[record.node_ids[0]]
+        dest_node = self.scene_nodes[record.node_ids[1]]
+        orig_coor = orig_node.scenePos() + orig_node.center_offset
+        dest_coor = dest_node.scenePos() + dest_node.center_offset
+
+        # Creation of link and saving into scene's link list
+        link = LinkGUI(orig_coor.x(), orig_coor.y(), dest_coor.x(), dest_coor.y(),
+                       record=record, net_ctrl=self.net_controller)
+        link.setLinkState(record.is_up)
+        link.link_scene = self
+        self.scene_links[record.link_id] = link
+        self.updateLayerLinks([link])
+
+        # Links drawn by the link layer are not added as items
+        if not self.link_layer:
+            link.setVisible(not self.batch_links)
+            self.addItem(link)
+
+        # Adding interface tags to scene
+        if build_tags:
+            self.addSceneLinkEthTags(link, orig_node, orig_node.record.link_intfs[record.link_id],
+                                     dest_node, dest_node.record.link_intfs[record.link_id], update_tags)
+        else:
+            link.tags_pending = True
+            self.pending_tags.append(link)
+
+        return link
+
+    @staticmethod
+    def updateSceneLinkTags(link, orig_node, dest_node):
+        """Moves and allocates the interface and IP scene tags correctly
+
+        :param link: reference to the moved link
+        :type link: LinkGUI
+        :param orig_node: reference to first node object
+        :type orig_node: NodeGUI
+        :param dest_node: reference to second node object
+        :type dest_node: NodeGUI
+        """
+        # New positions of nodes (and line)
+        line = link.line()
+        orig_pos_x = line.x1()
+        orig_pos_y = line.y1()
+        dest_pos_x = line.x2()
+        dest_pos_y = line.y2()
+
+        # Calculating absolute horizontal and vertical distance
+        long_x = abs(orig_pos_x - dest_pos_x)
+        long_y = abs(orig_pos_y - dest_pos_y)
+
+        # Getting tags to update their position
+        link_tags = link.scene_tags
+        link_orig_tag = link_tags[orig_node.record.node_id]
+        link_dest_tag = link_tags[dest_node.record.node_id]
+
+        # Horizontal and vertical axis offset correction (half of the cached tags' size)
+        orig_tag_width, orig_tag_height = link_orig_tag.getTagSize()
+        dest_tag_width, dest_tag_height = link_dest_tag.getTagSize()
+        orig_tag_offset_x = orig_tag_width / 2
+        dest_tag_offset_x = dest_tag_width / 2
+        orig_tag_offset_y = orig_tag_height / 2
+        dest_tag_offset_y = dest_tag_height / 2
+
+        # If node's interface has an IP tag associated, vertical axis must be corrected to with an offset
+        line_angle = math.atan2(long_x, long_y) / (math.pi / 2)
+        if link_orig_tag.childItems():
+            ip_orig_tag_offset = orig_tag_offset_y
+        else:
+            ip_orig_tag_offset = orig_tag_offset_y * line_angle
+
+        if link_dest_tag.childItems():
+            ip_dest_tag_offset = dest_tag_offset_y
+        else:
+            ip_dest_tag_offset = dest_tag_offset_y * line_angle
+
+        # Tag's location update: a quarter of the line away from their node
+        link_orig_tag.setPos(orig_pos_x - (orig_pos_x - dest_pos_x) / 4 - orig_tag_offset_x,
+                             orig_pos_y - (orig_pos_y - dest_pos_y) / 4 - orig_tag_offset_y - ip_orig_tag_offset)
+        link_dest_tag.setPos(dest_pos_x + (orig_pos_x - dest_pos_x) / 4 - dest_tag_offset_x,
+                             dest_pos_y + (orig_pos_y - dest_pos_y) / 4 - dest_tag_offset_y - ip_dest_tag_offset)
+
+    @staticmethod
+    def computeLinkTagPositions(lines, tag_sizes, ip_tags):
+        """
+        Computes the position of the interface tags of many links at once,
+        following the same rules as updateSceneLinkTags
+
+        :param lines: ends of the links, one row (x1, y1, x2, y2) per link
+        :type lines: numpy.ndarray
+        :param tag_sizes: size of both interface tags, one row (width 1, height 1, width 2, height 2) per link
+        :type tag_sizes: numpy.ndarray
+        :param ip_tags: if both interface tags have an IP tag, one row (tag 1, tag 2) per link
+        :type ip_tags: numpy.ndarray
+        :returns position of both interface tags, one row (x1, y1, x2, y2) per link
+        :rtype numpy.ndarray
+        """
+        delta_x = lines[:, 0] - lines[:, 2]
+        delta_y = lines[:, 1] - lines[:, 3]
+        line_angle = np.arctan2(np.abs(delta_x), np.abs(delta_y)) / (np.pi / 2)
+
+        # Offsets: half of the tags' size and, vertically, the IP tag (if any)
+        offsets_x = tag_sizes[:, 0::2] / 2
+        offsets_y = tag_sizes[:, 1::2] / 2
+        ip_offsets = np.where(ip_tags, offsets_y, offsets_y * line_angle[:, np.newaxis])
+
+        positions = np.empty_like(lines)
+        positions[:, 0] = lines[:, 0] - delta_x / 4 - offsets_x[:, 0]
+        positions[:, 1] = lines[:, 1] - delta_y / 4 - offsets_y[:, 0] - ip_offsets[:, 0]
+        positions[:, 2] = lines[:, 2] + delta_x / 4 - offsets_x[:, 1]
+        positions[:, 3] = lines[:, 3] + delta_y / 4 - offsets_y[:, 1] - ip_offsets[:, 1]
+
+        return positions
+
+    def updateSceneLinksGeometry(self, link_ids):
+        """
+        Updates the position of many links and their interface tags at once: geometry is
+        computed with NumPy and applied in one pass, with the scene index suspended
+
+        :param link_ids: IDs of the links to be updated
+        :type link_ids: iterable
+        """
+        links = [self.scene_links[link_id] for link_id in link_ids if link_id in self.scene_links]
+        if not links:
+            return
+
+        # Gathering of link ends, tag sizes and IP tags (node centers are computed once per node)
+        centers = {}
+        ends = []
+        sizes = []
+        ip_tags = []
+        tags = []
+        for link in links:
+            orig_id, dest_id = link.record.node_ids
+            for node_id in (orig_id, dest_id):
+                if node_id not in centers:
+                    node = self.scene_nodes[node_id]
+                    centers[node_id] = (node.record.x + node.center_offset.x(), node.record.y + node.center_offset.y())
+            ends.append(centers[orig_id] + centers[dest_id])
+
+            # Links whose tags are still pending only update their line
+            if link.tags_pending:
+                sizes.append((0.0, 0.0, 0.0, 0.0))
+                ip_tags.append((False, False))
+                tags.append(None)
+                continue
+            orig_tag = link.scene_tags[orig_id]
+            dest_tag = link.scene_tags[dest_id]
+            sizes.append(orig_tag.getTagSize() + dest_tag.getTagSize())
+            ip_tags.append((bool(orig_tag.childItems()), bool(dest_tag.childItems())))
+            tags.append((orig_tag, dest_tag))
+
+        lines = np.array(ends, dtype=float)
+        positions = self.computeLinkTagPositions(lines, np.array(sizes, dtype=float), np.array(ip_tags, dtype=bool))
+
+        # Geometry is applied with the scene index suspended, rebuilt just once afterwards
+        index_method = self.itemIndexMethod()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        for link, link_tags, line, position in zip(links, tags, lines.tolist(), positions.tolist()):
+            link.setLine(line[0], line[1], line[2], line[3])
+            if link_tags is not None:
+                link_tags[0].setPos(position[0], position[1])
+                link_tags[1].setPos(position[2], position[3])
+        self.setItemIndexMethod(index_method)
+        self.updateLayerLinks(links)
+
+    def updateSceneLinks(self, node):
+        """
+        Marks the links of a node to be updated when it moves: their geometry
+        is recomputed once per frame, whatever the number of moves
+
+        :param node: reference to node object
+        :type node: NodeGUI
+        """
+        # Updating scene variable
+        self.scene_modified = True
+
+        # If there is no link related to the node, functions returns
+        if not node.record.link_intfs:
+            return
+
+        self.dirty_links.update(node.record.link_intfs)
+        if not self.links_timer.isActive():
+            self.links_timer.start()
+
+    def flushSceneLinks(self):
+        """Updates the position of the links (and their tags) marked since the last frame"""
+        self.links_timer.stop()
+        dirty_links = self.dirty_links
+        self.dirty_links = set()
+
+        # Many links are updated at once with NumPy
+        if len(dirty_links) >= self.BULK_LINKS:
+            self.updateSceneLinksGeometry(dirty_links)
+            return
+
+        links = []
+        for link_id in dirty_links:
+            link = self.scene_links.get(link_id)
+            if link is None:
+                continue
+            orig_node = self.scene_nodes[link.record.node_ids[0]]
+            dest_node = self.scene_nodes[link.record.node_ids[1]]
+            orig_coor = orig_node.scenePos() + orig_node.center_offset
+            dest_coor = dest_node.scenePos() + dest_node.center_offset
+            link.setLine(orig_coor.x(), orig_coor.y(), dest_coor.x(), dest_coor.y())
+            if not link.tags_pending:
+                self.updateSceneLinkTags(link, orig_node, dest_node)
+            links.append(link)
+        self.updateLayerLinks(links)
+
+    def setNodePositions(self, node_ids, positions):
+        """Moves many nodes at once (as when arranging the scene), with the scene index suspended
+
+        :param node_ids: IDs of the nodes to be moved
+        :type node_ids: list
+        :param positions: new node positions, one row (x, y) per node
+        :type positions: numpy.ndarray
+        """
+        index_method = self.itemIndexMethod()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        for node_id, (x, y) in zip(node_ids, positions.tolist()):
+            node = self.scene_nodes.get(node_id)
+            if node is not None:
+                node.setPos(x, y)
+
+        # Links are updated in the same frame, before the scene index is rebuilt
+        self.flushSceneLinks()
+        self.setItemIndexMethod(index_method)
+
+    def removeSceneItem(self, item):
+        """Deletes a node/link from the scene and all links related to it
+
+        :param item: item to be deleted
+        :type item: QGraphicsItem
+        """
+        # If item to delete is a node, its links are deleted first
+        if isinstance(item, NodeGUI):
+            for link_id in list(item.record.link_intfs):
+                self.removeSceneLink(link_id)
+            self.model.removeNode(item.record.node_id)
+            self.scene_nodes.pop(item.record.node_id)
+            self.removeItem(item)
+
+        # If item to delete is a link, only its ends are updated
+        if isinstance(item, LinkGUI) and item.record is not None:
+            self.removeSceneLink(item.record.link_id)
+
+        self.scene_modified = True
+
+    def removeSceneItems(self, items):
+        """Deletes a group of nodes/links from the scene, along with the links related to the nodes
+
+        :param items: items to be deleted
+        :type items: list
+        """
+        # Links go first, as some of them may be deleted along with their nodes
+        links = [item for item in items if isinstance(item, LinkGUI) and item.record is not None]
+        nodes = [item for item in items if isinstance(item, NodeGUI)]
+        for link in links:
+            if link.record.link_id in self.scene_links:
+                self.removeSceneLink(link.record.link_id)
+        for node in nodes:
+            self.removeSceneItem(node)
+
+        self.scene_modified = True
+
+    def removeSceneLink(self, link_id):
+        """Deletes a link, its scene tags and its interfaces
+
+        :param link_id: ID of the link to be deleted
+        :type link_id: int
+        """
+        record = self.model.links[link_id]
+        intf_names = [self.model.nodes[node_id].link_intfs[link_id] for node_id in record.node_ids]
+        self.removeSceneLinkItem(link_id, intf_names)
+        self.model.removeLink(link_id)
+
+    def removeSceneLinkItem(self, link_id, intf_names):
+        """Deletes the scene item of a link and its tags (the model is not changed)
+
+        :param link_id: ID of the link
+        :type link_id: int
+        :param intf_names: names of the link's interfaces, in the order of its nodes
+        :type intf_names: list
+        """
+        link = self.scene_links.pop(link_id)
+        self.dirty_links.discard(link_id)
+        for node_id, intf_name in zip(link.record.node_ids, intf_names):
+            self.scene_nodes[node_id].removeIntfTags(intf_name)
+
+        link.deleteSceneTags()
+        if link.scene() is self:
+            self.removeItem(link)
+        self.shown_links.discard(link)
+        if self.hover_link is link:
+            self.hover_link = None
+        self.link_index.removeSegment(link_id)
+        self.layers_timer.start()
+
+    def loadScene(self, data):
+        """Loads the network topology from external file
+
+        :param data: structured network topology data
+        :type data: dict
+        """
+        if "nodes" not in data:
+            return
+
+        # Addition of nodes and links to the model
+        try:
+            new_nodes, new_links = self.model.loadData(data)
+        except (KeyError, TypeError, ValueError):
+            dialog = QMessageBox()
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Mininet topology file corrupted</b>")
+            dialog.setInformativeText("Project nodes or links data is corrupted."
+                                      "Please, verify JSON format is correct.")
+            dialog.exec()
+            return
+
+        # Addition of their items to the scene
+        self.addSceneRecords(new_nodes, new_links)
+        self.scene_modified = False
+
+    def startSceneLoading(self):
+        """Prepares the scene to load a project progressively (see loadSceneItems)"""
+        self.load_node_links = {}
+        self.load_waiting_links = []
+
+    def loadSceneItems(self, items):
+        """
+        Adds a batch of elements of a project file to the model and to the scene.
+        Links whose nodes are not loaded yet wait for them
+
+        :param items: project elements, as (section, data) pairs (see ProjectReader)
+        :type items: list
+        :raises KeyError: if the project data is corrupted
+        :raises TypeError: if the project data is corrupted
+        :raises ValueError: if the project's spanning tree protocol is unknown
+        """
+        model = self.model
+        new_nodes = []
+        new_links = []
+        for section, data in items:
+            if section == "node":
+                new_nodes.append(model.loadNodeData(data, self.load_node_links))
+            elif section == "link":
+                self.load_waiting_links.append(data)
+            elif section == "settings" and "STP" in data:
+                model.setStpProtocol(data["STP"])
+
+        # Links are added, in the file's order, as soon as both of their nodes are
+        ready = 0
+        for data in self.load_waiting_links:
+            if not all(node_name in model.node_ids for node_name in data["nodes"]):
+                break
+            new_links.append(model.loadLinkData(data, self.load_node_links))
+            ready = ready + 1
+        del self.load_waiting_links[:ready]
+
+        self.addSceneRecords(new_nodes, new_links)
+
+    def finishSceneLoading(self):
+        """
+        Ends the progressive loading of a project
+
+        :raises KeyError: if some link is between nodes not in the project
+        """
+        waiting_links = self.load_waiting_links
+        self.load_node_links = {}
+        self.load_waiting_links = []
+        self.scene_modified = False
+
+        if waiting_links:
+            raise KeyError(waiting_links[0]["nodes"])
+
+    def loadSceneBinary(self, file_path):
+        """Loads the network topology from a binary project file
+
+        :param file_path: path of the project file
+        :type file_path: str
+        :returns if the project was loaded
+        :rtype bool
+        """
+        try:
+            new_nodes, new_links = BinaryProjectFile.readModel(self.model, file_path)
+        except OSError as error:
+            self.model.clear()
+            dialog = QMessageBox()
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Project not opened</b>")
+            dialog.setInformativeText("The file " + file_path + " could not be read: " + str(error))
+            dialog.exec()
+            return False
+        except (KeyError, IndexError, TypeError, ValueError, struct.error):
+            self.model.clear()
+            dialog = QMessageBox()
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>MiniGUI binary project corrupted</b>")
+            dialog.setInformativeText("Project nodes or links data is corrupted."
+                                      "Please, verify the file is a MiniGUI binary project.")
+            dialog.exec()
+            return False
+
+        self.addSceneRecords(new_nodes, new_links)
+        self.scene_modified = False
+
+        return True
+
+    def saveSceneBinary(self):
+        """Saves the current network topology in the binary project format
+
+        :returns: sections of the binary project file
+        :rtype: list
+        """
+        sections = BinaryProjectFile.encodeModel(self.model)
+        self.scene_modified = False
+
+        return sections
 
-    def finishSceneLink(self, name=None):
-        """Finishes the creation process of a link between two nodes
+    def saveScene(self):
+        """Saves the current network topology of the project
 
-        :param name: link's name (optional)
-        :type name: str
+        :returns: structured network topology data
+        :rtype: dict
         """
-        # Retrieving information from link and selected nodes
-        line = self.new_link.line()
-        orig_node = self.itemAt(line.p1(), QTransform())
-        dest_node = self.itemAt(line.p2(), QTransform())
+        file_dictionary = self.model.saveData()
+        self.scene_modified = False
 
-        # Link's naming (if needed)
-        if name is None:
-            while True:
-                new_name = self.item_letter["Link"] + str(self.item_count["Link"])
-                if self.isFeasibleName(new_name):
-                    break
-                else:
-                    self.item_count["Link"] = self.item_count["Link"] + 1
-        else:
-            new_name = name
+        return file_dictionary
 
-        # Updating of link information in both elements and link
-        self.new_link.link_name = new_name
-        self.new_link.nodes = [orig_node.node_name, dest_node.node_name]
-        self.scene_links[new_name] = self.new_link
+    def readdressScene(self):
+        """Assigns new addresses to the whole scene and refreshes its IP tags
 
-        # Adding new link to node and new interface tags to scene
-        orig_eth = orig_node.addNewLink(new_name)
-        dest_eth = dest_node.addNewLink(new_name)
-        self.addSceneLinkEthTags(orig_node, orig_eth, dest_node, dest_eth)
+        :raises ValueError: if the address plan runs out of space (the scene is left unchanged)
+        """
+        self.model.readdress()
+        for node in self.scene_nodes.values():
+            node.changeSceneIpTags()
+            self.updateSceneLinks(node)
 
-        # Resetting temporary variables to initial state
-        self.new_link = None
-        self.link_orig_node = None
         self.scene_modified = True
 
-    @staticmethod
-    def updateSceneLinkTags(link, orig_node, dest_node):
-        """Moves and allocates the interface and IP scene tags correctly
+    # Level of detail functions
 
-        :param link: reference to the moved link
-        :type link: LinkGUI
-        :param orig_node: reference to first node object
-        :type orig_node: NodeGUI
-        :param dest_node: reference to second node object
-        :type dest_node: NodeGUI
+    def setDetailLevel(self, show_details=True, batch_links=False):
         """
-        # New positions of nodes (and line)
-        line = link.line()
-        orig_pos_x = line.x1()
-        orig_pos_y = line.y1()
-        dest_pos_x = line.x2()
-        dest_pos_y = line.y2()
+        Changes how much detail the scene shows (far zoom): without details, tags are
+        hidden and nodes are drawn as simple shapes; links may be batched, drawn by
+        the link layer (see LinkLayerGUI) instead of one item each
+
+        :param show_details: tags and node icons are shown
+        :type show_details: bool
+        :param batch_links: links are drawn by the link layer
+        :type batch_links: bool
+        """
+        if show_details != self.show_details:
+            self.show_details = show_details
+            for node in self.scene_nodes.values():
+                if node.scene_tags["name"] is not None:
+                    node.scene_tags["name"].setVisible(show_details)
+                node.updateIcon()
+            for link in self.scene_links.values():
+                for tag in link.scene_tags.values():
+                    tag.setVisible(show_details)
+
+        if batch_links != self.batch_links:
+            self.batch_links = batch_links
+            self.updateLinkItems()
+
+    def updateTheme(self):
+        """
+        Shows the scene with the application's theme. Items read the shared theme objects
+        (see SceneTheme) when painted, so the scene is just painted once
+        """
+        self.update()
 
-        # Calculating absolute horizontal and vertical distance
-        long_x = abs(orig_pos_x - dest_pos_x)
-        long_y = abs(orig_pos_y - dest_pos_y)
+    # Link layer functions
 
-        # Getting tags to update their position
-        link_tags = link.scene_tags
-        link_orig_tag = link_tags[orig_node.node_name]
-        link_dest_tag = link_tags[dest_node.node_name]
+    def isLinkLayerShown(self):
+        """Returns if links are drawn by the link layer, either chosen by the user or batched (far zoom)
 
-        # Horizontal axis offset correction
-        orig_tag_offset_x = abs(link_orig_tag.boundingRect().width() / 2)
-        dest_tag_offset_x = abs(link_dest_tag.boundingRect().width() / 2)
-        orig_tag_offset_y = link_orig_tag.boundingRect().center().y() - link_orig_tag.boundingRect().topLeft().y()
-        dest_tag_offset_y = link_dest_tag.boundingRect().center().y() - link_dest_tag.boundingRect().topLeft().y()
+        :returns the link layer is shown
+        :rtype bool
+        """
+        return self.link_layer or self.batch_links
 
-        # If node's interface has an IP tag associated, vertical axis must be corrected to with an offset
-        if link_orig_tag.childItems():
-            ip_orig_tag_offset = orig_tag_offset_y
-        else:
-            ip_orig_tag_offset = orig_tag_offset_y * math.atan2(long_x, long_y) / (math.pi / 2)
+    def setLinkLayer(self, enabled=True):
+        """Chooses if links are always drawn by the link layer or only when they are batched
 
-        if link_dest_tag.childItems():
-            ip_dest_tag_offset = dest_tag_offset_y
-        else:
-            ip_dest_tag_offset = dest_tag_offset_y * math.atan2(long_x, long_y) / (math.pi / 2)
-
-        # Tag's location update according to relative position of both nodes
-        if orig_pos_x > dest_pos_x and orig_pos_y > dest_pos_y:
-            link_orig_tag.setPos(orig_pos_x - (long_x / 4) - orig_tag_offset_x,
-                                 orig_pos_y - (long_y / 4) - orig_tag_offset_y - ip_orig_tag_offset)
-            link_dest_tag.setPos(dest_pos_x + (long_x / 4) - dest_tag_offset_x,
-                                 dest_pos_y + (long_y / 4) - dest_tag_offset_y - ip_dest_tag_offset)
-        elif orig_pos_x > dest_pos_x and orig_pos_y < dest_pos_y:
-            link_orig_tag.setPos(orig_pos_x - (long_x / 4) - orig_tag_offset_x,
-                                 orig_pos_y + (long_y / 4) - orig_tag_offset_y - ip_orig_tag_offset)
-            link_dest_tag.setPos(dest_pos_x + (long_x / 4) - dest_tag_offset_x,
-                                 dest_pos_y - (long_y / 4) - dest_tag_offset_y - ip_dest_tag_offset)
-        elif orig_pos_x < dest_pos_x and orig_pos_y > dest_pos_y:
-            link_orig_tag.setPos(orig_pos_x + (long_x / 4) - orig_tag_offset_x,
-                                 orig_pos_y - (long_y / 4) - orig_tag_offset_y - ip_orig_tag_offset)
-            link_dest_tag.setPos(dest_pos_x - (long_x / 4) - dest_tag_offset_x,
-                                 dest_pos_y + (long_y / 4) - dest_tag_offset_y - ip_dest_tag_offset)
-        elif orig_pos_x < dest_pos_x and orig_pos_y < dest_pos_y:
-            link_orig_tag.setPos(orig_pos_x + (long_x / 4) - orig_tag_offset_x,
-                                 orig_pos_y + (long_y / 4) - orig_tag_offset_y - ip_orig_tag_offset)
-            link_dest_tag.setPos(dest_pos_x - (long_x / 4) - dest_tag_offset_x,
-                                 dest_pos_y - (long_y / 4) - dest_tag_offset_y - ip_dest_tag_offset)
+        :param enabled: links are always drawn by the link layer
+        :type enabled: bool
+        """
+        if enabled != self.link_layer:
+            self.link_layer = enabled
+            self.updateLinkItems()
+
+    def addLinkLayers(self):
+        """Creates the link layer, an item per style group (after clearing the scene)"""
+        self.link_index.clear()
+        self.shown_links.clear()
+        self.hover_link = None
+        self.link_layers = [LinkLayerGUI(group) for group in range(4)]
+        for layer in self.link_layers:
+            layer.setVisible(self.isLinkLayerShown())
+            self.addItem(layer)
+
+    def updateLinkItems(self):
+        """
+        Shows or hides the links' items and the link layer: while it is shown, links are
+        hidden (or not even added to the scene, if the user has chosen so) unless they
+        are hovered or selected
+        """
+        layer_shown = self.isLinkLayerShown()
+        if not layer_shown:
+            self.shown_links.clear()
+            self.hover_link = None
+
+        for link in self.scene_links.values():
+            shown = not layer_shown or link in self.shown_links
+            if self.link_layer and not shown:
+                if link.scene() is self:
+                    self.removeItem(link)
+            else:
+                if link.scene() is None:
+                    self.addItem(link)
+                link.setVisible(shown)
 
-    def updateSceneLinks(self, node):
-        """Updates links position if one of the nodes moves
+        for layer in self.link_layers:
+            layer.setVisible(layer_shown)
+        self.updateLinkLayers()
 
-        :param node: reference to node object
-        :type node: NodeGUI
+    def updateLayerLinks(self, links):
+        """Updates the segments of some links in the link index, to be drawn again by the link layer
+
+        :param links: moved or restyled links
+        :type links: iterable
         """
-        # Initial variables
-        node_links = node.links
-        node_name = node.node_name
-        node_pos = node.scenePos()
+        for link in links:
+            self.link_index.setSegment(link.record.link_id, link.line(), link.getStyleGroup())
 
-        # Updating scene variable
-        self.scene_modified = True
+        self.layers_timer.start()
 
-        # If there is no link related to the node, functions returns
-        if not node_links:
-            return
-
-        # If there are links related to the node, each one of them is updated
-        for link in node_links:
-            for linked_node_name in self.scene_links[link].nodes:
-                if linked_node_name != node_name:
-                    dest_node = self.scene_nodes[linked_node_name]
-                    dest_node_pos = dest_node.scenePos()
-                    offset_node = node.boundingRect().center()
-                    offset_dest_node = dest_node.boundingRect().center()
-                    self.scene_links[link].setLine(node_pos.x() + offset_node.x(),
-                                                   node_pos.y() + offset_node.y(),
-                                                   dest_node_pos.x() + offset_dest_node.x(),
-                                                   dest_node_pos.y() + offset_dest_node.y())
-                    self.updateSceneLinkTags(self.scene_links[link], node, dest_node)
+    def updateLinkLayers(self):
+        """Updates the bounds of the link layer and draws it again (hidden layers hold nothing)"""
+        self.layers_timer.stop()
+        shown = self.isLinkLayerShown()
+        for layer in self.link_layers:
+            layer.setBounds(self.link_index.getBounds(layer.group) if shown else QRectF())
 
-    def removeSceneItem(self, item):
-        """Deletes a node/link from the scene and all links related to it
+    def showSceneLink(self, link):
+        """Shows a link drawn by the link layer as an item, while it is hovered or selected
 
-        :param item: item to be deleted
-        :type item: QGraphicsItem
+        :param link: link to be shown
+        :type link: LinkGUI
         """
-        # Initial variable in order to remove links later
-        links_to_remove = []
+        if not self.isLinkLayerShown() or link.record is None:
+            return
 
-        # If item to delete is a node, extract its links and delete the item
-        if isinstance(item, NodeGUI):
-            self.scene_nodes.pop(item.node_name)
-            self.removeItem(item)
-            for link in item.links:
-                links_to_remove.append(link)
-
-        # If item to delete is a link, extract its name
-        if isinstance(item, LinkGUI):
-            links_to_remove.append(item.link_name)
-
-        # Update of all elements related to the to-be-deleted item
-        for link in links_to_remove:
-            self.scene_links[link].deleteSceneTags()
-            self.removeItem(self.scene_links[link])
-            self.scene_links.pop(link)
-            for node in self.scene_nodes:
-                if link in self.scene_nodes[node].links:
-                    self.scene_nodes[node].deleteLink(link)
+        if link.scene() is None:
+            link.changeLineColor()
+            self.addItem(link)
+        link.setVisible(True)
+        self.shown_links.add(link)
+
+    def releaseSceneLinks(self):
+        """Leaves to the link layer the links shown as items which are no longer hovered nor selected"""
+        for link in list(self.shown_links):
+            if link is self.hover_link or link.isSelected():
+                continue
+
+            self.shown_links.discard(link)
+            if self.link_layer:
+                self.removeItem(link)
+            else:
+                link.setVisible(False)
 
-        self.scene_modified = True
+    def updateHoveredLink(self, pos):
+        """Looks for the link (drawn by the link layer) under the pointer, showing it as an item
 
-    def loadScene(self, data):
-        """Loads the network topology from external file
+        :param pos: position of the pointer in the scene
+        :type pos: QPointF
+        """
+        if not self.isLinkLayerShown():
+            return
 
-        :param data: structured network topology data
-        :type data: dict
+        # Nodes are above the links, the distance to hit links is the same whatever the zoom
+        link = None
+        if not isinstance(self.itemAt(pos, QTransform()), NodeGUI):
+            views = self.views()
+            zoom = views[0].transform().m11() if views else 1.0
+            link = self.scene_links.get(self.link_index.linkAt(pos.x(), pos.y(), self.LINK_HIT_RADIUS / zoom))
+
+        if link is self.hover_link:
+            return
+
+        self.hover_link = link
+        if link is not None:
+            self.showSceneLink(link)
+        self.release_timer.start()
+
+    def selectLayerLinks(self, rect):
+        """Selects the links drawn by the link layer that cross a rectangle (rubber band selection)
+
+        :param rect: selection rectangle of the scene
+        :type rect: QRectF
         """
-        # Addition of nodes to the scene
-        if "nodes" in data:
-            nodes_list = data["nodes"]
-            for node in nodes_list:
-                try:
-                    node_name = node["name"]
-                    node_type = node["type"]
-                    node_x_pos = node["x_pos"]
-                    node_y_pos = node["y_pos"]
-                    node_links = node["links"]
-                    node_properties = node["properties"]
-                except KeyError:
-                    dialog = QMessageBox()
-                    dialog.setIcon(QMessageBox.Warning)
-                    dialog.setTextFormat(Qt.RichText)
-                    dialog.setText("<b>Mininet topology file corrupted</b>")
-                    dialog.setInformativeText("Project nodes data is corrupted."
-                                              "Please, verify JSON format is correct.")
-                    dialog.exec()
-                    return
-                else:
-                    new_node = self.addSceneNode(node_x_pos, node_y_pos, node_type, node_name, node_properties)
-                    new_node.links = node_links
-        else:
+        if not self.isLinkLayerShown():
             return
 
-        # Addition of links to the scene
-        if "links" in data:
-            links_list = data["links"]
-            for link in links_list:
-                try:
-                    link_nodes = link["nodes"]
-                    link_state = link["state"]
-                    link_name = link["name"]
-                except KeyError:
-                    dialog = QMessageBox()
-                    dialog.setIcon(QMessageBox.Warning)
-                    dialog.setTextFormat(Qt.RichText)
-                    dialog.setText("<b>Mininet topology file corrupted</b>")
-                    dialog.setInformativeText("Project links data is corrupted."
-                                              "Please, verify JSON format is correct.")
-                    dialog.exec()
-                    return
-                else:
-                    scene_element = []
-                    for node_name in link_nodes:
-                        scene_element.append(self.scene_nodes[node_name])
-
-                # Associating the links to its correspondent nodes
-                orig_coor = scene_element[0].scenePos() + scene_element[0].boundingRect().center()
-                dest_coor = scene_element[1].scenePos() + scene_element[1].boundingRect().center()
-                self.addSceneLink(orig_coor.x(), orig_coor.y())
-                self.new_link.updateEndPoint(dest_coor.x(), dest_coor.y())
-                self.new_link.setLinkState(link_state)
-                self.finishSceneLink(name=link_name)
+        for link_id in self.link_index.linksIn(rect):
+            link = self.scene_links[link_id]
+            self.showSceneLink(link)
+            link.setSelected(True)
 
-        self.scene_modified = False
+    # Undo/redo functions
 
-    def saveScene(self):
-        """Saves the current network topology of the project
+    def startUndoTimer(self, change, *args):
+        """Closes the undo entry once the current user action is handled (see closeUndoEntry)
 
-        :returns: structured network topology data
-        :rtype: dict
+        :param change: kind of change of the model
+        :type change: str
+        :param args: records involved in the change and previous values
         """
-        # Initial variables
-        file_dictionary = {}
-        nodes_saved = []
-        links_saved = []
+        if not self.undo_timer.isActive():
+            self.undo_timer.start()
 
-        # Saving nodes
-        for item in self.scene_nodes:
-            node = {
-                "name": self.scene_nodes[item].node_name,
-                "type": self.scene_nodes[item].node_type,
-                "x_pos": self.scene_nodes[item].scenePos().x(),
-                "y_pos": self.scene_nodes[item].scenePos().y(),
-                "links": self.scene_nodes[item].links,
-                "properties": self.scene_nodes[item].properties
-            }
-            nodes_saved.append(node)
+    def closeUndoEntry(self):
+        """Ends the undo entry of the last user action (drags end when the mouse button is released)"""
+        if QApplication.mouseButtons() != Qt.NoButton:
+            return
 
-        # Saving links
-        for item in self.scene_links:
-            link = {
-                "name": self.scene_links[item].link_name,
-                "nodes": self.scene_links[item].nodes,
-                "state": self.scene_links[item].isLinkUp()
-            }
-            links_saved.append(link)
+        self.undo_stack.closeEntry()
 
-        file_dictionary["nodes"] = nodes_saved
-        file_dictionary["links"] = links_saved
+    def undoScene(self):
+        """Undoes the last user action on the scene"""
+        self.applySceneChanges(self.undo_stack.undo())
 
-        self.scene_modified = False
+    def redoScene(self):
+        """Redoes the last undone user action on the scene"""
+        self.applySceneChanges(self.undo_stack.redo())
 
-        return file_dictionary
+    def applySceneChanges(self, changes):
+        """
+        Updates the scene items after changes made directly to the model (undo/redo).
+        Items of removed elements are deleted and those of added ones are created
+        afterwards at once (see addSceneRecords)
 
-    # Auxiliary functions
+        :param changes: changes of the model, as (change, args) pairs (see TopologyModel.notifyChange)
+        :type changes: list
+        """
+        if not changes:
+            return
 
-    def isFeasibleName(self, name):
-        """Checks if a given name is already taken or not"""
-        if len(name) == 0:
-            return False
+        added_nodes = {}
+        added_links = {}
+        moved_nodes = set()
+        addressed_nodes = set()
+        for change, args in changes:
+            if change == "add_node":
+                added_nodes[args[0].node_id] = args[0]
+            elif change == "add_link":
+                added_links[args[0].link_id] = args[0]
+            elif change == "remove_link":
+                link, intfs = args
+                added_links.pop(link.link_id, None)
+                if link.link_id in self.scene_links:
+                    self.removeSceneLinkItem(link.link_id, [intf.name for intf in intfs])
+            elif change == "remove_node":
+                node = self.scene_nodes.pop(args[0].node_id, None)
+                added_nodes.pop(args[0].node_id, None)
+                if node is not None:
+                    self.removeItem(node)
+            elif change == "move_node":
+                moved_nodes.add(args[0].node_id)
+            elif change == "rename_node" and args[0].node_id in self.scene_nodes:
+                self.scene_nodes[args[0].node_id].changeSceneNameTag(args[0].name)
+            elif change in ("node_address", "intf_address"):
+                addressed_nodes.add(args[0].node_id)
+            elif change == "link_state" and args[0].link_id in self.scene_links:
+                self.scene_links[args[0].link_id].setLinkState(args[0].is_up)
+
+        # Moved items follow their nodes (without recording the moves again)
+        self.bulk_insert = True
+        for node_id in moved_nodes:
+            node = self.scene_nodes.get(node_id)
+            if node is not None:
+                node.setPos(node.record.x, node.record.y)
+                self.dirty_links.update(node.record.link_intfs)
+        self.bulk_insert = False
+
+        # Restored elements are added at once
+        self.addSceneRecords([record for node_id, record in added_nodes.items() if node_id not in self.scene_nodes],
+                             [record for link_id, record in added_links.items() if link_id not in self.scene_links])
+
+        for node_id in addressed_nodes:
+            node = self.scene_nodes.get(node_id)
+            if node is not None:
+                node.changeSceneIpTags()
+                self.dirty_links.update(node.record.link_intfs)
+
+        self.flushSceneLinks()
+        self.scene_modified = True
+
+    # Auxiliary functions
 
-        for item in self.items():
-            if isinstance(item, NodeGUI) and item.node_name == name:
-                return False
-            elif isinstance(item, LinkGUI) and item.link_name == name:
-                return False
+    def renameSceneNode(self, node, new_name):
+        """Changes the name of a node in the model and in its name tag
 
-        return True
+        :param node: reference to node object
+        :type node: NodeGUI
+        :param new_name: new name for the node
+        :type new_name: str
+        """
+        self.model.renameNode(node.record.node_id, new_name)
+        node.changeSceneNameTag(new_name)
+        self.scene_modified = True
 
     def isFeasibleLink(self, dest_item):
         """Checks if the connection between two items is possible
@@ -1832,20 +7002,12 @@ class SceneGUI(QGraphicsScene):
         # Checking if the second item is the link itself or the first node
         if dest_item == self.link_orig_node or dest_item == self.new_link:
             return False
-        # Checking if the link between the two items is allowed
-        elif (isinstance(self.link_orig_node, NodeGUI) and
-                isinstance(dest_item, NodeGUI) and
-                self.link_orig_node.node_type == "Host" and
-                dest_item.node_type == "Host"):
+        # Only nodes can be linked
+        elif not isinstance(self.link_orig_node, NodeGUI) or not isinstance(dest_item, NodeGUI):
             return False
-        else:
-            # Checking if there is already a link between these two nodes
-            orig_node_links = self.link_orig_node.links
-            for orig_link in orig_node_links:
-                if orig_link in dest_item.links:
-                    return False
 
-        return True
+        # Checking if the link between the two nodes is allowed (types, existing link)
+        return self.model.canLink(self.link_orig_node.record.node_id, dest_item.record.node_id)
 
     def selectSceneItem(self, item):
         """
@@ -1866,6 +7028,83 @@ class SceneGUI(QGraphicsScene):
         item.setSelected(True)
         item.setFocus()
 
+    def getSelectedItems(self):
+        """Returns the nodes and links selected by the user
+
+        :returns selected nodes and links
+        :rtype list
+        """
+        return [item for item in self.selectedItems() if isinstance(item, (NodeGUI, LinkGUI))]
+
+    def setSelectedLinksState(self, is_up=True):
+        """Changes the state of all the selected links
+
+        :param is_up: new links' state
+        :type is_up: bool
+        """
+        for item in self.getSelectedItems():
+            if isinstance(item, LinkGUI) and item.record is not None:
+                item.setLinkState(is_up)
+                if self.net_running:
+                    self.net_controller.updateNetLinkStatus(item)
+
+        self.scene_modified = True
+
+    def setSelectedSwitchesStp(self, protocol=None):
+        """Changes the spanning tree protocol of all the selected switches
+
+        :param protocol: new protocol (see STP_PROTOCOLS), None to follow the scene's one
+        :type protocol: str
+        """
+        for item in self.getSelectedItems():
+            if isinstance(item, NodeGUI) and item.node_type == "Switch":
+                self.model.setStpProtocol(protocol, item.record.node_id)
+
+        self.scene_modified = True
+
+    def selectionContextMenu(self, event):
+        """Shows the menu with the actions available for a group of selected items
+
+        :param event: application's event
+        :type event: QGraphicsSceneContextMenuEvent
+        """
+        items = self.getSelectedItems()
+        links = [item for item in items if isinstance(item, LinkGUI)]
+        switches = [item for item in items if isinstance(item, NodeGUI) and item.node_type == "Switch"]
+
+        # Initialization
+        context_menu = QMenu()
+        context_menu.addSection(str(len(items)) + " items selected")
+
+        # Link state
+        if links:
+            up_act = context_menu.addAction("Set links up")
+            up_act.setStatusTip("Set up all the selected links")
+            up_act.triggered.connect(lambda: self.setSelectedLinksState(True))
+            down_act = context_menu.addAction("Set links down")
+            down_act.setStatusTip("Set down all the selected links")
+            down_act.triggered.connect(lambda: self.setSelectedLinksState(False))
+
+        # Spanning tree protocol of switches
+        if switches:
+            stp_menu = context_menu.addMenu("Spanning tree")
+            stp_options = [(None, "Scene default (" + str(self.model.stp_protocol) + ")")]
+            stp_options.extend((protocol, protocol) for protocol in STP_PROTOCOLS)
+            for protocol, text in stp_options:
+                stp_act = stp_menu.addAction(text)
+                stp_act.triggered.connect(lambda checked, p=protocol: self.setSelectedSwitchesStp(p))
+            if self.net_running:
+                stp_menu.setEnabled(False)
+
+        # Deletion of the whole group
+        delete_act = context_menu.addAction("Delete")
+        delete_act.setStatusTip("Delete all the selected items")
+        delete_act.triggered.connect(lambda: self.removeSceneItems(items))
+        if self.net_running:
+            delete_act.setEnabled(False)
+
+        context_menu.exec(event.screenPos())
+
     # Event handlers
 
     def event(self, event):
@@ -1875,13 +7114,7 @@ class SceneGUI(QGraphicsScene):
         :type event: QEvent
         """
         if event.type() == QEvent.PaletteChange:
-            for item in self.items():
-                if isinstance(item, (IpTagGUI, EthTagGUI, NameTagGUI)):
-                    item.updateColor()
-                elif isinstance(item, LinkGUI):
-                    item.changeLineColor()
-                elif isinstance(item, NodeGUI):
-                    item.updateIcon()
+            self.updateTheme()
 
         return QGraphicsScene.event(self, event)
 
@@ -1896,10 +7129,26 @@ class SceneGUI(QGraphicsScene):
             return
 
         if event.key() == Qt.Key_Delete or event.key() == Qt.Key_Backspace:
+            items = self.getSelectedItems()
             item = self.focusItem()
-            if item is not None:
+            if len(items) > 1:
+                self.removeSceneItems(items)
+            elif item is not None:
                 self.removeSceneItem(item)
 
+    def contextMenuEvent(self, event):
+        """It is called when user clicks with the mouse right button on the scene
+
+        :param event: application's event
+        :type event: QGraphicsSceneContextMenuEvent
+        """
+        # Groups of selected items have their own menu, shown when clicking on one of them
+        item = self.itemAt(event.scenePos(), QTransform())
+        if isinstance(item, (NodeGUI, LinkGUI)) and item.isSelected() and len(self.getSelectedItems()) > 1:
+            self.selectionContextMenu(event)
+        else:
+            super().contextMenuEvent(event)
+
     def mousePressEvent(self, event):
         """It is called when user presses the mouse on the scene
 
@@ -1912,16 +7161,25 @@ class SceneGUI(QGraphicsScene):
             self.link_orig_node = None
             self.new_link = None
 
+        # Links drawn by the link layer are shown as items to be clicked
+        self.updateHoveredLink(event.scenePos())
+
         if self.current_tool == "Select":
+            # Ctrl + click toggles the item's selection and clicking on a selected item
+            # keeps the whole group selected (to move it), both handled by the base class
+            multi_selection = bool(event.modifiers() & Qt.ControlModifier)
             super().mousePressEvent(event)
             item = self.itemAt(event.scenePos(), QTransform())
             if item is not None:
-                self.selectSceneItem(item)
-            else:
+                if not multi_selection and not (item.isSelected() and len(self.getSelectedItems()) > 1):
+                    self.selectSceneItem(item)
+            elif not multi_selection:
                 self.clearSelection()
         elif self.current_tool == "Delete":
             item = self.itemAt(event.scenePos(), QTransform())
-            if item is not None and not isinstance(item, TagGUI):
+            if item is not None and item.isSelected() and len(self.getSelectedItems()) > 1:
+                self.removeSceneItems(self.getSelectedItems())
+            elif item is not None and not isinstance(item, TagGUI):
                 self.removeSceneItem(item)
         elif self.current_tool == "Link":
             item = self.itemAt(event.scenePos(), QTransform())
@@ -1939,6 +7197,9 @@ class SceneGUI(QGraphicsScene):
         :param event: application's event
         :type event: QGraphicsSceneMouseEvent
         """
+        if event.buttons() == Qt.NoButton:
+            self.updateHoveredLink(event.scenePos())
+
         super().mouseMoveEvent(event)
         if self.current_tool == "Link" and self.new_link is not None:
             self.new_link.updateEndPoint(event.scenePos().x(), event.scenePos().y())
@@ -1950,6 +7211,10 @@ class SceneGUI(QGraphicsScene):
         :type event: QGraphicsSceneMouseEvent
         """
         super().mouseReleaseEvent(event)
+
+        # Changes made while the button was pressed (as dragging nodes) are a single undo entry
+        self.undo_timer.start()
+
         if self.current_tool == "Link" and self.new_link is not None:
             item = self.itemAt(event.scenePos(), QTransform())
             if item is not None and self.isFeasibleLink(item):
@@ -1963,6 +7228,228 @@ class SceneGUI(QGraphicsScene):
                 self.new_link = None
 
 
+class CanvasGUI(QGraphicsView):
+    """View class of the scene: it can be zoomed (mouse wheel) and panned (middle button)"""
+    MIN_ZOOM = 0.01
+    MAX_ZOOM = 8.0
+    ZOOM_STEP = 1.25
+    DETAILS_ZOOM = 0.5
+    BATCH_ZOOM = 0.25
+    SCENE_LIMIT = 1000000.0
+
+    def __init__(self):
+        super(CanvasGUI, self).__init__()
+
+        # The scene has no bounds: scroll bars are hidden, the view is moved by panning
+        self.setSceneRect(QRectF(-self.SCENE_LIMIT, -self.SCENE_LIMIT, 2 * self.SCENE_LIMIT, 2 * self.SCENE_LIMIT))
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.NoAnchor)
+
+        # Items set the painter state they use and none of them is antialiased
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+
+        # Panning variables
+        self.pan_pos = None
+        self.view_shown = False
+
+        # Last rubber band rectangle, to select the links drawn by the link layer (see SceneGUI.selectLayerLinks)
+        self.rubber_band_rect = QRectF()
+        self.rubberBandChanged.connect(self.updateRubberBand)
+
+    @staticmethod
+    def checkOpenGL():
+        """Returns if OpenGL can be used, creating a context (Mesa's software rasterizer counts)
+
+        :returns OpenGL is available
+        :rtype bool
+        """
+        context = QOpenGLContext()
+        if not context.create():
+            return False
+
+        surface = QOffscreenSurface()
+        surface.create()
+        available = context.makeCurrent(surface)
+        if available:
+            context.doneCurrent()
+
+        return available
+
+    def setOpenGL(self, enabled=True):
+        """Changes the viewport of the view: an OpenGL widget or the default (raster) one
+
+        :param enabled: the view is drawn with OpenGL
+        :type enabled: bool
+        """
+        if enabled == isinstance(self.viewport(), QOpenGLWidget):
+            return
+
+        if enabled:
+            self.setViewport(QOpenGLWidget())
+            # OpenGL frames are drawn from scratch, so partial updates do not save any work
+            self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        else:
+            self.setViewport(QWidget())
+            self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+
+    def getZoom(self):
+        """Returns the current zoom of the view
+
+        :returns zoom factor (1.0 is actual size)
+        :rtype float
+        """
+        return self.transform().m11()
+
+    def setZoom(self, zoom):
+        """Changes the zoom of the view, around the mouse if it is within the view
+
+        :param zoom: new zoom factor
+        :type zoom: float
+        """
+        zoom = min(max(zoom, self.MIN_ZOOM), self.MAX_ZOOM)
+        factor = zoom / self.getZoom()
+        if factor != 1.0:
+            self.scale(factor, factor)
+        self.updateDetailLevel()
+
+    def zoomIn(self):
+        """Zooms in one step"""
+        self.setZoom(self.getZoom() * self.ZOOM_STEP)
+
+    def zoomOut(self):
+        """Zooms out one step"""
+        self.setZoom(self.getZoom() / self.ZOOM_STEP)
+
+    def resetView(self):
+        """Shows the scene at actual size, with its origin at the top-left corner of the view"""
+        self.setTransform(QTransform())
+        self.centerOn(QRectF(self.viewport().rect()).center())
+        self.updateDetailLevel()
+
+    def fitScene(self, shrink_only=False):
+        """Shows all the scene's items within the view (never zoomed beyond actual size)
+
+        :param shrink_only: the view is only changed if some item is out of it
+        :type shrink_only: bool
+        """
+        scene = self.scene()
+        if scene is None:
+            return
+
+        rect = scene.itemsBoundingRect()
+        if rect.isEmpty():
+            return
+        if shrink_only and self.mapToScene(self.viewport().rect()).boundingRect().contains(rect):
+            return
+
+        margin = 20.0
+        view_rect = self.viewport().rect()
+        zoom = min((view_rect.width() - 2 * margin) / rect.width(), (view_rect.height() - 2 * margin) / rect.height())
+        zoom = min(max(zoom, self.MIN_ZOOM), 1.0)
+        self.setTransform(QTransform.fromScale(zoom, zoom))
+        self.centerOn(rect.center())
+        self.updateDetailLevel()
+
+    def updateRubberBand(self, rect, from_pos, to_pos):
+        """Keeps the rubber band rectangle and, when the selection ends, selects the links within it
+
+        :param rect: rubber band rectangle in the view (null when the selection ends)
+        :type rect: QRect
+        :param from_pos: first corner of the rectangle in the scene
+        :type from_pos: QPointF
+        :param to_pos: last corner of the rectangle in the scene
+        :type to_pos: QPointF
+        """
+        if not rect.isNull():
+            self.rubber_band_rect = QRectF(from_pos, to_pos).normalized()
+            return
+
+        scene = self.scene()
+        if scene is not None and isinstance(scene, SceneGUI) and not self.rubber_band_rect.isNull():
+            scene.selectLayerLinks(self.rubber_band_rect)
+        self.rubber_band_rect = QRectF()
+
+    def updateDetailLevel(self):
+        """Tells the scene how much detail it must show at the current zoom"""
+        scene = self.scene()
+        if scene is not None and isinstance(scene, SceneGUI):
+            zoom = self.getZoom()
+            scene.setDetailLevel(zoom >= self.DETAILS_ZOOM, zoom < self.BATCH_ZOOM)
+
+    # Event handlers
+
+    def showEvent(self, event):
+        """It is called when the view is shown: the first time, the scene's origin is placed at the top-left corner
+
+        :param event: application's event
+        :type event: QShowEvent
+        """
+        super().showEvent(event)
+        if not self.view_shown:
+            self.view_shown = True
+            self.resetView()
+
+    def wheelEvent(self, event):
+        """It is called when the mouse wheel is rotated: the view is zoomed around the mouse
+
+        :param event: application's event
+        :type event: QWheelEvent
+        """
+        delta = event.angleDelta().y()
+        if delta == 0:
+            event.ignore()
+            return
+
+        self.setZoom(self.getZoom() * math.pow(self.ZOOM_STEP, delta / 120.0))
+        event.accept()
+
+    def mousePressEvent(self, event):
+        """It is called when a mouse button is pressed: the middle button starts panning
+
+        :param event: application's event
+        :type event: QMouseEvent
+        """
+        if event.button() == Qt.MiddleButton:
+            self.pan_pos = event.pos()
+            self.viewport().setCursor(Qt.ClosedHandCursor)
+            event.accept()
+            return
+
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        """It is called when the mouse is moved: the view is panned while the middle button is pressed
+
+        :param event: application's event
+        :type event: QMouseEvent
+        """
+        if self.pan_pos is not None:
+            delta = event.pos() - self.pan_pos
+            self.pan_pos = event.pos()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+            event.accept()
+            return
+
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        """It is called when a mouse button is released: the middle button ends panning
+
+        :param event: application's event
+        :type event: QMouseEvent
+        """
+        if event.button() == Qt.MiddleButton and self.pan_pos is not None:
+            self.pan_pos = None
+            self.viewport().unsetCursor()
+            event.accept()
+            return
+
+        super().mouseReleaseEvent(event)
+
+
 # Application main class
 
 class MiniGUI(QMainWindow):
@@ -1977,9 +7464,12 @@ class MiniGUI(QMainWindow):
         self.net_button = QToolButton()
         self.tool_buttons = QButtonGroup()
         self.net_indicators = {}
+        self.topology_indicator = QLabel()
+        self.topology_timer = QTimer()
+        self.topology_version = None
 
         # Scene-related variables
-        self.canvas = QGraphicsView()
+        self.canvas = CanvasGUI()
         self.scene = SceneGUI(net_ctrl=self)
 
         # Mininet-related variables
@@ -1987,9 +7477,29 @@ class MiniGUI(QMainWindow):
         self.thread_cli = None
         self.thread_updater = None
 
+        # Layout-related variables
+        self.thread_layout = None
+
+        # Loading-related variables
+        self.project_reader = None
+        self.project_items = None
+        self.load_timer = QTimer()
+        self.load_progress = QProgressBar()
+        self.load_cancel = QPushButton("Cancel")
+
+        # Saving-related variables
+        self.thread_save = None
+        self.save_progress = QProgressBar()
+        self.save_checkpoint = 0
+
+        # Change journal (see ChangeJournal), made durable periodically
+        self.journal = ChangeJournal(self.scene.model)
+        self.journal_timer = QTimer()
+
         # Auxiliary variables
         self.project_path = None
-        self.app_prefs = {"LastProjectPath": "", "Mode": "basic", "CLI": True}
+        self.app_prefs = {"LastProjectPath": "", "Mode": "basic", "CLI": True, "Compress": False,
+                          "LinkLayer": False, "Viewport": "Raster", "AddressPlan": dict(DEFAULT_ADDRESS_PLAN)}
 
         # Modification of internal properties
         self.setContextMenuPolicy(Qt.NoContextMenu)
@@ -2003,6 +7513,15 @@ class MiniGUI(QMainWindow):
         self.setMenuBarGUI()
         self.setToolBarGUI()
 
+        # Canvas drawn with OpenGL, if chosen by the user
+        if self.app_prefs["Viewport"] != "Raster":
+            self.changeViewport(self.app_prefs["Viewport"])
+
+        # Changes lost in a previous session are recovered before journaling new ones
+        self.journal_timer.timeout.connect(self.journal.sync)
+        self.journal_timer.start(JOURNAL_SYNC_TIME)
+        QTimer.singleShot(0, self.checkRecovery)
+
     # Main window initialization functions
 
     def setPreferencesGUI(self):
@@ -2035,9 +7554,30 @@ class MiniGUI(QMainWindow):
         else:
             self.app_prefs["CLI"] = False
 
+        # Compression of saved projects
+        self.app_prefs["Compress"] = settings.value('AppCompress') == "True"
+
+        # Drawing of links by the link layer
+        self.app_prefs["LinkLayer"] = settings.value('AppLinkLayer') == "True"
+
+        # Viewport of the canvas (raster or OpenGL)
+        app_viewport = settings.value('AppViewport')
+        if app_viewport in CANVAS_VIEWPORTS:
+            self.app_prefs["Viewport"] = app_viewport
+
         # Directory of last opened project
         self.app_prefs["LastProjectPath"] = settings.value("ProjectPath")
 
+        # Address plan used to allocate IP addresses
+        app_plan = settings.value("AddressPlan")
+        if app_plan:
+            try:
+                self.app_prefs["AddressPlan"].update(json.loads(app_plan))
+                self.scene.model.ip_allocator.setPlan(self.app_prefs["AddressPlan"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                self.app_prefs["AddressPlan"] = dict(DEFAULT_ADDRESS_PLAN)
+                self.scene.model.ip_allocator.setPlan(self.app_prefs["AddressPlan"])
+
     def setMainWindowGUI(self):
         """
         Sets the internal values of the main window base class:
@@ -2051,6 +7591,7 @@ class MiniGUI(QMainWindow):
         # Scene allocation within main window
         self.canvas.setScene(self.scene)
         self.setCentralWidget(self.canvas)
+        self.scene.setLinkLayer(self.app_prefs["LinkLayer"])
 
         # Application's font modification
         font = app.font()
@@ -2062,6 +7603,29 @@ class MiniGUI(QMainWindow):
         # Assignation of status bar to main window
         self.setStatusBar(self.status_bar)
 
+        # Adding loading progress bar and cancel button, only shown while a project is loaded
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setFixedWidth(200)
+        self.load_progress.hide()
+        self.load_cancel.hide()
+        self.load_cancel.clicked.connect(self.cancelLoading)
+        self.load_timer.setSingleShot(True)
+        self.load_timer.timeout.connect(self.continueLoading)
+        self.status_bar.addWidget(self.load_progress)
+        self.status_bar.addWidget(self.load_cancel)
+
+        # Adding saving progress bar, only shown while a project is written in the background
+        self.save_progress.setRange(0, 100)
+        self.save_progress.setFixedWidth(200)
+        self.save_progress.hide()
+        self.status_bar.addWidget(self.save_progress)
+
+        # Adding topology summary label, refreshed only when the topology changes
+        self.status_bar.addPermanentWidget(self.topology_indicator)
+        self.topology_timer.timeout.connect(self.updateTopologyIndicator)
+        self.topology_timer.start(500)
+        self.updateTopologyIndicator()
+
         # Adding 1st permanent label: net status through text
         label_widget = QLabel("Mininet network is not active")
         self.status_bar.addPermanentWidget(label_widget)
@@ -2081,6 +7645,9 @@ class MiniGUI(QMainWindow):
 
         # Submenus definition and addition to menu bar
         file_menu = self.menu_bar.addMenu("File")
+        edit_menu = self.menu_bar.addMenu("Edit")
+        view_menu = self.menu_bar.addMenu("View")
+        tools_menu = self.menu_bar.addMenu("Tools")
         pref_menu = self.menu_bar.addMenu("Preferences")
         help_menu = self.menu_bar.addMenu("About")
 
@@ -2090,9 +7657,25 @@ class MiniGUI(QMainWindow):
         save_action = QAction("Save", self)
         save_as_action = QAction("Save as", self)
         quit_action = QAction("Quit", self)
+        undo_action = QAction("Undo", self)
+        redo_action = QAction("Redo", self)
+        zoom_in_action = QAction("Zoom in", self)
+        zoom_out_action = QAction("Zoom out", self)
+        fit_action = QAction("Fit to scene", self)
+        actual_size_action = QAction("Actual size", self)
+        readdress_action = QAction("Re-address scene", self)
+        validate_action = QAction("Validate topology", self)
+        arrange_action = QAction("Arrange", self)
+        arrange_layers_action = QAction("Arrange in layers", self)
+        generate_action = QAction("Generate topology", self)
+        stp_menu = QMenu("Spanning tree", self)
         app_theme_action = QAction("Dark theme", self)
         app_mode_action = QAction("Advanced mode", self)
         app_cli_action = QAction("CLI terminal", self)
+        app_compress_action = QAction("Compress saved projects", self)
+        app_layer_action = QAction("Batch link drawing", self)
+        viewport_menu = QMenu("Canvas viewport", self)
+        app_plan_action = QAction("Address plan", self)
         about_action = QAction("About MiniGUI", self)
 
         # Action keyboard shortcuts
@@ -2101,6 +7684,14 @@ class MiniGUI(QMainWindow):
         save_action.setShortcut("Ctrl+S")
         save_as_action.setShortcut("Ctrl+Alt+S")
         quit_action.setShortcut("Ctrl+Q")
+        undo_action.setShortcut("Ctrl+Z")
+        redo_action.setShortcut("Ctrl+Shift+Z")
+        zoom_in_action.setShortcut("Ctrl++")
+        zoom_out_action.setShortcut("Ctrl+-")
+        fit_action.setShortcut("Ctrl+F")
+        actual_size_action.setShortcut("Ctrl+0")
+        arrange_action.setShortcut("Ctrl+L")
+        arrange_layers_action.setShortcut("Ctrl+Shift+L")
         about_action.setShortcut("F1")
 
         # Action properties definition and update according to
@@ -2108,6 +7699,8 @@ class MiniGUI(QMainWindow):
         app_theme_action.setCheckable(True)
         app_mode_action.setCheckable(True)
         app_cli_action.setCheckable(True)
+        app_compress_action.setCheckable(True)
+        app_layer_action.setCheckable(True)
 
         if APP_THEME == "dark":
             app_theme_action.setChecked(True)
@@ -2115,6 +7708,10 @@ class MiniGUI(QMainWindow):
             app_mode_action.setChecked(True)
         if self.app_prefs["CLI"]:
             app_cli_action.setChecked(True)
+        if self.app_prefs["Compress"]:
+            app_compress_action.setChecked(True)
+        if self.app_prefs["LinkLayer"]:
+            app_layer_action.setChecked(True)
 
         # Action status tips
         new_action.setStatusTip("Create a new project")
@@ -2122,9 +7719,23 @@ class MiniGUI(QMainWindow):
         save_action.setStatusTip("Save the current project")
         save_as_action.setStatusTip("Save the current project as another")
         quit_action.setStatusTip("Exit MiniGUI")
+        undo_action.setStatusTip("Undo the last change of the scene")
+        redo_action.setStatusTip("Redo the last undone change of the scene")
+        zoom_in_action.setStatusTip("Zoom in the scene (also with the mouse wheel)")
+        zoom_out_action.setStatusTip("Zoom out the scene (also with the mouse wheel)")
+        fit_action.setStatusTip("Show the whole scene within the window")
+        actual_size_action.setStatusTip("Show the scene at its actual size")
+        readdress_action.setStatusTip("Assign new IP addresses to the whole scene following the address plan")
+        validate_action.setStatusTip("Look for loops, duplicate addresses and other issues in the topology")
+        arrange_action.setStatusTip("Arrange the scene with a force-directed layout (pinned nodes keep their position)")
+        arrange_layers_action.setStatusTip("Arrange the scene in layers from its core switches or routers")
+        generate_action.setStatusTip("Create a new project with a generated topology (tree, fat-tree, random...)")
         app_theme_action.setStatusTip("Change between light & dark theme")
         app_mode_action.setStatusTip("Change between basic & advanced mode")
         app_cli_action.setStatusTip("Use CLI terminal when scene is running or not")
+        app_compress_action.setStatusTip("Compress project files with gzip when they are saved")
+        app_layer_action.setStatusTip("Draw all the links of the same style at once (faster with large scenes)")
+        app_plan_action.setStatusTip("Change the address pools used for LANs and router links")
         about_action.setStatusTip("Show information about MiniGUI")
 
         # Action connections to functions & events
@@ -2133,9 +7744,24 @@ class MiniGUI(QMainWindow):
         save_action.triggered.connect(self.saveProject)
         save_as_action.triggered.connect(self.saveProject)
         quit_action.triggered.connect(self.close)
+        undo_action.triggered.connect(self.undoProject)
+        redo_action.triggered.connect(self.redoProject)
+        zoom_in_action.triggered.connect(self.canvas.zoomIn)
+        zoom_out_action.triggered.connect(self.canvas.zoomOut)
+        fit_action.triggered.connect(lambda: self.canvas.fitScene())
+        actual_size_action.triggered.connect(lambda: self.canvas.setZoom(1.0))
+        readdress_action.triggered.connect(self.readdressProject)
+        validate_action.triggered.connect(lambda: self.validateProject())
+        arrange_action.triggered.connect(lambda: self.arrangeProject())
+        arrange_layers_action.triggered.connect(lambda: self.arrangeProject(layered=True))
+        generate_action.triggered.connect(self.generateProject)
+        stp_menu.aboutToShow.connect(self.updateStpMenu)
         app_theme_action.toggled.connect(lambda: self.changePreferences(preference="theme"))
         app_mode_action.toggled.connect(lambda: self.changePreferences(preference="mode"))
         app_cli_action.toggled.connect(lambda: self.changePreferences(preference="CLI"))
+        app_compress_action.toggled.connect(lambda: self.changePreferences(preference="compress"))
+        app_layer_action.toggled.connect(lambda: self.changePreferences(preference="link layer"))
+        app_plan_action.triggered.connect(self.changeAddressPlan)
         about_action.triggered.connect(self.showAbout)
 
         # Action additions to submenus
@@ -2145,11 +7771,55 @@ class MiniGUI(QMainWindow):
         file_menu.addAction(save_as_action)
         file_menu.addSeparator()
         file_menu.addAction(quit_action)
+        edit_menu.addAction(undo_action)
+        edit_menu.addAction(redo_action)
+        view_menu.addAction(zoom_in_action)
+        view_menu.addAction(zoom_out_action)
+        view_menu.addSeparator()
+        view_menu.addAction(fit_action)
+        view_menu.addAction(actual_size_action)
+        tools_menu.addAction(readdress_action)
+        tools_menu.addAction(validate_action)
+        tools_menu.addAction(arrange_action)
+        tools_menu.addAction(arrange_layers_action)
+        tools_menu.addAction(generate_action)
+        tools_menu.addSeparator()
+        tools_menu.addMenu(stp_menu)
         pref_menu.addAction(app_theme_action)
         pref_menu.addAction(app_mode_action)
         pref_menu.addAction(app_cli_action)
+        pref_menu.addAction(app_compress_action)
+        pref_menu.addAction(app_layer_action)
+        pref_menu.addMenu(viewport_menu)
+        pref_menu.addSeparator()
+        pref_menu.addAction(app_plan_action)
         help_menu.addAction(about_action)
 
+        # Spanning tree protocol of the scene (exclusive options)
+        self.stp_actions = QActionGroup(self)
+        for protocol in STP_PROTOCOLS:
+            stp_action = QAction(protocol, self)
+            stp_action.setCheckable(True)
+            stp_action.setStatusTip("Run " + ("no spanning tree protocol" if protocol == "None" else protocol) +
+                                    " on the scene's switches")
+            stp_action.triggered.connect(lambda checked, p=protocol: self.changeStpProtocol(p))
+            self.stp_actions.addAction(stp_action)
+            stp_menu.addAction(stp_action)
+
+        # Viewport of the canvas (exclusive options)
+        self.viewport_actions = QActionGroup(self)
+        viewport_tips = {"Raster": "Draw the scene with the CPU (default)",
+                         "OpenGL": "Draw the scene with OpenGL (GPU)",
+                         "OpenGL (software)": "Draw the scene with OpenGL through Mesa's software rasterizer (no GPU)"}
+        for viewport in CANVAS_VIEWPORTS:
+            viewport_action = QAction(viewport, self)
+            viewport_action.setCheckable(True)
+            viewport_action.setChecked(viewport == self.app_prefs["Viewport"])
+            viewport_action.setStatusTip(viewport_tips[viewport])
+            viewport_action.triggered.connect(lambda checked, v=viewport: self.changeViewport(v))
+            self.viewport_actions.addAction(viewport_action)
+            viewport_menu.addAction(viewport_action)
+
     def setToolBarGUI(self):
         """Organises the main window's tool bar"""
         # Assignation
@@ -2231,6 +7901,12 @@ class MiniGUI(QMainWindow):
         """
         self.scene.current_tool = tool_name
 
+        # Rubber band selection is only available with "Select" tool
+        if tool_name == "Select":
+            self.canvas.setDragMode(QGraphicsView.RubberBandDrag)
+        else:
+            self.canvas.setDragMode(QGraphicsView.NoDrag)
+
     def updateNetButtonStyle(self):
         """Updates the style of the Mininet-related button"""
         if APP_THEME == "light" and self.net is None:
@@ -2253,6 +7929,19 @@ class MiniGUI(QMainWindow):
             self.net_indicators["Text"].setText("Mininet network is active!")
             self.net_indicators["Color"].setStyleSheet("background-color: green")
 
+    def updateTopologyIndicator(self):
+        """Updates the topology summary shown in the status bar (nodes, links, components)"""
+        model = self.scene.model
+        if self.topology_version == model.version:
+            return
+
+        self.topology_version = model.version
+        components = self.scene.graph.getComponents()
+        degree_stats = self.scene.graph.getDegreeStats()
+        self.topology_indicator.setText("Nodes: " + str(len(model.nodes)) + " | Links: " + str(len(model.links)) +
+                                        " | Components: " + str(len(components)) +
+                                        " | Max. degree: " + str(degree_stats["max"]))
+
     def updateToolBarIcons(self):
         """Updates the icon for each tool, according to app's theme"""
         images = imagesMiniGUI()
@@ -2288,15 +7977,24 @@ class MiniGUI(QMainWindow):
         self.setWindowTitle("MiniGUI")
         self.project_path = None
 
+        # Layouts and loadings in progress are stopped, as node IDs are reset
+        self.stopLayout()
+        self.stopLoading()
+        self.journal.stop()
+
         # Scene cleaning
         self.scene.clear()
         self.scene.scene_nodes.clear()
         self.scene.scene_links.clear()
+        self.scene.dirty_links.clear()
+        self.scene.clearPendingTags()
+        self.scene.addLinkLayers()
+        self.scene.model.clear()
         self.scene.scene_modified = False
-        self.scene.default_ip_last = 1
-        self.scene.default_ip = self.scene.default_ip_base + str(self.scene.default_ip_last)
-        for tool in self.scene.item_count:
-            self.scene.item_count[tool] = 0
+        self.canvas.resetView()
+
+        # Changes of the new (empty) project are journaled
+        self.startJournal(None)
 
     def newProject(self):
         """Creates a new project"""
@@ -2327,27 +8025,140 @@ class MiniGUI(QMainWindow):
 
         # New dialog to let the user choose the project to open
         file_path = QFileDialog.getOpenFileName(self, "Open file", directory,
-                                                "Mininet topology (*.mn);;All files (*)", "")
+                                                "Mininet topology (*.mn);;MiniGUI binary project (*.mnb);;"
+                                                "All files (*)", "")
 
-        # File and format checking
+        # Project loading (progressive, format is checked along), recovering its lost changes if wanted
         if file_path[0] != "":
-            project_file = open(str(file_path[0]), "r")
-            try:
-                topology_data = json.load(project_file)
-            except json.JSONDecodeError:
-                dialog = QMessageBox()
-                dialog.setIcon(QMessageBox.Warning)
-                dialog.setTextFormat(Qt.RichText)
-                dialog.setText("<b>Error decoding JSON format</b>")
-                dialog.setInformativeText("This file does not have a JSON format."
-                                          "Please, fix the issue and try again")
-                dialog.exec()
+            journal_path = ChangeJournal.getJournalPath(str(file_path[0]))
+            if ChangeJournal.hasChanges(journal_path) and self.recoveryDialog(str(file_path[0])):
+                self.recoverProject(str(file_path[0]))
                 return
-            else:
+
+            self.clearProject()
+            self.project_path = str(file_path[0])
+            self.setWindowTitle("MiniGUI - " + str(file_path[0]).split("/")[-1])
+            self.loadProject(self.project_path)
+
+    def loadProject(self, file_path):
+        """
+        Loads a project file progressively: its elements are added to the scene in
+        batches from the event loop, so the window keeps responding (and showing
+        the elements already loaded) until the whole file is read
+
+        :param file_path: path of the project file
+        :type file_path: str
+        """
+        # Loaded elements are not journaled, as they are already saved
+        self.journal.stop()
+
+        # Binary projects are small and fast enough to be loaded at once
+        if file_path.endswith(BinaryProjectFile.EXTENSION):
+            if not self.scene.loadSceneBinary(file_path):
                 self.clearProject()
-                self.project_path = str(file_path[0])
-                self.setWindowTitle("MiniGUI - " + str(file_path[0]).split("/")[-1])
-                self.scene.loadScene(topology_data)
+                return
+            self.scene.undo_stack.clear()
+            self.canvas.fitScene(shrink_only=True)
+            self.startJournal(file_path)
+            return
+
+        try:
+            self.project_reader = ProjectReader.openFile(file_path)
+        except OSError as error:
+            self.clearProject()
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Project not opened</b>")
+            dialog.setInformativeText("The file " + file_path + " could not be read: " + str(error))
+            dialog.exec()
+            return
+        self.project_items = self.project_reader.readItems()
+        self.scene.startSceneLoading()
+
+        # Scene edition is not allowed until the project is loaded
+        self.menu_bar.setEnabled(False)
+        self.tool_bar.setEnabled(False)
+        self.canvas.setInteractive(False)
+        self.load_progress.setValue(0)
+        self.load_progress.show()
+        self.load_cancel.show()
+        self.status_bar.showMessage("Loading project...")
+
+        self.load_timer.start(0)
+
+    def continueLoading(self):
+        """Adds the next batch of elements of the project being loaded (about 30 ms of work)"""
+        if self.project_items is None:
+            return
+
+        start = time.time()
+        items = []
+        finished = True
+        try:
+            for item in self.project_items:
+                items.append(item)
+                if len(items) % 256 == 0 and time.time() - start > 0.03:
+                    finished = False
+                    break
+
+            self.scene.loadSceneItems(items)
+            if finished:
+                self.scene.finishSceneLoading()
+        except (json.JSONDecodeError, UnicodeDecodeError, EOFError, OSError):
+            self.clearProject()
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Error decoding JSON format</b>")
+            dialog.setInformativeText("This file does not have a JSON format."
+                                      "Please, fix the issue and try again")
+            dialog.exec()
+            return
+        except (KeyError, TypeError, ValueError):
+            self.clearProject()
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Mininet topology file corrupted</b>")
+            dialog.setInformativeText("Project nodes or links data is corrupted."
+                                      "Please, verify JSON format is correct.")
+            dialog.exec()
+            return
+
+        if finished:
+            self.stopLoading()
+            self.scene.undo_stack.clear()
+            self.canvas.fitScene(shrink_only=True)
+            self.startJournal(self.project_path)
+            self.status_bar.showMessage("Project loaded", 3000)
+        else:
+            self.load_progress.setValue(int(self.project_reader.getProgress() * 100))
+            self.load_timer.start(0)
+
+    def cancelLoading(self):
+        """Cancels the loading of the project, leaving an empty scene"""
+        if self.project_items is not None:
+            self.clearProject()
+            self.status_bar.showMessage("Project loading cancelled", 3000)
+
+    def stopLoading(self):
+        """Ends the loading of the project (if any), closing its file"""
+        self.load_timer.stop()
+        if self.project_reader is None:
+            return
+
+        self.project_items.close()
+        self.project_reader.close()
+        self.project_reader = None
+        self.project_items = None
+
+        self.menu_bar.setEnabled(True)
+        self.tool_bar.setEnabled(True)
+        self.canvas.setInteractive(True)
+        self.load_progress.hide()
+        self.load_cancel.hide()
+        self.status_bar.clearMessage()
 
     def saveProject(self):
         """Saves the project information in an external file"""
@@ -2359,12 +8170,15 @@ class MiniGUI(QMainWindow):
 
         if self.project_path is None or sender_text == "Save as":
             result = QFileDialog.getSaveFileName(self, "Save file as", os.getcwd(),
-                                                 "Mininet topology (*.mn);;All files (*)", "")
+                                                 "Mininet topology (*.mn);;MiniGUI binary project (*.mnb);;"
+                                                 "All files (*)", "")
 
             if result[0]:
                 file_path = str(result[0])
                 if result[1].startswith("Mininet") and not result[0].endswith(".mn"):
                     file_path = file_path + ".mn"
+                elif result[1].startswith("MiniGUI binary") and not result[0].endswith(BinaryProjectFile.EXTENSION):
+                    file_path = file_path + BinaryProjectFile.EXTENSION
 
                 self.setWindowTitle("MiniGUI - " + file_path.split("/")[-1])
                 self.app_prefs["LastProjectPath"] = file_path
@@ -2372,10 +8186,401 @@ class MiniGUI(QMainWindow):
             else:
                 return
 
-        project_file = open(self.project_path, "w")
-        json_file_dictionary = self.scene.saveScene()
-        project_file.write(json.dumps(json_file_dictionary, sort_keys=True, indent=4, separators=(',', ':')))
-        project_file.close()
+        # Saves are written one after another
+        self.waitSave()
+
+        # Snapshot of the scene (binary projects, see BinaryProjectFile), written in the background
+        binary = self.project_path.endswith(BinaryProjectFile.EXTENSION)
+        if binary:
+            snapshot = self.scene.saveSceneBinary()
+        else:
+            snapshot = self.scene.saveScene()
+        writer = ProjectWriter(self.project_path, snapshot, binary, self.app_prefs["Compress"])
+        self.save_checkpoint = self.journal.getCheckpoint()
+
+        self.thread_save = SaveThread(writer)
+        self.thread_save.progressSignal.connect(self.save_progress.setValue)
+        self.thread_save.finished.connect(self.finishSave)
+        self.save_progress.setValue(0)
+        self.save_progress.show()
+        self.status_bar.showMessage("Saving project...")
+        self.thread_save.start()
+
+    def finishSave(self):
+        """Ends the writing of the project, warning the user if it has failed"""
+        if self.thread_save is None:
+            return
+
+        error = self.thread_save.error
+        file_path = self.thread_save.writer.file_path
+        self.thread_save = None
+        self.save_progress.hide()
+
+        if error is None:
+            # Saved changes are dropped from the journal
+            self.journal.compact(self.save_checkpoint, file_path)
+            self.writeJournalProject(file_path)
+            self.status_bar.showMessage("Project saved", 3000)
+            return
+
+        # The scene is not saved (the previous file is kept)
+        self.scene.scene_modified = True
+        self.status_bar.clearMessage()
+        dialog = QMessageBox(self)
+        dialog.setIcon(QMessageBox.Warning)
+        dialog.setTextFormat(Qt.RichText)
+        dialog.setText("<b>Project not saved</b>")
+        dialog.setInformativeText("The project could not be written to " + file_path + ": " + str(error))
+        dialog.exec()
+
+    def waitSave(self):
+        """Waits until the project being saved in the background (if any) is written"""
+        if self.thread_save is not None:
+            self.thread_save.wait()
+            self.finishSave()
+
+    def startJournal(self, project_path, append=False):
+        """Starts journaling the changes of the project (see ChangeJournal)
+
+        :param project_path: path of the project file (None for new projects)
+        :type project_path: str
+        :param append: changes already journaled are kept
+        :type append: bool
+        """
+        try:
+            self.journal.start(project_path, append)
+        except OSError:
+            self.status_bar.showMessage("Changes journal not available", 3000)
+            return
+
+        self.writeJournalProject(project_path)
+
+    @staticmethod
+    def writeJournalProject(project_path, running=True):
+        """
+        Keeps the project being journaled in the user preferences, so its
+        changes can be recovered if the application does not close properly
+
+        :param project_path: path of the project file (None for new projects)
+        :type project_path: str
+        :param running: a journal is running
+        :type running: bool
+        """
+        settings = QSettings('MiniGUI', 'settings')
+        if running:
+            settings.setValue("JournalProject", project_path or "")
+        else:
+            settings.remove("JournalProject")
+
+    def recoveryDialog(self, project_path=None):
+        """Asks the user whether the changes lost in a previous session are recovered
+
+        :param project_path: path of the project file (None for new projects)
+        :type project_path: str
+        :rtype bool
+        """
+        dialog = QMessageBox(self)
+        dialog.setIcon(QMessageBox.Warning)
+        dialog.setTextFormat(Qt.RichText)
+        dialog.setText("<b>Unsaved changes found</b>")
+        if project_path:
+            dialog.setInformativeText("MiniGUI was not closed properly while editing " +
+                                      project_path.split("/")[-1] + ". Do you want to recover its changes?")
+        else:
+            dialog.setInformativeText("MiniGUI was not closed properly while editing a new project. "
+                                      "Do you want to recover its changes?")
+        dialog.setStandardButtons(QMessageBox.Yes | QMessageBox.Discard)
+        dialog.setDefaultButton(QMessageBox.Yes)
+
+        return dialog.exec() == QMessageBox.Yes
+
+    def checkRecovery(self):
+        """Checks at start-up if the changes of a previous session were lost, offering their recovery"""
+        # Changes of this session are already being journaled
+        if self.journal.file is not None:
+            return
+
+        settings = QSettings('MiniGUI', 'settings')
+        project_path = settings.value("JournalProject") or None
+        journal_path = ChangeJournal.getJournalPath(project_path)
+
+        if settings.contains("JournalProject") and ChangeJournal.hasChanges(journal_path):
+            if self.recoveryDialog(project_path):
+                self.recoverProject(project_path)
+                return
+            os.unlink(journal_path)
+
+        if self.project_items is None:
+            self.startJournal(self.project_path)
+
+    def recoverProject(self, project_path=None):
+        """
+        Recovers the unsaved changes of a project: its last saved version is loaded
+        and the journaled changes are replayed onto it. The project stays modified
+
+        :param project_path: path of the project file (None for new projects)
+        :type project_path: str
+        """
+        journal_path = ChangeJournal.getJournalPath(project_path)
+        try:
+            entries = ChangeJournal.readJournal(journal_path)[1]
+        except (OSError, ValueError):
+            entries = []
+
+        # Last saved version of the project (if any)
+        self.clearProject()
+        self.journal.stop()
+        model = self.scene.model
+        try:
+            if project_path is not None and project_path.endswith(BinaryProjectFile.EXTENSION):
+                BinaryProjectFile.readModel(model, project_path)
+            elif project_path is not None:
+                reader = ProjectReader.openFile(project_path)
+                try:
+                    model.loadData(json.load(reader.file))
+                finally:
+                    reader.close()
+        except (json.JSONDecodeError, UnicodeDecodeError, EOFError, OSError, KeyError, IndexError, TypeError,
+                ValueError, struct.error):
+            model.clear()
+            project_path = None
+
+        # Journaled changes are replayed (and journaled again, as they are still unsaved)
+        self.startJournal(project_path)
+        applied = ChangeJournal.replay(model, entries)
+        self.scene.addSceneRecords(list(model.nodes.values()), list(model.links.values()))
+        self.scene.undo_stack.clear()
+        self.canvas.fitScene(shrink_only=True)
+        self.scene.scene_modified = True
+
+        if project_path is not None:
+            self.project_path = project_path
+            self.setWindowTitle("MiniGUI - " + project_path.split("/")[-1])
+        self.status_bar.showMessage("Recovered " + str(applied) + " of " + str(len(entries)) + " changes", 5000)
+
+    def generateProject(self):
+        """Creates a new project with a generated topology"""
+        dialog = GenerateDialog()
+        if not dialog.exec():
+            return
+        shape, params, seed, stp_protocol = dialog.getParameters()
+
+        # Topology size checking: too big ones are rejected, large ones confirmed
+        node_count, link_count = TopologyGenerator.getSize(shape, **params)
+        size_text = str(node_count) + " nodes and " + str(link_count) + " links"
+        if node_count + link_count > TopologyGenerator.MAX_ELEMENTS:
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Topology too big</b>")
+            dialog.setInformativeText("The topology would have " + size_text + ", more than the " +
+                                      str(TopologyGenerator.MAX_ELEMENTS) + " elements a scene can hold")
+            dialog.exec()
+            return
+        elif node_count + link_count > TopologyGenerator.LARGE_ELEMENTS:
+            dialog = QMessageBox(self)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Large topology</b>")
+            dialog.setInformativeText("The topology will have " + size_text + ". Generating and drawing it may "
+                                      "take a while and a lot of memory. Do you want to continue?")
+            dialog.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+            dialog.setDefaultButton(QMessageBox.Cancel)
+            dialog.setIcon(QMessageBox.Warning)
+            if dialog.exec() != QMessageBox.Ok:
+                return
+
+        # Modified scene checking
+        if self.scene.scene_modified:
+            result = self.modifiedSceneDialog()
+            if result == QMessageBox.Save:
+                self.saveProject()
+            elif result == QMessageBox.Cancel:
+                return
+
+        self.clearProject()
+        start = time.time()
+        self.setCursor(Qt.WaitCursor)
+        try:
+            generator = TopologyGenerator(seed)
+            new_nodes, new_links = generator.build(self.scene.model, shape, stp_protocol, **params)
+            TopologyGenerator.placeNodes(self.scene.graph, layered=shape in TopologyGenerator.LAYERED_SHAPES)
+        except ValueError as error:
+            self.unsetCursor()
+            self.scene.model.clear()
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Topology not valid</b>")
+            dialog.setInformativeText(str(error))
+            dialog.exec()
+            return
+
+        self.scene.addSceneRecords(new_nodes, new_links)
+        self.scene.undo_stack.clear()
+        self.canvas.fitScene(shrink_only=True)
+        self.scene.scene_modified = True
+        self.unsetCursor()
+        self.status_bar.showMessage("Generated " + str(len(new_nodes)) + " nodes and " + str(len(new_links)) +
+                                    " links in " + format(time.time() - start, ".2f") + " s", 5000)
+
+    def undoProject(self):
+        """Undoes the last change of the scene (not available while Mininet is running)"""
+        if self.scene.net_running or self.project_items is not None:
+            return
+
+        self.stopLayout()
+        if not self.scene.undo_stack.canUndo():
+            self.status_bar.showMessage("Nothing to undo", 3000)
+            return
+        self.scene.undoScene()
+
+    def redoProject(self):
+        """Redoes the last undone change of the scene (not available while Mininet is running)"""
+        if self.scene.net_running or self.project_items is not None:
+            return
+
+        self.stopLayout()
+        if not self.scene.undo_stack.canRedo():
+            self.status_bar.showMessage("Nothing to redo", 3000)
+            return
+        self.scene.redoScene()
+
+    def readdressProject(self):
+        """Assigns new IP addresses to all the scene's interfaces following the address plan"""
+        if not self.scene.scene_nodes:
+            return
+
+        dialog = QMessageBox(self)
+        dialog.setTextFormat(Qt.RichText)
+        dialog.setText("<b>Re-address scene</b>")
+        dialog.setInformativeText("All the IP addresses of the scene will be replaced. Do you want to continue?")
+        dialog.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+        dialog.setDefaultButton(QMessageBox.Cancel)
+        dialog.setIcon(QMessageBox.Warning)
+
+        if dialog.exec() != QMessageBox.Ok:
+            return
+
+        try:
+            self.scene.readdressScene()
+        except ValueError as error:
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Address plan too small</b>")
+            dialog.setInformativeText(str(error) + ". Change the address plan and try again.")
+            dialog.exec()
+
+    def updateStpMenu(self):
+        """Checks the spanning tree protocol option of the current scene"""
+        for stp_action in self.stp_actions.actions():
+            stp_action.setChecked(stp_action.text() == self.scene.model.stp_protocol)
+
+    def changeStpProtocol(self, protocol, node=None):
+        """Changes the spanning tree protocol of the scene or of a single switch
+
+        :param protocol: new protocol (see STP_PROTOCOLS), None to follow the scene's one
+        :type protocol: str
+        :param node: switch whose protocol is changed (optional, the whole scene if None)
+        :type node: NodeGUI
+        """
+        node_id = node.record.node_id if node is not None else None
+        self.scene.model.setStpProtocol(protocol, node_id)
+        self.scene.scene_modified = True
+
+    def arrangeProject(self, layered=False):
+        """Arranges the scene's nodes with a force-directed or a layered layout, run in the background
+
+        :param layered: nodes are arranged in layers from the core nodes (force-directed layout if False)
+        :type layered: bool
+        """
+        if not self.scene.scene_nodes or self.thread_layout is not None:
+            return
+
+        # Layout arrays, with the node rows of the graph engine
+        graph = self.scene.graph
+        graph.refresh()
+        nodes = self.scene.model.nodes
+        node_ids = graph.node_ids.tolist()
+        positions = np.array([(nodes[node_id].x, nodes[node_id].y) for node_id in node_ids], dtype=float)
+        pinned = np.array([nodes[node_id].pinned for node_id in node_ids], dtype=bool)
+        edges = np.column_stack((graph.edge_src, graph.edge_dst))
+
+        if layered:
+            layout = LayeredLayout(edges, graph.getLayers(), positions, pinned)
+        else:
+            layout = ForceLayout(edges, positions, pinned, seed_positions=graph.getPivotPositions())
+        self.startLayout(layout, node_ids)
+
+    def startLayout(self, layout, node_ids):
+        """Runs a layout in the background, moving the scene's nodes as it progresses
+
+        :param layout: layout to be run
+        :type layout: ForceLayout or LayeredLayout
+        :param node_ids: ID of the node of each layout row
+        :type node_ids: list
+        """
+        # All the moves of the layout are undone at once
+        self.scene.undo_stack.beginEntry()
+        self.thread_layout = LayoutThread(layout)
+        self.thread_layout.positionsSignal.connect(lambda positions: self.updateLayoutPositions(node_ids, positions))
+        self.thread_layout.finished.connect(self.finishLayout)
+        self.status_bar.showMessage("Arranging scene...")
+        self.thread_layout.start()
+
+    def updateLayoutPositions(self, node_ids, positions):
+        """Moves the scene's nodes to the positions sent by the layout thread
+
+        :param node_ids: ID of the node of each layout row
+        :type node_ids: list
+        :param positions: node positions, one row (x, y) per node
+        :type positions: numpy.ndarray
+        """
+        if self.thread_layout is None:
+            return
+
+        # Drawing the scene must not take more than a fifth of the layout time
+        start = time.time()
+        self.scene.setNodePositions(node_ids, positions)
+        self.thread_layout.frame_time = max(self.thread_layout.min_frame_time, 4 * (time.time() - start))
+        self.thread_layout.frame_pending = False
+
+    def stopLayout(self):
+        """Stops the layout in progress (if any)"""
+        if self.thread_layout is None:
+            return
+
+        self.thread_layout.layout_active = False
+        self.thread_layout.wait()
+        self.thread_layout = None
+        self.scene.undo_stack.endEntry()
+        self.status_bar.clearMessage()
+
+    def finishLayout(self):
+        """It is called when the layout thread finishes"""
+        if self.thread_layout is None:
+            return
+
+        # Last positions have already been applied (signals are queued in order)
+        self.thread_layout = None
+        self.scene.undo_stack.endEntry()
+        self.status_bar.showMessage("Scene arranged", 3000)
+
+    def validateProject(self, starting=False):
+        """Checks the topology and displays the issues found (if any)
+
+        :param starting: the check is done before starting Mininet
+        :type starting: bool
+        :returns if the network can be started
+        :rtype bool
+        """
+        validator = TopologyValidator(self.scene.model, self.scene.graph)
+        issues = validator.validate(basic_mode=self.app_prefs["Mode"] == "basic")
+        if starting and not issues:
+            return True
+
+        dialog = ValidationDialog(issues, self.scene, starting)
+        return bool(dialog.exec())
 
     # Mininet-related functions
 
@@ -2394,14 +8599,13 @@ class MiniGUI(QMainWindow):
 
     def buildNodes(self):
         """Builds the Mininet node objects and adds them to the network"""
-        for node in self.scene.scene_nodes:
+        for node in self.scene.model.nodes.values():
             # Extraction of node's information
             node_addr = None
-            node_name = self.scene.scene_nodes[node].node_name
-            node_type = self.scene.scene_nodes[node].node_type
-            node_properties = self.scene.scene_nodes[node].properties
-            if node_type != "Switch":
-                node_addr = str(node_properties['IP']) + "/" + str(node_properties['PrefixLen'])
+            node_name = node.name
+            node_type = node.node_type
+            if node_type != "Switch" and node.ip != "":
+                node_addr = node.getDefaultAddress()
 
             # Addition of nodes to the network
             if node_type == "Host":
@@ -2417,18 +8621,18 @@ class MiniGUI(QMainWindow):
 
     def buildLinks(self):
         """Builds the Mininet link objects between nodes"""
-        for link in self.scene.scene_links:
+        model = self.scene.model
+        for link in model.links.values():
             # Extraction of link's information
-            nodes_linked = self.scene.scene_links[link].nodes
-            if self.scene.scene_links[link].isLinkUp():
+            if link.is_up:
                 link_status = "up"
             else:
                 link_status = "down"
 
-            # Retrieval of scene nodes to build link
-            link_name = self.scene.scene_links[link].link_name
-            node_1 = self.scene.scene_nodes[nodes_linked[0]]
-            node_2 = self.scene.scene_nodes[nodes_linked[1]]
+            # Retrieval of model nodes to build link
+            node_1 = model.nodes[link.node_ids[0]]
+            node_2 = model.nodes[link.node_ids[1]]
+            nodes_linked = [node_1.name, node_2.name]
 
             # Initialization
             two_switches_linked = False
@@ -2440,25 +8644,20 @@ class MiniGUI(QMainWindow):
             elif node_1.node_type != "Switch" and node_2.node_type == "Switch":
                 one_switch_linked = True
             elif node_1.node_type == "Switch" and node_2.node_type != "Switch":
-                node_1 = self.scene.scene_nodes[nodes_linked[1]]
-                node_2 = self.scene.scene_nodes[nodes_linked[0]]
+                node_1, node_2 = node_2, node_1
                 one_switch_linked = True
 
             # 1st node information
-            node_1_intfs = node_1.properties["eth_intfs"]
-            node_1_links = node_1.links
-            node_1_link_intf = node_1_links[link_name]
-            node_1_link_ip = node_1_intfs[node_1_link_intf]
+            node_1_link_intf = node_1.link_intfs[link.link_id]
+            node_1_link_ip = node_1.intfs[node_1_link_intf].address
 
             # 2nd node information
-            node_2_intfs = node_2.properties["eth_intfs"]
-            node_2_links = node_2.links
-            node_2_link_intf = node_2_links[link_name]
-            node_2_link_ip = node_2_intfs[node_2_link_intf]
+            node_2_link_intf = node_2.link_intfs[link.link_id]
+            node_2_link_ip = node_2.intfs[node_2_link_intf].address
 
             # Mininet node object extraction
-            net_node_1 = self.net.nameToNode[node_1.node_name]
-            net_node_2 = self.net.nameToNode[node_2.node_name]
+            net_node_1 = self.net.nameToNode[node_1.name]
+            net_node_2 = self.net.nameToNode[node_2.name]
 
             # Creation of link depending on case
             if two_switches_linked:
@@ -2484,6 +8683,10 @@ class MiniGUI(QMainWindow):
         self.net.build()
         self.net.start()
 
+        # Spanning tree protocols are enabled once the switches (their OVS bridges) are started, as Mininet only
+        # sets STP when creating standalone switches, and before basic mode's flows make them forward traffic
+        self.startNetSpanningTree()
+
         # Main window and scene modification
         self.updateNetIndicators()
         self.disableMenuAndToolBar()
@@ -2496,9 +8699,9 @@ class MiniGUI(QMainWindow):
 
         # If basic mode has been selected, commands must be executed to inicialice Mininet correctly
         if self.app_prefs["Mode"] == "basic":
-            for node in self.scene.scene_nodes:
-                if self.scene.scene_nodes[node].node_type == "Switch":
-                    switch_name = self.scene.scene_nodes[node].node_name
+            for node in self.scene.model.nodes.values():
+                if node.node_type == "Switch":
+                    switch_name = node.name
                     subprocess.run(['ovs-ofctl', 'add-flow', str(switch_name), 'action=normal'])
 
         # CLI creation
@@ -2522,14 +8725,18 @@ class MiniGUI(QMainWindow):
         self.updateNetIndicators()
         self.enableMenuAndToolBar()
         self.scene.net_running = False
+        for link in self.scene.scene_links.values():
+            link.setLinkBlocked(False)
 
     def accessNet(self):
         """Starts/stops Mininet execution and updates Mininet-related button accordingly"""
         # Mininet status checking
         if self.net_button.text() == "Start":
-            if not self.scene.items():
+            if not self.scene.model.nodes:
                 self.emptySceneDialog()
                 return
+            elif not self.validateProject(starting=True):
+                return
             else:
                 self.startNet()
                 self.net_button.setText("Stop")
@@ -2540,6 +8747,19 @@ class MiniGUI(QMainWindow):
         # Mininet-related button update
         self.updateNetButtonStyle()
 
+    def startNetSpanningTree(self):
+        """Enables the spanning tree protocol of every switch running one, with a single OVS command"""
+        command = ['ovs-vsctl']
+        for node in self.scene.model.nodes.values():
+            protocol = self.scene.model.getStpProtocol(node.node_id)
+            if protocol != "None":
+                if len(command) > 1:
+                    command.append('--')
+                command.extend(['set', 'bridge', str(node.name), str(protocol).lower() + '_enable=true'])
+
+        if len(command) > 1:
+            subprocess.run(command)
+
     def updateNetNodeInterfaces(self, node):
         """Updates Mininet node's interface information when simulation is running
 
@@ -2553,9 +8773,9 @@ class MiniGUI(QMainWindow):
         net_node = self.net.nameToNode[node.node_name]
 
         # IP address update
-        for intf in node.properties["eth_intfs"]:
-            intf_addr = node.properties["eth_intfs"][intf]
-            net_node.cmd("ifconfig " + str(intf) + " " + str(intf_addr))
+        for intf in node.record.intfs.values():
+            intf_addr = intf.address
+            net_node.cmd("ifconfig " + str(intf.name) + " " + str(intf_addr))
 
     def updateNetNodeRoutingTable(self, node, command):
         """Updates Mininet node's routing table sending a command and gets its output.
@@ -2660,6 +8880,57 @@ class MiniGUI(QMainWindow):
 
         return output
 
+    def getNetBlockedPorts(self):
+        """Returns the switch ports blocked by spanning tree protocols, reading all of them at once from OVS
+
+        :returns names of blocked ports (None if OVS command returned error)
+        :rtype set
+        """
+        proc = subprocess.Popen(['ovs-vsctl', '--format=json', '--columns=name,status,rstp_status', 'list', 'Port'],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True)
+        (result, err) = proc.communicate()
+
+        # Output checking
+        if len(err) > 0 or not result:
+            return None
+
+        # Output parsing: STP state is in "status" column and RSTP state in "rstp_status" one,
+        # both of them with OVS map format (["map", [[key, value], ...]])
+        blocked_ports = set()
+        try:
+            for port_name, status, rstp_status in json.loads(result)["data"]:
+                port_states = dict(status[1])
+                port_states.update(rstp_status[1])
+                if (str(port_states.get("stp_state", "")).lower() == "blocking" or
+                        str(port_states.get("rstp_port_state", "")).lower() == "discarding"):
+                    blocked_ports.add(port_name)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        return blocked_ports
+
+    def updateNetBlockedLinks(self):
+        """Draws dashed the scene links with a port blocked by spanning tree protocols"""
+        model = self.scene.model
+        if model.stp_protocol == "None" and all(node.stp_protocol in (None, "None") for node in model.nodes.values()):
+            return
+
+        blocked_ports = self.getNetBlockedPorts()
+        if blocked_ports is None:
+            return
+
+        # Blocked links from the interfaces of switches
+        blocked_links = set()
+        for node in model.nodes.values():
+            if node.node_type == "Switch":
+                for intf in node.intfs.values():
+                    if intf.link_id is not None and intf.name in blocked_ports:
+                        blocked_links.add(intf.link_id)
+
+        for link_id, link in self.scene.scene_links.items():
+            link.setLinkBlocked(link_id in blocked_links)
+
     def updateNetLinkStatus(self, link):
         """Updates Mininet link's status information when simulation is running
 
@@ -2676,7 +8947,7 @@ class MiniGUI(QMainWindow):
             link_status = "down"
 
         # Net link state update
-        link_nodes = link.nodes
+        link_nodes = [self.scene.model.nodes[node_id].name for node_id in link.record.node_ids]
         self.net.configLinkStatus(link_nodes[0], link_nodes[1], link_status)
 
     def updateSceneInfo(self):
@@ -2684,12 +8955,13 @@ class MiniGUI(QMainWindow):
         if self.net is None:
             return
 
-        for node in self.scene.scene_nodes:
-            if self.scene.scene_nodes[node].node_type != "Switch":
+        model = self.scene.model
+        for node in self.scene.scene_nodes.values():
+            if node.node_type != "Switch":
                 # Initialization
                 first_intf = True
-                node_intfs = self.scene.scene_nodes[node].properties["eth_intfs"]
-                net_node = self.net.nameToNode[self.scene.scene_nodes[node].node_name]
+                node_intfs = node.record.intfs
+                net_node = self.net.nameToNode[node.node_name]
 
                 # Interface information (IP address, netmask)
                 for intf in node_intfs:
@@ -2700,30 +8972,32 @@ class MiniGUI(QMainWindow):
                     else:
                         new_ip = output.split("inet ")[1].split("/")[0]
                         new_mask = output.split(" brd")[1].split("/")[-1]
-                        self.scene.scene_nodes[node].properties["eth_intfs"][intf] = (str(new_ip) + "/" + str(new_mask))
+                        model.setIntfAddress(node.record.node_id, intf, str(new_ip) + "/" + str(new_mask))
                         if first_intf:
-                            self.scene.scene_nodes[node].properties["IP"] = new_ip
-                            self.scene.scene_nodes[node].properties["PrefixLen"] = new_mask
+                            model.setNodeAddress(node.record.node_id, new_ip, new_mask)
                             first_intf = False
 
                 # Scene modification
-                self.scene.scene_nodes[node].changeSceneIpTags()
-                self.scene.updateSceneLinks(self.scene.scene_nodes[node])
+                node.changeSceneIpTags()
+                self.scene.updateSceneLinks(node)
 
         # Link state (up or down)
-        for link in self.scene.scene_links:
-            node_name = self.scene.scene_links[link].nodes[0]
-            intf_name = self.scene.scene_nodes[node_name].links[link]
-            net_node = self.net.nameToNode[node_name]
+        for link in self.scene.scene_links.values():
+            node = model.nodes[link.record.node_ids[0]]
+            intf_name = node.link_intfs[link.record.link_id]
+            net_node = self.net.nameToNode[node.name]
             try:
                 output = str(net_node.cmdPrint("ethtool " + str(intf_name)))
             except AssertionError:
                 pass
             else:
                 if output.split("Link detected: ")[1].split("\r\n")[0] == "yes":
-                    self.scene.scene_links[link].setLinkState(is_up=True)
+                    link.setLinkState(is_up=True)
                 else:
-                    self.scene.scene_links[link].setLinkState(is_up=False)
+                    link.setLinkState(is_up=False)
+
+        # Ports blocked by spanning tree protocols
+        self.updateNetBlockedLinks()
 
         self.scene.scene_modified = True
 
@@ -2751,30 +9025,31 @@ class MiniGUI(QMainWindow):
         :param event: application's event
         :type event: QEvent
         """
+        # Projects still being loaded have no changes to save
+        if self.project_items is not None:
+            self.stopLoading()
+            self.scene.scene_modified = False
+
         if self.scene.scene_modified:
             result = self.modifiedSceneDialog()
             if result == QMessageBox.Save:
                 self.saveProject()
+
+                # If the save fails (or "Save as" is cancelled), the application and its journal are kept
+                self.waitSave()
+                if self.scene.scene_modified:
+                    event.ignore()
             elif result == QMessageBox.Cancel:
                 event.ignore()
 
-        self.writePreferences()
-
-    def showEvent(self, event):
-        """It is called when the main window (application) is shown
-
-        :param event: application's event
-        :type event: QEvent
-        """
-        self.canvas.setSceneRect(QRectF(self.canvas.viewport().rect()))
-
-    def resizeEvent(self, event):
-        """It is called when the main window (application) is resized
+        if event.isAccepted():
+            self.stopLayout()
+            self.waitSave()
 
-        :param event: application's event
-        :type event: QEvent
-        """
-        self.canvas.setSceneRect(QRectF(self.canvas.viewport().rect()))
+            # Changes are saved or discarded, there is nothing to recover
+            self.journal.stop()
+            self.writeJournalProject(None, running=False)
+        self.writePreferences()
 
     def changeEvent(self, event):
         """It is called when an external window parameter is changed (like palette)
@@ -2796,6 +9071,10 @@ class MiniGUI(QMainWindow):
         settings.setValue("AppTheme", str(APP_THEME))
         settings.setValue("AppMode", str(self.app_prefs["Mode"]))
         settings.setValue("AppCLI", str(self.app_prefs["CLI"]))
+        settings.setValue("AppCompress", str(self.app_prefs["Compress"]))
+        settings.setValue("AppLinkLayer", str(self.app_prefs["LinkLayer"]))
+        settings.setValue("AppViewport", str(self.app_prefs["Viewport"]))
+        settings.setValue("AddressPlan", json.dumps(self.app_prefs["AddressPlan"]))
         if self.app_prefs["LastProjectPath"]:
             settings.setValue("ProjectPath", str(self.app_prefs["LastProjectPath"]))
 
@@ -2822,6 +9101,73 @@ class MiniGUI(QMainWindow):
                 self.app_prefs["CLI"] = False
             else:
                 self.app_prefs["CLI"] = True
+        elif preference == "compress":
+            self.app_prefs["Compress"] = not self.app_prefs["Compress"]
+        elif preference == "link layer":
+            self.app_prefs["LinkLayer"] = not self.app_prefs["LinkLayer"]
+            self.scene.setLinkLayer(self.app_prefs["LinkLayer"])
+
+    def changeViewport(self, viewport):
+        """
+        Changes the viewport of the canvas (see CANVAS_VIEWPORTS), keeping the raster one if
+        OpenGL is not available. Mesa's software rasterizer is chosen through the environment,
+        so it only applies if OpenGL has not been loaded yet (it is chosen at start up otherwise)
+
+        :param viewport: new viewport
+        :type viewport: str
+        """
+        if viewport == "OpenGL (software)":
+            os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+
+        if viewport != "Raster" and not CanvasGUI.checkOpenGL():
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>OpenGL not available</b>")
+            dialog.setInformativeText("The scene will be drawn with the raster viewport. Without a GPU, OpenGL "
+                                      "needs Mesa's software rasterizer (llvmpipe) to be installed.")
+            dialog.exec()
+            viewport = "Raster"
+
+        self.app_prefs["Viewport"] = viewport
+        self.canvas.setOpenGL(viewport != "Raster")
+        for viewport_action in self.viewport_actions.actions():
+            viewport_action.setChecked(viewport_action.text() == viewport)
+
+    def changeAddressPlan(self):
+        """Lets the user change the address plan used to allocate IP addresses"""
+        dialog = AddressPlanDialog(self.app_prefs["AddressPlan"])
+        if not dialog.exec():
+            return
+
+        # New plan retrieval and checking
+        new_plan = {}
+        try:
+            for kind in ["LAN", "Link"]:
+                pool = ipaddress.IPv4Network(dialog.results[kind + "Pool"].text().strip())
+                prefix_len = dialog.results[kind + "Prefix"].value()
+                if prefix_len < pool.prefixlen:
+                    raise ValueError
+                new_plan[kind + "Pool"] = str(pool)
+                new_plan[kind + "Prefix"] = prefix_len
+
+            new_plan["DefaultPrefix"] = dialog.results["DefaultPrefix"].value()
+            if new_plan["DefaultPrefix"] < ipaddress.IPv4Network(new_plan["LANPool"]).prefixlen:
+                raise ValueError
+        except ValueError:
+            dialog = QMessageBox(self)
+            dialog.setIcon(QMessageBox.Warning)
+            dialog.setTextFormat(Qt.RichText)
+            dialog.setText("<b>Address plan not valid</b>")
+            dialog.setInformativeText("Pools must be written as network/prefix (e.g. 10.0.0.0/8) and "
+                                      "subnet prefixes cannot be shorter than their pool's prefix")
+            dialog.exec()
+            return
+
+        # Allocator update, keeping the addresses already in use
+        self.app_prefs["AddressPlan"] = new_plan
+        self.scene.model.ip_allocator.setPlan(new_plan)
+        self.scene.model.reserveAddresses()
 
     # Information function
 
@@ -2889,6 +9235,64 @@ def imagesMiniGUI():
         }
 
 
+def pixmapMiniGUI(node_type, width, height, mode=None):
+    """
+    Returns the image of a node type (the same for both themes), scaled to a given size
+    and tinted according to the selected tool (blue to select, red to delete), or a
+    simple shape of the type's color (far zoom). Images are built only the first time
+    and shared afterwards by all the nodes
+
+    :param node_type: node type (Host, Switch or Router)
+    :type node_type: str
+    :param width: maximum width of the image
+    :type width: int
+    :param height: maximum height of the image
+    :type height: int
+    :param mode: tint of the image: Select, Delete, Shape or None (not tinted)
+    :type mode: str
+    :returns: scaled image (shared, it must not be modified)
+    :rtype: QPixmap
+    """
+    key = (node_type, width, height, mode)
+    pixmap = SCALED_PIXMAPS.get(key)
+    if pixmap is not None:
+        return pixmap
+
+    if mode is None:
+        pixmap = QPixmap(imagesMiniGUI()[node_type]).scaled(width, height, Qt.KeepAspectRatio)
+    elif mode == "Shape":
+        # Filled circle, with the size of the image
+        pixmap = QPixmap(pixmapMiniGUI(node_type, width, height).size())
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(NODE_SHAPE_COLORS[node_type]))
+        side = min(pixmap.width(), pixmap.height())
+        painter.drawEllipse(QRectF((pixmap.width() - side) / 2, (pixmap.height() - side) / 2, side, side))
+        painter.end()
+    else:
+        # Tint: a mask of the image filled with the color, overlaid on the image
+        painter = QPainter()
+        image = pixmapMiniGUI(node_type, width, height).toImage()
+        mask = QImage(image)
+
+        painter.begin(mask)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+        painter.fillRect(mask.rect(), Qt.red if mode == "Delete" else Qt.blue)
+        painter.end()
+
+        painter.begin(image)
+        painter.setCompositionMode(QPainter.CompositionMode_Overlay)
+        painter.drawImage(0, 0, mask)
+        painter.end()
+
+        pixmap = QPixmap.fromImage(image)
+
+    SCALED_PIXMAPS[key] = pixmap
+    return pixmap
+
+
 def changeAppPalette():
     """Changes the application palette according to the selected theme"""
     if APP_THEME == "light":
@@ -2925,6 +9329,10 @@ if __name__ == '__main__':
     # Creation of environmental variable
     os.environ["XDG_RUNTIME_DIR"] = "/tmp/runtime-root"
 
+    # Mesa's software rasterizer must be chosen before OpenGL is loaded
+    if QSettings('MiniGUI', 'settings').value('AppViewport') == "OpenGL (software)":
+        os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+
     # Application initialization
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+"""
+Canvas benchmark for MiniGUI
+
+Builds a generated topology (see TopologyGenerator) in the main window and
+measures how long the scene takes to be built and painted: item and tag
+creation, whole-scene renders, viewport repaints at several zoom levels and
+node drag frames. By default every canvas viewport (raster, OpenGL and Mesa's
+software OpenGL) is measured, each one in its own process; the ones that
+cannot be created here are reported as unavailable. A single viewport, the
+update mode (of every viewport, OpenGL ones included) and optimization flags
+and the link layer can be chosen, and MiniGUI can be imported from another
+checkout (as one from before a change), so runs can be compared:
+
+    python3 benchmarks/canvas_benchmark.py --switches 4000
+    python3 benchmarks/canvas_benchmark.py --switches 4000 --viewport "OpenGL (software)"
+    python3 benchmarks/canvas_benchmark.py --switches 4000 --viewport OpenGL --update-mode minimal
+    python3 benchmarks/canvas_benchmark.py --switches 4000 --link-layer
+    python3 benchmarks/canvas_benchmark.py --switches 4000 --default-flags --update-mode full
+    python3 benchmarks/canvas_benchmark.py --switches 4000 --source /tmp/MiniGUI-before
+
+It does not need superuser privileges (Mininet is not started). The user's
+preferences and journal are not touched: settings and data paths are moved
+to a temporary directory. Without a display, use QT_QPA_PLATFORM=offscreen
+(OpenGL viewports usually need a real display, though).
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# MiniGUI is a single module at the root of the repository
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Canvas viewports (the same as MiniGUI's CANVAS_VIEWPORTS)
+VIEWPORTS = ("Raster", "OpenGL", "OpenGL (software)")
+
+from PyQt5.QtWidgets import QApplication, QGraphicsView
+from PyQt5.QtCore import QPointF, QRectF, QSettings, QStandardPaths
+from PyQt5.QtGui import QImage, QPainter
+
+
+def getMemory():
+    """Returns the resident memory of the process, in MB (0 if unknown)
+
+    :rtype float
+    """
+    try:
+        with open("/proc/self/statm") as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return 0.0
+
+
+def measure(function, frames):
+    """Returns the mean time of a function, in milliseconds (after a first warm-up call)
+
+    :param function: function to be measured
+    :type function: callable
+    :param frames: number of measured calls
+    :type frames: int
+    :rtype float
+    """
+    function()
+    start = time.perf_counter()
+    for _ in range(frames):
+        function()
+
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def parseArguments():
+    """Returns the command line arguments
+
+    :rtype argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Measures how fast MiniGUI builds and paints a generated scene")
+    parser.add_argument("--shape", default="Barabási–Albert", help="topology shape (see TopologyGenerator.SHAPES)")
+    parser.add_argument("--switches", type=int, default=4000, help="number of switches")
+    parser.add_argument("--hosts", type=int, default=1, help="hosts per switch")
+    parser.add_argument("--links", type=int, default=2, help="links per new switch (Barabási–Albert)")
+    parser.add_argument("--seed", type=int, default=7, help="seed of random topologies")
+    parser.add_argument("--viewport", choices=("all",) + VIEWPORTS, default="all",
+                        help="canvas viewport (by default, all of them, one after another)")
+    parser.add_argument("--link-layer", action="store_true", help="links are drawn by the batched link layer")
+    parser.add_argument("--default-flags", action="store_true", help="the view keeps Qt's default optimization "
+                                                                     "flags")
+    parser.add_argument("--update-mode", choices=["minimal", "full"], help="viewport update mode, for OpenGL "
+                                                                           "viewports too (by default, the one "
+                                                                           "chosen for the viewport)")
+    parser.add_argument("--frames", type=int, default=10, help="frames measured per test")
+    parser.add_argument("--size", default="1600x1000", help="window size, as WIDTHxHEIGHT")
+    parser.add_argument("--source", default=REPOSITORY_PATH, help="directory of the MiniGUI.py to be measured")
+
+    return parser.parse_args()
+
+
+def measureViewports():
+    """Measures every viewport, running the benchmark again for each one in a new process
+
+    OpenGL is loaded once per process, and Mesa's software rasterizer must be chosen before that,
+    so viewports cannot share a process
+    """
+    for viewport in VIEWPORTS:
+        print("== %s ==" % viewport, flush=True)
+        subprocess.run([sys.executable, os.path.abspath(__file__)] + sys.argv[1:] + ["--viewport", viewport])
+        print(flush=True)
+
+
+def main():
+    arguments = parseArguments()
+    if arguments.viewport == "all":
+        measureViewports()
+        return
+
+    width, height = [int(value) for value in arguments.size.lower().split("x")]
+
+    # Mesa's software rasterizer must be chosen before OpenGL is loaded
+    if arguments.viewport == "OpenGL (software)":
+        os.environ["LIBGL_ALWAYS_SOFTWARE"] = "1"
+
+    # Preferences and journal of the user are left alone
+    temp_dir = tempfile.mkdtemp(prefix="minigui-benchmark-")
+    os.environ.setdefault("XDG_RUNTIME_DIR", temp_dir)
+    QStandardPaths.setTestModeEnabled(True)
+    QSettings.setPath(QSettings.NativeFormat, QSettings.UserScope, temp_dir)
+
+    # Images are loaded relative to the working directory
+    sys.path.insert(0, os.path.abspath(arguments.source))
+    os.chdir(arguments.source)
+    import MiniGUI
+    MiniGUI.app = QApplication(sys.argv[:1])
+    window = MiniGUI.MiniGUI()
+    scene = window.scene
+    canvas = window.canvas
+
+    if arguments.viewport != "Raster":
+        if not hasattr(canvas, "setOpenGL") or not MiniGUI.CanvasGUI.checkOpenGL():
+            print("Viewport: %s unavailable" % arguments.viewport)
+            window.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+        canvas.setOpenGL(True)
+    if arguments.link_layer:
+        if not hasattr(scene, "setLinkLayer"):
+            sys.exit("ERROR: this MiniGUI version has no link layer")
+        scene.setLinkLayer(True)
+    if arguments.default_flags:
+        canvas.setOptimizationFlags(QGraphicsView.OptimizationFlags())
+    if arguments.update_mode is not None:
+        canvas.setViewportUpdateMode(QGraphicsView.FullViewportUpdate if arguments.update_mode == "full"
+                                     else QGraphicsView.MinimalViewportUpdate)
+
+    # Generated topology, placed as in "Generate topology"
+    params = {"switches": arguments.switches, "hosts": arguments.hosts, "links": arguments.links}
+    params = {name: params[name] for name in MiniGUI.TopologyGenerator.SHAPES[arguments.shape] if name in params}
+    generator = MiniGUI.TopologyGenerator(arguments.seed)
+    start = time.perf_counter()
+    new_nodes, new_links = generator.build(scene.model, arguments.shape, **params)
+    MiniGUI.TopologyGenerator.placeNodes(scene.graph,
+                                         layered=arguments.shape in MiniGUI.TopologyGenerator.LAYERED_SHAPES)
+    print("Topology: %s, %d nodes and %d links, generated and placed in %.2f s" %
+          (arguments.shape, len(new_nodes), len(new_links), time.perf_counter() - start))
+
+    # Scene items and tags
+    gc.collect()
+    memory = getMemory()
+    start = time.perf_counter()
+    scene.addSceneRecords(new_nodes, new_links)
+    scene.buildAllPendingTags()
+    build_time = time.perf_counter() - start
+    gc.collect()
+    print("Items and tags: %d scene items built in %.2f s, %.0f MB" %
+          (len(scene.items()), build_time, getMemory() - memory))
+
+    window.resize(width, height)
+    window.show()
+    MiniGUI.app.processEvents()
+    print("Viewport: %s (%s), %s updates, %s flags, link layer %s" %
+          (arguments.viewport, type(canvas.viewport()).__name__,
+           "full" if canvas.viewportUpdateMode() == QGraphicsView.FullViewportUpdate else "minimal",
+           "default" if arguments.default_flags else "tuned", "on" if arguments.link_layer else "off"))
+
+    # Renders of the scene to an image (no viewport involved)
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    bounds = scene.itemsBoundingRect()
+    center = bounds.center()
+
+    def render(rect):
+        painter = QPainter(image)
+        scene.render(painter, QRectF(image.rect()), rect)
+        painter.end()
+
+    actual_rect = QRectF(center.x() - width / 2, center.y() - height / 2, width, height)
+    print("Render whole scene: %.1f ms" % measure(lambda: render(bounds), arguments.frames))
+    print("Render 1:1 area (%d items): %.1f ms" % (len(scene.items(actual_rect)),
+                                                   measure(lambda: render(actual_rect), arguments.frames)))
+
+    # Viewport repaints at several zoom levels
+    def repaint():
+        canvas.viewport().repaint()
+        MiniGUI.app.processEvents()
+
+    # Level of detail follows the zoom (if the checkout has it)
+    def updateDetailLevel():
+        if hasattr(canvas, "updateDetailLevel"):
+            canvas.updateDetailLevel()
+
+    fit_zoom = min(canvas.viewport().width() / max(bounds.width(), 1),
+                   canvas.viewport().height() / max(bounds.height(), 1))
+    for zoom in sorted({fit_zoom, getattr(canvas, "DETAILS_ZOOM", 0.5), 1.0}):
+        canvas.resetTransform()
+        canvas.scale(zoom, zoom)
+        canvas.centerOn(center)
+        updateDetailLevel()
+        MiniGUI.app.processEvents()
+        print("Viewport repaint at zoom %.2f: %.1f ms" % (zoom, measure(repaint, arguments.frames)))
+
+    # Drag frames at actual size: the node moves, its links follow and the view is repainted
+    canvas.resetTransform()
+    updateDetailLevel()
+    nodes = list(scene.scene_nodes.values())
+    hub = max(nodes, key=lambda node: len(node.record.link_intfs))
+    leaf = min(nodes, key=lambda node: len(node.record.link_intfs))
+    for name, node in [("hub", hub), ("leaf", leaf)]:
+        canvas.centerOn(node)
+        MiniGUI.app.processEvents()
+
+        def drag():
+            node.setPos(node.pos() + QPointF(3, 0))
+            scene.flushSceneLinks()
+            MiniGUI.app.processEvents()
+
+        print("Drag frame, %s with %d links: %.1f ms" % (name, len(node.record.link_intfs),
+                                                        measure(drag, arguments.frames)))
+
+    scene.scene_modified = False
+    window.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+import ipaddress
+
+import pytest
+
+from MiniGUI import AddressAllocator, SubnetPool, TopologyGenerator, TopologyModel
+
+
+def buildLab(model):
+    """Router with two switched LANs of two hosts each, and a second router behind it"""
+    r0 = model.addNode("Router")
+    r1 = model.addNode("Router")
+    for _ in range(2):
+        switch = model.addNode("Switch")
+        model.addLink(r0.node_id, switch.node_id)
+        for _ in range(2):
+            host = model.addNode("Host")
+            model.addLink(host.node_id, switch.node_id)
+    model.addLink(r0.node_id, r1.node_id)
+    return model
+
+
+def getAddresses(model):
+    return {intf.name: intf.address for node in model.nodes.values() for intf in node.intfs.values()
+            if node.node_type != "Switch"}
+
+
+def testSubnetPoolReusesReleasedAddresses():
+    pool = SubnetPool(ipaddress.IPv4Network("192.168.1.0/30"))
+    first, second = pool.allocate(), pool.allocate()
+    assert pool.allocate() is None
+    pool.release(first)
+    assert pool.allocate() == first
+    assert second == first + 1
+
+
+def testSubnetPoolReserve():
+    pool = SubnetPool(ipaddress.IPv4Network("192.168.1.0/24"))
+    address = int(ipaddress.IPv4Address("192.168.1.1"))
+    assert pool.reserve(address)
+    assert not pool.reserve(address)
+    assert not pool.reserve(int(ipaddress.IPv4Address("192.168.1.255")))
+    assert pool.allocate() == address + 1
+
+
+def testAllocatorCarvesSubnets():
+    allocator = AddressAllocator({"LANPool": "10.0.0.0/22", "LANPrefix": 24})
+    networks = [allocator.allocateSubnet("LAN") for _ in range(4)]
+    assert [str(network) for network in networks] == ["10.0.0.0/24", "10.0.1.0/24", "10.0.2.0/24", "10.0.3.0/24"]
+    assert allocator.allocateSubnet("LAN") is None
+    allocator.releaseSubnet(networks[1])
+    assert allocator.allocateSubnet("LAN") == networks[1]
+
+
+def testAllocatorSkipsReservedAddresses():
+    allocator = AddressAllocator()
+    network = ipaddress.IPv4Network("10.0.0.0/24")
+    assert allocator.reserveAddress("10.0.0.1/24")
+    assert allocator.allocateAddress(network) == ("10.0.0.2", 24)
+    allocator.releaseAddress("10.0.0.1/24")
+    assert allocator.allocateAddress(network) == ("10.0.0.1", 24)
+
+    # Subnets with reserved addresses are not handed out again, not even as part of the default LAN
+    assert allocator.allocateAddress() == ("10.1.0.1", 16)
+
+
+def testAllocatorCarvesWideSubnets():
+    allocator = AddressAllocator({"LANPool": "10.0.0.0/22", "LANPrefix": 24})
+    first = allocator.allocateSubnet("LAN")
+    wide = allocator.allocateSubnet("LAN", 23)
+    assert str(wide) == "10.0.2.0/23"
+    assert allocator.allocateSubnet("LAN", 23) is None
+    assert allocator.allocateSubnet("LAN") == ipaddress.IPv4Network("10.0.1.0/24")
+
+    # The whole pool is never handed out (a /23 at most), and released blocks are reused
+    allocator.releaseSubnet(first)
+    assert allocator.allocateSubnet("LAN", 22) is None
+    allocator.releaseSubnet(wide)
+    assert str(allocator.allocateSubnet("LAN", 22)) == "10.0.2.0/23"
+    assert allocator.allocateSubnet("LAN") == first
+
+
+def testNewNodesOfABigSegmentShareTheirSubnet():
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, "Star", hosts=300)
+    subnets = {ipaddress.IPv4Interface(address).network for address in getAddresses(model).values()}
+    assert subnets == {ipaddress.IPv4Network("10.0.0.0/16")}
+
+
+def testDefaultLanMovesOnWhenFull():
+    allocator = AddressAllocator({"LANPool": "10.0.0.0/23", "LANPrefix": 24})
+    addresses = [allocator.allocateAddress() for _ in range(254)]
+    assert addresses[-1] == ("10.0.0.254", 24)
+    assert allocator.allocateAddress() == ("10.0.1.1", 24)
+    for _ in range(253):
+        allocator.allocateAddress()
+    assert allocator.allocateAddress() is None
+
+
+def testParseAddress():
+    assert AddressAllocator.parseAddress("10.0.0.1/8") == (0x0A000001, 8)
+    assert AddressAllocator.parseAddress("10.0.0.1/255.255.255.0") == (0x0A000001, 24)
+    with pytest.raises(ValueError):
+        AddressAllocator.parseAddress("10.0.0/8")
+
+
+def testReaddressGivesEachSegmentItsSubnet():
+    model = buildLab(TopologyModel())
+    model.readdress()
+
+    addresses = getAddresses(model)
+    assert "" not in addresses.values()
+    assert len(set(addresses.values())) == len(addresses)
+
+    subnets = {name: ipaddress.IPv4Interface(address).network for name, address in addresses.items()}
+    assert subnets["h0-eth0"] == subnets["h1-eth0"] == subnets["r0-eth0"]
+    assert subnets["h2-eth0"] == subnets["h3-eth0"] == subnets["r0-eth1"]
+    assert subnets["h0-eth0"] != subnets["h2-eth0"]
+    assert subnets["r0-eth2"] == subnets["r1-eth0"]
+    assert subnets["r1-eth0"].prefixlen == 30
+
+    # Default addresses follow the first interface
+    for node in model.nodes.values():
+        if node.node_type != "Switch":
+            assert node.getDefaultAddress() == next(iter(node.intfs.values())).address
+
+
+def testReaddressWidensTheSubnetOfBigSegments():
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, "Star", hosts=300)
+    model.readdress()
+    addresses = getAddresses(model)
+    assert len(set(addresses.values())) == 300
+    assert {ipaddress.IPv4Interface(address).network for address in addresses.values()} == \
+        {ipaddress.IPv4Network("10.0.0.0/23")}
+
+
+def testReaddressRollsBackWhenThePlanRunsOut():
+    model = buildLab(TopologyModel({"LANPool": "10.0.0.0/8", "LANPrefix": 8}))
+    before = getAddresses(model)
+    default_ips = {node.node_id: node.ip for node in model.nodes.values()}
+
+    with pytest.raises(ValueError):
+        model.readdress()
+
+    assert getAddresses(model) == before
+    assert {node.node_id: node.ip for node in model.nodes.values()} == default_ips
+
+    # Addresses in use are still reserved
+    new_ip, prefix_len = model.ip_allocator.allocateAddress(ipaddress.IPv4Network("10.0.0.0/8"))
+    assert new_ip + "/" + str(prefix_len) not in before.values()
+
+
+def testSetNodeAddressReleasesTheOldOne():
+    model = TopologyModel()
+    host = model.addNode("Host")
+    old_ip = (host.ip, host.prefix_len)
+    model.setNodeAddress(host.node_id, "10.0.0.100", 24)
+    assert model.ip_allocator.allocateAddress() == old_ip
+
+
+def testSetNodeAddressKeepsInterfaceAddresses():
+    model = TopologyModel()
+    host = model.addNode("Host")
+    switch = model.addNode("Switch")
+    model.addLink(host.node_id, switch.node_id)
+    old_ip = (host.ip, host.prefix_len)
+    model.setNodeAddress(host.node_id, "10.0.0.100", 24)
+    assert model.ip_allocator.allocateAddress() != old_ip
@@ -0,0 +1,210 @@
+import pytest
+
+from MiniGUI import TopologyGenerator, TopologyGraph, TopologyModel, TopologyValidator
+
+
+def buildRing(model, size):
+    switches = [model.addNode("Switch") for _ in range(size)]
+    for index, switch in enumerate(switches):
+        model.addLink(switch.node_id, switches[(index + 1) % size].node_id)
+    return switches
+
+
+def getLoopIssues(model, basic_mode=True):
+    issues = TopologyValidator(model, TopologyGraph(model)).validate(basic_mode)
+    return [issue for issue in issues if "closes a loop" in issue["text"]]
+
+
+def testComponentsAndReachability():
+    model = TopologyModel()
+    switch = model.addNode("Switch")
+    hosts = [model.addNode("Host") for _ in range(3)]
+    model.addLink(hosts[0].node_id, switch.node_id)
+    model.addLink(hosts[1].node_id, switch.node_id)
+    graph = TopologyGraph(model)
+
+    components = sorted(sorted(component) for component in graph.getComponents())
+    assert components == [sorted([switch.node_id, hosts[0].node_id, hosts[1].node_id]), [hosts[2].node_id]]
+    reachable = graph.getReachable([hosts[0].node_id])
+    assert reachable.tolist() == [True, True, True, False]
+
+
+def testShortestPathAndDistances():
+    model = TopologyModel()
+    switches = buildRing(model, 6)
+    graph = TopologyGraph(model)
+    path = graph.getShortestPath(switches[0].node_id, switches[3].node_id)
+    assert len(path) == 4 and path[0] == switches[0].node_id and path[-1] == switches[3].node_id
+    assert graph.getHopDistances(switches[0].node_id).tolist() == [0, 1, 2, 3, 2, 1]
+
+
+def testGraphFollowsModelChanges():
+    model = TopologyModel()
+    switches = buildRing(model, 4)
+    graph = TopologyGraph(model)
+    assert len(graph.getSwitchLoops()) == 1
+    model.removeLink(model.adjacency[switches[0].node_id][switches[1].node_id])
+    assert graph.getSwitchLoops() == []
+    assert graph.getDegrees().tolist() == [1, 1, 2, 2]
+
+
+def testPatchedGraphMatchesARebuiltOne():
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, "Barabási–Albert", switches=40, hosts=1, links=2)
+    graph = TopologyGraph(model)
+    graph.refresh()
+
+    def assertRebuilt():
+        graph.refresh()
+        rebuilt = TopologyGraph(model)
+        rebuilt.refresh()
+        for name in ["node_ids", "node_types", "edge_src", "edge_dst", "edge_links", "indptr", "indices"]:
+            assert getattr(graph, name).tolist() == getattr(rebuilt, name).tolist(), name
+        assert graph.node_rows == rebuilt.node_rows
+
+    node_ids = list(model.nodes)
+    model.removeNode(node_ids[3])
+    host = model.addNode("Host")
+    model.addLink(host.node_id, node_ids[0])
+    model.removeLink(next(iter(model.links)))
+    assertRebuilt()
+
+    # Bulk changes (beyond the version log) and clearing rebuild the graph
+    for _ in range(model.VERSION_LOG_SIZE + 1):
+        model.addNode("Switch")
+    assertRebuilt()
+    model.clear()
+    model.addNode("Host")
+    assertRebuilt()
+
+
+def testArticulationPoints():
+    model = TopologyModel()
+    switches = [model.addNode("Switch") for _ in range(3)]
+    model.addLink(switches[0].node_id, switches[1].node_id)
+    model.addLink(switches[1].node_id, switches[2].node_id)
+    assert TopologyGraph(model).getArticulationPoints() == [switches[1].node_id]
+
+
+def testLoopWithoutSpanningTreeIsAnError():
+    model = TopologyModel()
+    buildRing(model, 4)
+    issues = getLoopIssues(model)
+    assert len(issues) == 1 and issues[0]["severity"] == "Error"
+    assert getLoopIssues(model, basic_mode=False)[0]["severity"] == "Warning"
+
+
+def testLoopNeedsSpanningTreeInEverySwitch():
+    model = TopologyModel()
+    switches = buildRing(model, 4)
+
+    # Spanning tree in the switches at the ends of the closing link is not enough
+    for node_id in model.links[TopologyGraph(model).getSwitchLoops()[0]].node_ids:
+        model.setStpProtocol("STP", node_id)
+    issues = getLoopIssues(model)
+    assert len(issues) == 1
+
+    for switch in switches:
+        model.setStpProtocol("RSTP", switch.node_id)
+    assert getLoopIssues(model) == []
+
+
+def testSceneSpanningTreeProtectsLoops():
+    model = TopologyModel()
+    switches = buildRing(model, 3)
+    model.setStpProtocol("STP")
+    assert getLoopIssues(model) == []
+
+    model.setStpProtocol("None", switches[1].node_id)
+    assert len(getLoopIssues(model)) == 1
+
+
+def testOtherDomainsDoNotNeedSpanningTree():
+    model = TopologyModel()
+    ring = buildRing(model, 3)
+    tree = [model.addNode("Switch") for _ in range(2)]
+    model.addLink(tree[0].node_id, tree[1].node_id)
+    router = model.addNode("Router")
+    model.addLink(router.node_id, ring[0].node_id)
+    model.addLink(router.node_id, tree[0].node_id)
+    for switch in ring:
+        model.setStpProtocol("STP", switch.node_id)
+    assert getLoopIssues(model) == []
+
+
+def testAddressChecks():
+    model = TopologyModel()
+    switch = model.addNode("Switch")
+    hosts = [model.addNode("Host") for _ in range(3)]
+    for host in hosts:
+        model.addLink(host.node_id, switch.node_id)
+    model.setIntfAddress(hosts[1].node_id, "h1-eth0", hosts[0].intfs["h0-eth0"].address)
+    model.setIntfAddress(hosts[2].node_id, "h2-eth0", "")
+
+    texts = [issue["text"] for issue in TopologyValidator(model, TopologyGraph(model)).validate()]
+    assert any(text.startswith("Address ") and "h0" in text and "h1" in text for text in texts)
+    assert "Interface h2-eth0 of h2 has no IP address" in texts
+
+
+def testSplitSegmentCheck():
+    model = TopologyModel()
+    switch = model.addNode("Switch")
+    hosts = [model.addNode("Host") for _ in range(3)]
+    for host in hosts:
+        model.addLink(host.node_id, switch.node_id)
+
+    def getSplitIssues():
+        issues = TopologyValidator(model, TopologyGraph(model)).validate()
+        return [issue for issue in issues if "is split" in issue["text"]]
+
+    assert getSplitIssues() == []
+    model.setIntfAddress(hosts[2].node_id, "h2-eth0", "192.168.0.1/24")
+    issues = getSplitIssues()
+    assert len(issues) == 1 and "2 subnets" in issues[0]["text"]
+    assert hosts[2].node_id in issues[0]["nodes"]
+
+
+@pytest.mark.parametrize("shape, params", [("Tree", {"depth": 3, "fanout": 2}), ("Star", {"size": 6})])
+def testGeneratedTreesHaveNoLoops(shape, params):
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, shape, **params)
+    assert TopologyGraph(model).getSwitchLoops() == []
+
+
+@pytest.mark.parametrize("shape, params", [("Fat-tree", {"k": 4}), ("Ring", {"switches": 5, "hosts": 1}),
+                                           ("Full mesh", {"switches": 4, "hosts": 1}),
+                                           ("Erdős–Rényi", {"switches": 20, "hosts": 1, "probability": 0.3}),
+                                           ("Barabási–Albert", {"switches": 30, "hosts": 1, "links": 2})])
+def testGeneratedLoopsAreProtected(shape, params):
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, shape, **params)
+    assert TopologyGraph(model).getSwitchLoops()
+    assert model.stp_protocol == "RSTP"
+    assert getLoopIssues(model) == []
+
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, shape, stp_protocol="None", **params)
+    assert getLoopIssues(model)
+
+
+def testGeneratedTreesKeepSpanningTreeOff():
+    model = TopologyModel()
+    TopologyGenerator(seed=1).build(model, "Tree", depth=3, fanout=2)
+    assert model.stp_protocol == "None"
+
+
+@pytest.mark.parametrize("shape, params", [("Linear", {"switches": 7, "hosts": 2}), ("Star", {"hosts": 9}),
+                                           ("Tree", {"depth": 3, "fanout": 3}), ("Fat-tree", {"k": 6}),
+                                           ("Ring", {"switches": 2, "hosts": 1}),
+                                           ("Full mesh", {"switches": 9, "hosts": 1}),
+                                           ("Barabási–Albert", {"switches": 50, "hosts": 1, "links": 3})])
+def testGeneratorSizes(shape, params):
+    node_types, edges = TopologyGenerator(seed=1).generate(shape, **params)
+    assert TopologyGenerator.getSize(shape, **params) == (len(node_types), len(edges))
+
+
+def testGeneratorRejectsHugeTopologies():
+    with pytest.raises(ValueError):
+        TopologyGenerator(seed=1).generate("Full mesh", switches=100000, hosts=1)
+    with pytest.raises(ValueError):
+        TopologyGenerator(seed=1).generate("Tree", depth=16, fanout=64)
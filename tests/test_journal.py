@@ -0,0 +1,113 @@
+import os
+
+from MiniGUI import ChangeJournal, TopologyModel
+
+
+def buildModel():
+    model = TopologyModel()
+    switch = model.addNode("Switch", 0, 0)
+    for index in range(3):
+        host = model.addNode("Host", 100 * index, 100)
+        model.addLink(host.node_id, switch.node_id)
+    return model
+
+
+def journalChanges(tmp_path, change):
+    """Journals the changes made by a function on a model, returning the saved and the changed models"""
+    model = buildModel()
+    saved = model.saveData()
+    journal = ChangeJournal(model)
+    project_path = os.path.join(str(tmp_path), "lab.mn")
+    journal.start(project_path)
+    change(model)
+    journal.sync()
+
+    header, entries = ChangeJournal.readJournal(ChangeJournal.getJournalPath(project_path))
+    assert header["project"] == project_path
+    return model, saved, entries
+
+
+def replayEntries(saved, entries):
+    model = TopologyModel()
+    model.loadData(saved)
+    return model, ChangeJournal.replay(model, entries)
+
+
+def testReplayRecoversChanges(tmp_path):
+    def change(model):
+        host = model.nodes[model.node_ids["h0"]]
+        model.moveNode(host.node_id, 10, 20)
+        model.moveNode(host.node_id, 30, 40)
+        router = model.addNode("Router", 50, 50)
+        model.addLink(router.node_id, model.node_ids["s0"])
+        model.setLinkState(model.link_ids["l0"], False)
+        model.setStpProtocol("RSTP")
+        model.setPinned(router.node_id)
+        model.removeNode(model.node_ids["h2"])
+        model.setIntfAddress(host.node_id, "h0-eth0", "192.168.0.1/24")
+
+    model, saved, entries = journalChanges(tmp_path, change)
+
+    # Moves of the same node are written once
+    assert sum(entry[0] == "move_node" for entry in entries) == 1
+
+    recovered, applied = replayEntries(saved, entries)
+    assert applied == len(entries)
+    assert recovered.saveData() == model.saveData()
+
+
+def testMoveBeforeRenameIsReplayed(tmp_path):
+    def change(model):
+        host_id = model.node_ids["h0"]
+        model.moveNode(host_id, 70, 80)
+        model.renameNode(host_id, "web")
+        model.moveNode(model.node_ids["h1"], 5, 5)
+
+    model, saved, entries = journalChanges(tmp_path, change)
+    assert entries[0] == ["move_node", "h0", 70, 80]
+
+    recovered, applied = replayEntries(saved, entries)
+    assert applied == len(entries)
+    web = recovered.nodes[recovered.node_ids["web"]]
+    assert (web.x, web.y) == (70, 80)
+    assert recovered.saveData() == model.saveData()
+
+
+def testTruncatedEntryIsIgnored(tmp_path):
+    def change(model):
+        model.renameNode(model.node_ids["h0"], "web")
+        model.renameNode(model.node_ids["h1"], "db")
+
+    model, saved, entries = journalChanges(tmp_path, change)
+    journal_path = ChangeJournal.getJournalPath(os.path.join(str(tmp_path), "lab.mn"))
+    with open(journal_path, "r+", encoding="utf-8") as journal_file:
+        content = journal_file.read()
+        journal_file.seek(0)
+        journal_file.truncate()
+        journal_file.write(content[:-5])
+
+    header, entries = ChangeJournal.readJournal(journal_path)
+    assert entries == [["rename_node", "h0", "web"]]
+
+
+def testReplaySkipsChangesAlreadyApplied(tmp_path):
+    def change(model):
+        model.addNode("Host", 1, 2, "extra")
+
+    model, saved, entries = journalChanges(tmp_path, change)
+    recovered, applied = replayEntries(model.saveData(), entries)
+    assert applied == 0
+
+
+def testStopDeletesTheJournal(tmp_path):
+    model = buildModel()
+    journal = ChangeJournal(model)
+    project_path = os.path.join(str(tmp_path), "lab.mn")
+    journal.start(project_path)
+    model.renameNode(model.node_ids["h0"], "web")
+    journal.stop(delete=False)
+    assert ChangeJournal.hasChanges(ChangeJournal.getJournalPath(project_path))
+
+    journal.start(project_path, append=True)
+    journal.stop()
+    assert not os.path.exists(ChangeJournal.getJournalPath(project_path))
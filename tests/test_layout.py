@@ -0,0 +1,108 @@
+import numpy as np
+from PyQt5.QtCore import QLineF, QRectF
+
+from MiniGUI import ForceLayout, LayeredLayout, LinkSegmentIndex, TopologyGenerator, TopologyGraph, TopologyModel
+
+
+def testForceLayoutSpreadsPiledUpNodes():
+    edges = np.array([[0, 1], [1, 2], [2, 3], [3, 0]])
+    layout = ForceLayout(edges, np.zeros((4, 2)), iterations=50)
+    while not layout.isFinished():
+        layout.step()
+    distances = np.linalg.norm(layout.positions[:, np.newaxis] - layout.positions[np.newaxis], axis=2)
+    assert distances[~np.eye(4, dtype=bool)].min() > 10
+
+
+def testForceLayoutWithNodesInSeparateCells():
+    # Every node alone in its grid cell: no exact forces within cells
+    positions = np.array([[0.0, 0.0], [500.0, 0.0], [0.0, 500.0]])
+    layout = ForceLayout(np.array([[0, 1]]), positions, iterations=5)
+    while not layout.isFinished():
+        layout.step()
+    assert np.isfinite(layout.positions).all()
+
+
+def testForceLayoutKeepsPinnedNodes():
+    positions = np.array([[0.0, 0.0], [1.0, 0.0], [2.0, 0.0]])
+    layout = ForceLayout(np.array([[0, 1], [1, 2]]), positions, pinned=np.array([True, False, False]),
+                         iterations=20)
+    while not layout.isFinished():
+        layout.step()
+    assert layout.positions[0].tolist() == [0.0, 0.0]
+
+
+def testPlaceGeneratedNodes():
+    for shape, params, layered in [("Ring", {"switches": 6, "hosts": 1}, False),
+                                   ("Tree", {"depth": 2, "fanout": 3}, True)]:
+        model = TopologyModel()
+        TopologyGenerator(seed=0).build(model, shape, **params)
+        TopologyGenerator.placeNodes(TopologyGraph(model), layered=layered)
+        positions = {(round(node.x), round(node.y)) for node in model.nodes.values()}
+        assert len(positions) == len(model.nodes)
+
+
+def testLayeredLayoutOrdersLayers():
+    model = TopologyModel()
+    TopologyGenerator(seed=0).build(model, "Tree", depth=2, fanout=2)
+    graph = TopologyGraph(model)
+    graph.refresh()
+    edges = np.column_stack((graph.edge_src, graph.edge_dst))
+    layout = LayeredLayout(edges, graph.getLayers(), np.zeros((len(graph.node_ids), 2)))
+    while not layout.isFinished():
+        layout.step()
+    root_row = graph.node_rows[model.node_ids["s0"]]
+    assert layout.positions[root_row, 1] == layout.positions[:, 1].min()
+
+
+def getIndexedSegments(count=300, seed=0):
+    rng = np.random.default_rng(seed)
+    index = LinkSegmentIndex()
+    for link_id, (x1, y1, x2, y2) in enumerate(rng.uniform(-2000, 2000, (count, 4))):
+        index.setSegment(link_id, QLineF(x1, y1, x2, y2), link_id % 4)
+    return index
+
+
+def getCrossingLinks(index, rect):
+    # Brute force: a segment crosses a rectangle if any of its sampled points is within it
+    found = []
+    for link_id, row in index.rows.items():
+        x1, y1, x2, y2 = index.segments[row]
+        points = np.linspace((x1, y1), (x2, y2), 2000)
+        if ((points[:, 0] >= rect.left()) & (points[:, 0] <= rect.right()) &
+                (points[:, 1] >= rect.top()) & (points[:, 1] <= rect.bottom())).any():
+            found.append(link_id)
+    return sorted(found)
+
+
+def testLinkIndexQueriesMatchBruteForce():
+    index = getIndexedSegments()
+    for rect in [QRectF(-100, -100, 200, 200), QRectF(700, -1500, 50, 900), QRectF(-3000, -3000, 6000, 6000)]:
+        crossing = getCrossingLinks(index, rect)
+        assert set(crossing) <= set(index.linksIn(rect))
+        lines = index.getLines(1, rect)
+        group_links = {link_id for link_id, row in index.rows.items() if any(line is index.lines[row] for line in lines)}
+        assert all(link_id % 4 == 1 for link_id in group_links)
+        assert {link_id for link_id in crossing if link_id % 4 == 1} <= group_links
+
+    x1, y1, x2, y2 = index.segments[index.rows[42]]
+    assert index.linkAt((x1 + x2) / 2, (y1 + y2) / 2, 0.5) == 42
+    assert index.linkAt(5000.0, 5000.0, 10.0) is None
+
+
+def testLinkIndexRebucketsMovedSegments():
+    index = getIndexedSegments()
+    cells = {row: list(row_cells) for row, row_cells in index.row_cells.items()}
+    index.setSegment(7, QLineF(3000, 3000, 3100, 3050), 0)
+    moved = index.rows[7]
+    assert {row: row_cells for row, row_cells in index.row_cells.items() if row != moved} == \
+        {row: row_cells for row, row_cells in cells.items() if row != moved}
+    assert index.linkAt(3050.0, 3025.0, 1.0) == 7
+    assert index.linksIn(QRectF(2900, 2900, 300, 300)) == [7]
+
+    # The last segment takes the place of the removed one, also in the grid
+    index.removeSegment(7)
+    assert index.linkAt(3050.0, 3025.0, 1.0) is None
+    assert sorted(index.row_cells) == list(range(index.count))
+    assert sum(len(rows) for rows in index.cells.values()) == sum(len(c) for c in index.row_cells.values())
+    x1, y1, x2, y2 = index.segments[moved]
+    assert index.linkAt((x1 + x2) / 2, (y1 + y2) / 2, 0.5) == index.link_ids[moved]
@@ -0,0 +1,176 @@
+import pytest
+
+from MiniGUI import TopologyModel, UndoStack
+
+
+def buildModel():
+    model = TopologyModel()
+    switch = model.addNode("Switch", 0, 0)
+    router = model.addNode("Router", 200, 0)
+    model.addLink(router.node_id, switch.node_id)
+    for index in range(2):
+        host = model.addNode("Host", 100 * index, 100)
+        model.addLink(host.node_id, switch.node_id)
+    return model
+
+
+def testNamesAndInterfaces():
+    model = buildModel()
+    assert sorted(model.node_ids) == ["h0", "h1", "r0", "s0"]
+    assert sorted(model.link_ids) == ["l0", "l1", "l2"]
+    switch = model.nodes[model.node_ids["s0"]]
+    assert sorted(switch.intfs) == ["s0-eth0", "s0-eth1", "s0-eth2"]
+    assert not model.isFeasibleName("h0") and not model.isFeasibleName("")
+    assert model.newName("Host") == "h2"
+
+
+def testLinkRules():
+    model = buildModel()
+    hosts = [model.node_ids["h0"], model.node_ids["h1"]]
+    switch_id = model.node_ids["s0"]
+    assert not model.canLink(hosts[0], hosts[1])
+    assert not model.canLink(hosts[0], switch_id)
+    assert not model.canLink(switch_id, switch_id)
+    assert model.canLink(hosts[0], model.node_ids["r0"])
+
+
+def testRemoveNodeRemovesItsLinks():
+    model = buildModel()
+    switch_id = model.node_ids["s0"]
+    model.removeNode(switch_id)
+    assert model.links == {}
+    assert all(not node.intfs for node in model.nodes.values() if node.node_type == "Host")
+    assert all(switch_id not in neighbors for neighbors in model.adjacency.values())
+
+
+def testRenameKeepsInterfaceNames():
+    model = buildModel()
+    host_id = model.node_ids["h0"]
+    model.renameNode(host_id, "web")
+    assert "h0" not in model.node_ids and model.node_ids["web"] == host_id
+    assert list(model.nodes[host_id].intfs) == ["h0-eth0"]
+
+
+def testFirstInterfaceTakesTheDefaultAddress():
+    model = buildModel()
+    host = model.nodes[model.node_ids["h0"]]
+    assert host.intfs["h0-eth0"].address == host.getDefaultAddress()
+
+
+def testSaveAndLoad():
+    model = buildModel()
+    model.setStpProtocol("STP")
+    model.setPinned(model.node_ids["h1"])
+    data = model.saveData()
+
+    loaded = TopologyModel()
+    loaded.loadData(data)
+    assert loaded.saveData() == data
+
+    # Loaded addresses are reserved
+    new_host = loaded.addNode("Host")
+    assert new_host.ip not in [node.ip for node in model.nodes.values()]
+
+
+def testListenersAreNotified():
+    model = TopologyModel()
+    changes = []
+    model.addListener(lambda change, *args: changes.append(change))
+    host = model.addNode("Host")
+    model.moveNode(host.node_id, 5, 5)
+    model.removeNode(host.node_id)
+    assert changes == ["add_node", "move_node", "remove_node"]
+
+
+# Undo/redo
+
+def getState(model):
+    """Project data of the model, regardless of the order of nodes, links and interfaces"""
+    data = model.saveData()
+    nodes = sorted(data["nodes"], key=lambda node: node["name"])
+    for node in nodes:
+        node["links"] = sorted(node["links"].items())
+        node["properties"]["eth_intfs"] = sorted(node["properties"]["eth_intfs"].items())
+    return data["settings"], nodes, sorted(data["links"], key=lambda link: link["name"])
+
+
+def testUndoRedoRestoresEveryChange():
+    model = buildModel()
+    undo_stack = UndoStack(model)
+    states = [getState(model)]
+
+    def step(change):
+        undo_stack.beginEntry()
+        change()
+        undo_stack.endEntry()
+        states.append(getState(model))
+
+    host_id = model.node_ids["h0"]
+    step(lambda: model.moveNode(host_id, 50, 60))
+    step(lambda: model.renameNode(host_id, "web"))
+    step(lambda: model.setLinkState(model.link_ids["l1"], False))
+    step(lambda: model.setStpProtocol("RSTP"))
+    step(lambda: model.setIntfAddress(host_id, "h0-eth0", "192.168.1.10/24"))
+    step(lambda: model.readdress())
+    step(lambda: model.removeNode(model.node_ids["s0"]))
+
+    for state in reversed(states[:-1]):
+        undo_stack.undo()
+        assert getState(model) == state
+    assert not undo_stack.canUndo()
+
+    for state in states[1:]:
+        undo_stack.redo()
+        assert getState(model) == state
+    assert not undo_stack.canRedo()
+
+
+def testMovesOfAnEntryAreOneDelta():
+    model = buildModel()
+    undo_stack = UndoStack(model)
+    host_id = model.node_ids["h0"]
+    undo_stack.beginEntry()
+    for position in range(100):
+        model.moveNode(host_id, position, position)
+    undo_stack.endEntry()
+    assert undo_stack.delta_count == 1
+
+    undo_stack.undo()
+    assert (model.nodes[host_id].x, model.nodes[host_id].y) == (0, 100)
+
+
+def testNewChangesDropTheRedoHistory():
+    model = buildModel()
+    undo_stack = UndoStack(model)
+    model.addNode("Host")
+    undo_stack.undo()
+    assert undo_stack.canRedo()
+    model.addNode("Switch")
+    assert not undo_stack.canRedo()
+
+
+def testHistoryIsBounded(monkeypatch):
+    monkeypatch.setattr(UndoStack, "MAX_ENTRIES", 5)
+    model = TopologyModel()
+    undo_stack = UndoStack(model)
+    host = model.addNode("Host")
+    for position in range(20):
+        undo_stack.beginEntry()
+        model.moveNode(host.node_id, position, position)
+        undo_stack.endEntry()
+    assert len(undo_stack.undo_entries) == 5
+    assert undo_stack.delta_count == 5
+
+
+def testClearForgetsTheHistory():
+    model = buildModel()
+    undo_stack = UndoStack(model)
+    model.addNode("Host")
+    model.clear()
+    assert not undo_stack.canUndo() and not undo_stack.canRedo()
+
+
+@pytest.mark.parametrize("protocol", ["Bogus", ""])
+def testUnknownSpanningTreeProtocol(protocol):
+    with pytest.raises(ValueError):
+        buildModel().setStpProtocol(protocol)
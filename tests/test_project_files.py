@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from MiniGUI import BinaryProjectFile, ProjectReader, ProjectWriter, TopologyGenerator, TopologyModel
+
+
+def buildModel():
+    model = TopologyModel()
+    TopologyGenerator(seed=3).build(model, "Tree", depth=2, fanout=2)
+    model.setStpProtocol("RSTP")
+    model.setStpProtocol("STP", model.node_ids["s0"])
+    model.setPinned(model.node_ids["h0"])
+    model.setLinkState(next(iter(model.links)), False)
+    return model
+
+
+def readBinary(file_path):
+    model = TopologyModel()
+    BinaryProjectFile.readModel(model, file_path)
+    return model
+
+
+def readText(file_path):
+    reader = ProjectReader.openFile(file_path)
+    try:
+        items = list(reader.readItems())
+    finally:
+        reader.close()
+    return items
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def testBinaryRoundTrip(tmp_path, compress):
+    model = buildModel()
+    file_path = os.path.join(str(tmp_path), "lab.mnb")
+    ProjectWriter(file_path, BinaryProjectFile.encodeModel(model), binary=True, compress=compress).write()
+    assert readBinary(file_path).saveData() == model.saveData()
+
+
+def testTruncatedBinaryFilesAreRejected(tmp_path):
+    model = buildModel()
+    file_path = os.path.join(str(tmp_path), "lab.mnb")
+    BinaryProjectFile.writeModel(model, file_path)
+    with open(file_path, "rb") as project_file:
+        content = project_file.read()
+
+    truncated_path = os.path.join(str(tmp_path), "truncated.mnb")
+    for size in range(len(content)):
+        with open(truncated_path, "wb") as truncated_file:
+            truncated_file.write(content[:size])
+        with pytest.raises(ValueError):
+            readBinary(truncated_path)
+
+
+def testCorruptedCompressedBinaryFileIsRejected(tmp_path):
+    file_path = os.path.join(str(tmp_path), "lab.mnb")
+    with open(file_path, "wb") as project_file:
+        project_file.write(gzip.compress(b"MNGUIBIN")[:-4])
+    with pytest.raises(ValueError):
+        readBinary(file_path)
+
+
+def testBinaryFileConversion(tmp_path):
+    model = buildModel()
+    text_path = os.path.join(str(tmp_path), "lab.mn")
+    binary_path = os.path.join(str(tmp_path), "lab.mnb")
+    ProjectWriter(text_path, model.saveData()).write()
+    BinaryProjectFile.convertFile(text_path, binary_path)
+    assert readBinary(binary_path).saveData() == model.saveData()
+
+
+def testNullCharactersAreNotEncoded():
+    model = TopologyModel()
+    model.addNode("Host", name="h\0")
+    with pytest.raises(ValueError):
+        BinaryProjectFile.encodeModel(model)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def testTextProjectIsReadElementByElement(tmp_path, compress):
+    model = buildModel()
+    data = model.saveData()
+    file_path = os.path.join(str(tmp_path), "lab.mn")
+    ProjectWriter(file_path, data, compress=compress).write()
+
+    items = readText(file_path)
+    assert items[0] == ("settings", data["settings"])
+    assert [value for key, value in items if key == "node"] == data["nodes"]
+    assert [value for key, value in items if key == "link"] == data["links"]
+
+
+def testTruncatedTextProjectIsRejected(tmp_path):
+    file_path = os.path.join(str(tmp_path), "lab.mn")
+    ProjectWriter(file_path, buildModel().saveData()).write()
+    with open(file_path, "r", encoding="utf-8") as project_file:
+        content = project_file.read()
+    with open(file_path, "w", encoding="utf-8") as project_file:
+        project_file.write(content[:len(content) // 2])
+
+    with pytest.raises(json.JSONDecodeError):
+        readText(file_path)
+
+
+def testMissingProjectFile(tmp_path):
+    with pytest.raises(OSError):
+        ProjectReader.openFile(os.path.join(str(tmp_path), "missing.mn"))
+    with pytest.raises(OSError):
+        readBinary(os.path.join(str(tmp_path), "missing.mnb"))
+
+
+def testEncodedTextMatchesJson():
+    data = buildModel().saveData()
+    text = "".join(piece for piece, count in ProjectWriter.encodeData(data))
+    assert json.loads(text) == data
+    assert list(json.loads(text)) == list(data)
+
+    # With top-level keys already sorted, the text is the same as json.dumps
+    sorted_data = {key: data[key] for key in sorted(data)}
+    text = "".join(piece for piece, count in ProjectWriter.encodeData(sorted_data))
+    assert text == json.dumps(sorted_data, sort_keys=True, indent=4, separators=(",", ":"))